@@ -0,0 +1,87 @@
+# Agente del modo flota: muestrea este equipo en segundo plano y sirve un
+# resumen compacto (CPU, memoria, particiones, tasas de disco y red y procesos
+# con más CPU) a las interfaces que lo consultan (pestaña 🛰️ Flota). Como
+# headless.py, no importa tkinter ni PIL. El protocolo está descrito en fleet.py.
+#
+# Ejemplos:
+#   python3 agent.py                                  # escucha en 127.0.0.1:9878
+#   python3 agent.py --listen 0.0.0.0:9878 --token secreto
+#   python3 agent.py --listen 9900 --interval 2 --top 20
+import argparse
+import asyncio
+import sys
+
+import psutil
+
+import collector
+from rates import IoRateEngine
+from procfs import create_process_cache, BACKENDS
+from sampler import Sampler
+from fleet import FleetAgent, parse_address, DEFAULT_HOST, DEFAULT_PORT, DEFAULT_TOP
+
+# Las particiones cambian poco y su consulta puede ser lenta (montajes de red)
+DISKS_INTERVAL = 10.0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Agente de Analiza Tu Sistema para el modo flota")
+    parser.add_argument("-l", "--listen", default=f"{DEFAULT_HOST}:{DEFAULT_PORT}", metavar="[HOST:]PUERTO",
+                        help=f"dirección en la que escuchar (por defecto {DEFAULT_HOST}:{DEFAULT_PORT})")
+    parser.add_argument("-i", "--interval", type=float, default=1.0,
+                        help="segundos entre muestras (por defecto 1)")
+    parser.add_argument("-t", "--top", type=int, default=DEFAULT_TOP,
+                        help=f"procesos con más CPU a enviar (por defecto {DEFAULT_TOP})")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, default="auto",
+                        help="lectura de procesos: /proc en Linux (procfs), psutil o automática (por defecto auto)")
+    parser.add_argument("--token", help="clave que deben enviar los clientes al conectarse")
+    args = parser.parse_args(argv)
+    try:
+        args.listen = parse_address(args.listen if ":" in args.listen else f"{DEFAULT_HOST}:{args.listen}")
+    except ValueError:
+        parser.error(f"dirección no válida: {args.listen}")
+    return args
+
+
+# Método para crear el muestreo con los trabajos que necesita el resumen
+def create_sampler(interval, backend):
+    sampler = Sampler()
+    process_cache = create_process_cache(backend)
+    io_rates = IoRateEngine()
+    io_rates.sample()
+    psutil.cpu_percent(interval=None, percpu=True)
+    psutil.cpu_percent(interval=None)
+    disk_prober = collector.DiskUsageProber()
+    sampler.add_job("cpu", collector.sample_cpu, interval)
+    sampler.add_job("memory", collector.collect_memory, interval)
+    sampler.add_job("io", io_rates.sample, interval)
+    sampler.add_job("processes", process_cache.sample, interval)
+    sampler.add_job("disks", lambda: collector.collect_disks(disk_prober), max(interval, DISKS_INTERVAL))
+    return sampler
+
+
+async def serve(agent):
+    await agent.start()
+    print(f"Agente escuchando en {agent.host}:{agent.port}", file=sys.stderr, flush=True)
+    await agent.serve_forever()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sampler = create_sampler(args.interval, args.backend)
+    sampler.start()
+    host, port = args.listen
+    agent = FleetAgent(sampler.drain, host, port, args.token, args.top)
+    try:
+        asyncio.run(serve(agent))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"No se pudo escuchar en {host}:{port}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        sampler.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+# Motor de alertas por umbrales sobre el flujo de métricas.
+# Las reglas son diccionarios (se guardan en el fichero de preferencias):
+#   {"name": "CPU alta", "metric": "cpu", "aggregate": "min", "window": 60,
+#    "op": ">", "threshold": 90, "clear": 80, "for": 0}
+# - metric: cpu, cpu.core.N, memory, swap, disk.read, disk.write, net.recv,
+#   net.sent, mount:/ruta, process.rss:nombre o process.cpu:nombre
+# - aggregate sobre la ventana de "window" segundos: last, avg, min, max,
+#   delta (último - primero) o slope (pendiente por segundo)
+# - clear: umbral para dar la alerta por resuelta (histéresis); por defecto
+#   el mismo umbral
+# - for: segundos que debe cumplirse la condición antes de avisar
+# Cada ventana se actualiza de forma incremental (sumas acumuladas y colas
+# monótonas para mínimo y máximo) y se comparte entre las reglas que usan la
+# misma métrica y duración. Sólo se evalúan las reglas de las métricas que
+# llegan en cada muestra. Este módulo no depende de la interfaz gráfica.
+import json
+import operator
+import os
+import platform
+import shutil
+import subprocess
+import time
+from collections import deque, namedtuple
+
+AGGREGATES = ("last", "avg", "min", "max", "delta", "slope")
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+# Instantánea de la que sale cada métrica (por prefijo)
+METRIC_SOURCES = (
+    ("cpu", "cpu"), ("memory", "memory"), ("swap", "memory"), ("disk.", "io"), ("net.", "io"),
+    ("mount:", "disks"), ("process.", "processes")
+)
+# Segundos tras los que se recalculan las sumas de una ventana sobre un origen nuevo
+REBASE_SECONDS = 86400
+
+DEFAULT_RULES = [
+    {"name": "CPU alta", "metric": "cpu", "aggregate": "min", "window": 60, "op": ">", "threshold": 90, "clear": 80},
+    {"name": "Memoria alta", "metric": "memory", "aggregate": "avg", "window": 30, "op": ">", "threshold": 90, "clear": 85},
+    {"name": "Swap alta", "metric": "swap", "op": ">", "threshold": 50, "clear": 45}
+]
+
+AlertEvent = namedtuple("AlertEvent", ["timestamp", "rule", "state", "value", "message"])
+
+
+# Método para obtener la ruta por defecto del registro de alertas
+def default_log_path():
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "analiza_tu_sistema", "alerts.log")
+
+
+# Método para obtener la instantánea de la que sale una métrica
+def metric_source(metric):
+    for prefix, source in METRIC_SOURCES:
+        if metric == prefix or (prefix.endswith((".", ":")) and metric.startswith(prefix)):
+            return source
+    if metric.startswith("cpu.core."):
+        return "cpu"
+    return None
+
+
+# Regla de alerta validada
+class AlertRule:
+    def __init__(self, name, metric, threshold, op=">", aggregate="last", window=0, clear=None, hold=0):
+        if metric_source(metric) is None:
+            raise ValueError(f"métrica desconocida: {metric}")
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"agregado desconocido: {aggregate}")
+        if op not in OPERATORS:
+            raise ValueError(f"operador desconocido: {op}")
+        self.name = name
+        self.metric = metric
+        self.threshold = float(threshold)
+        self.op = op
+        self.compare = OPERATORS[op]
+        self.aggregate = aggregate
+        self.window = float(window)
+        self.clear = self.threshold if clear is None else float(clear)
+        self.hold = float(hold)
+
+    @classmethod
+    def from_dict(cls, data):
+        try:
+            return cls(data.get("name") or data["metric"], data["metric"], data["threshold"], data.get("op", ">"),
+                       data.get("aggregate", "last"), data.get("window", 0), data.get("clear"), data.get("for", 0))
+        except KeyError as e:
+            raise ValueError(f"falta el campo {e}")
+
+    # Método para describir la condición de la regla
+    def describe(self):
+        text = f"{self.metric} {self.op} {self.threshold:g}"
+        if self.aggregate != "last":
+            text = f"{self.aggregate}({self.metric}, {self.window:g} s) {self.op} {self.threshold:g}"
+        if self.hold:
+            text += f" durante {self.hold:g} s"
+        return text
+
+
+# Ventana deslizante por tiempo con agregados incrementales
+class SlidingWindow:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.clear()
+
+    def clear(self):
+        self.samples = deque()     # (x, valor, secuencia)
+        self.minimum = deque()     # cola monótona creciente para el mínimo
+        self.maximum = deque()     # cola monótona decreciente para el máximo
+        self.sum_v = self.sum_x = self.sum_xx = self.sum_xv = 0.0
+        self.origin = None
+        self.started = None
+        self.sequence = 0
+
+    def _add_sums(self, x, value, sign):
+        self.sum_v += sign * value
+        self.sum_x += sign * x
+        self.sum_xx += sign * x * x
+        self.sum_xv += sign * x * value
+
+    # Método para rehacer las sumas con un origen nuevo (evita perder precisión)
+    def _rebase(self, timestamp):
+        shift = timestamp - self.origin
+        self.origin = timestamp
+        self.started -= shift
+        self.samples = deque((x - shift, value, seq) for x, value, seq in self.samples)
+        self.minimum = deque((x - shift, value, seq) for x, value, seq in self.minimum)
+        self.maximum = deque((x - shift, value, seq) for x, value, seq in self.maximum)
+        self.sum_v = self.sum_x = self.sum_xx = self.sum_xv = 0.0
+        for x, value, seq in self.samples:
+            self._add_sums(x, value, 1)
+
+    def add(self, timestamp, value):
+        if self.origin is None:
+            self.origin = timestamp
+            self.started = 0.0
+        elif timestamp - self.origin > REBASE_SECONDS:
+            self._rebase(timestamp)
+        x = timestamp - self.origin
+        self.sequence += 1
+        entry = (x, value, self.sequence)
+        self.samples.append(entry)
+        self._add_sums(x, value, 1)
+        while self.minimum and self.minimum[-1][1] >= value:
+            self.minimum.pop()
+        self.minimum.append(entry)
+        while self.maximum and self.maximum[-1][1] <= value:
+            self.maximum.pop()
+        self.maximum.append(entry)
+        # Descartar las muestras que han salido de la ventana (siempre queda la última)
+        cutoff = x - self.seconds
+        while len(self.samples) > 1 and self.samples[0][0] < cutoff:
+            old = self.samples.popleft()
+            self._add_sums(old[0], old[1], -1)
+            if self.minimum[0][2] == old[2]:
+                self.minimum.popleft()
+            if self.maximum[0][2] == old[2]:
+                self.maximum.popleft()
+
+    # Método para comprobar si la ventana ya abarca su duración completa
+    def ready(self):
+        return bool(self.samples) and self.samples[-1][0] - self.started >= self.seconds
+
+    def value(self, aggregate):
+        samples = self.samples
+        if aggregate == "last":
+            return samples[-1][1]
+        if aggregate == "avg":
+            return self.sum_v / len(samples)
+        if aggregate == "min":
+            return self.minimum[0][1]
+        if aggregate == "max":
+            return self.maximum[0][1]
+        if aggregate == "delta":
+            return samples[-1][1] - samples[0][1]
+        # Pendiente por mínimos cuadrados (unidades por segundo)
+        count = len(samples)
+        denominator = count * self.sum_xx - self.sum_x * self.sum_x
+        if count < 2 or denominator <= 0:
+            return 0.0
+        return (count * self.sum_xv - self.sum_x * self.sum_v) / denominator
+
+
+# Estado de una regla: "ok", "pending" (condición cumplida, esperando "for") o "firing"
+class RuleState:
+    __slots__ = ("state", "since", "value")
+
+    def __init__(self):
+        self.state = "ok"
+        self.since = None
+        self.value = None
+
+
+# Método para extraer de las instantáneas los valores de las métricas pedidas
+def extract_metrics(snapshots, metrics):
+    values = {}
+    cpu = snapshots.get("cpu")
+    memory = snapshots.get("memory")
+    io = snapshots.get("io")
+    disks = snapshots.get("disks")
+    processes = snapshots.get("processes")
+    process_totals = None
+    for metric in metrics:
+        if metric == "cpu" and cpu:
+            values[metric] = cpu.usage
+        elif metric.startswith("cpu.core.") and cpu:
+            core = int(metric[9:]) if metric[9:].isdigit() else -1
+            if 0 <= core < len(cpu.per_core):
+                values[metric] = cpu.per_core[core]
+        elif metric == "memory" and memory:
+            values[metric] = memory.percent
+        elif metric == "swap" and memory:
+            values[metric] = memory.swap_percent
+        elif metric.startswith(("disk.", "net.")) and io:
+            total = io.disk_total if metric.startswith("disk.") else io.net_total
+            field = {"disk.read": "read_bytes", "disk.write": "write_bytes",
+                     "net.recv": "bytes_recv", "net.sent": "bytes_sent"}.get(metric)
+            if total is not None and field:
+                values[metric] = getattr(total, field)
+        elif metric.startswith("mount:") and disks:
+            for partition in disks.partitions:
+                if partition.mountpoint == metric[6:] and partition.percent is not None:
+                    values[metric] = partition.percent
+        elif metric.startswith("process.") and processes:
+            if process_totals is None:
+                # Totales por nombre de proceso (se calculan una vez por muestra)
+                process_totals = {}
+                for row in processes.rows:
+                    total = process_totals.setdefault(row.name, [0.0, 0])
+                    total[0] += row.cpu
+                    total[1] += row.rss
+            field, _, name = metric[8:].partition(":")
+            total = process_totals.get(name)
+            if total is not None and field in ("cpu", "rss"):
+                values[metric] = total[0] if field == "cpu" else total[1]
+    return values
+
+
+# Motor de reglas: recibe las instantáneas y devuelve las alertas que cambian de estado
+class AlertEngine:
+    def __init__(self, rules=()):
+        self.rules = []
+        self.errors = []
+        for data in rules:
+            try:
+                self.rules.append(AlertRule.from_dict(data))
+            except (ValueError, TypeError, AttributeError) as e:
+                self.errors.append(f"{data!r}: {e}")
+        self.states = {id(rule): RuleState() for rule in self.rules}
+        # Una ventana por métrica y duración, compartida entre reglas
+        self.windows = {}
+        self.windows_by_metric = {}
+        self.rules_by_metric = {}
+        self.metrics_by_source = {}
+        for rule in self.rules:
+            if (rule.metric, rule.window) not in self.windows:
+                window = self.windows[(rule.metric, rule.window)] = SlidingWindow(rule.window)
+                self.windows_by_metric.setdefault(rule.metric, []).append(window)
+            self.rules_by_metric.setdefault(rule.metric, []).append(rule)
+            self.metrics_by_source.setdefault(metric_source(rule.metric), set()).add(rule.metric)
+
+    # Método para saber qué instantáneas necesitan las reglas
+    def sources(self):
+        return set(self.metrics_by_source)
+
+    def state(self, rule):
+        return self.states[id(rule)]
+
+    def update(self, snapshots):
+        events = []
+        for source, metrics in self.metrics_by_source.items():
+            snapshot = snapshots.get(source)
+            if snapshot is None:
+                continue
+            now = snapshot.timestamp
+            values = extract_metrics({source: snapshot}, metrics)
+            for metric in metrics:
+                value = values.get(metric)
+                if value is None:
+                    # La métrica ha desaparecido (proceso terminado, disco desmontado)
+                    self._reset_metric(metric, now, events)
+                    continue
+                for window in self.windows_by_metric[metric]:
+                    window.add(now, value)
+                for rule in self.rules_by_metric[metric]:
+                    self._evaluate(rule, now, events)
+        return events
+
+    def _reset_metric(self, metric, now, events):
+        for window in self.windows_by_metric[metric]:
+            window.clear()
+        for rule in self.rules_by_metric[metric]:
+            state = self.state(rule)
+            if state.state == "firing":
+                events.append(AlertEvent(now, rule, "resolved", None, f"{rule.name}: sin datos de {rule.metric}"))
+            state.state = "ok"
+            state.since = None
+            state.value = None
+
+    def _evaluate(self, rule, now, events):
+        window = self.windows[(rule.metric, rule.window)]
+        if not window.ready():
+            return
+        value = window.value(rule.aggregate)
+        state = self.state(rule)
+        state.value = value
+        if state.state == "firing":
+            # Histéresis: sólo se resuelve al dejar de cumplir el umbral de "clear"
+            if not rule.compare(value, rule.clear):
+                state.state = "ok"
+                state.since = None
+                events.append(AlertEvent(now, rule, "resolved", value, f"{rule.name}: resuelta ({value:.1f})"))
+        elif rule.compare(value, rule.threshold):
+            if state.state == "ok":
+                state.state = "pending"
+                state.since = now
+            if now - state.since >= rule.hold:
+                state.state = "firing"
+                events.append(AlertEvent(now, rule, "firing", value,
+                                         f"{rule.name}: {rule.describe()} (valor {value:.1f})"))
+        else:
+            state.state = "ok"
+            state.since = None
+
+
+# Registro de alertas en un fichero de texto (una línea por cambio de estado)
+class AlertLog:
+    def __init__(self, path=None):
+        self.path = path or default_log_path()
+
+    def write(self, event):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as log_file:
+                log_file.write(json.dumps({
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(event.timestamp)),
+                    "rule": event.rule.name,
+                    "state": event.state,
+                    "value": event.value,
+                    "message": event.message
+                }, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+# Método para mostrar un aviso del escritorio (sin esperar a que termine)
+def notify_desktop(title, message):
+    try:
+        if platform.system() == "Linux" and shutil.which("notify-send"):
+            subprocess.Popen(["notify-send", "--app-name=Analiza Tu Sistema", title, message])
+            return True
+        if platform.system() == "Darwin":
+            script = f"display notification {json.dumps(message)} with title {json.dumps(title)}"
+            subprocess.Popen(["osascript", "-e", script])
+            return True
+    except OSError:
+        pass
+    return False
@@ -0,0 +1,109 @@
+# Benchmark del modo flota: arranca varios agentes locales (agent.py) y apunta
+# el cliente a muchas entradas de equipo repartidas entre ellos, como si
+# fueran equipos distintos. Mide los hilos del cliente, su uso de CPU, la
+# latencia y los bytes recibidos por consulta frente a lo que ocuparía enviar
+# el resumen completo cada vez.
+#
+# Uso:
+#   python benchmarks/bench_fleet.py
+#   python benchmarks/bench_fleet.py --agents 4 --hosts 200 --interval 1 --seconds 15
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import psutil
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARKS_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from fleet import FleetClient, HostState, encode_message
+
+FIRST_PORT = 19878
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del modo flota con agentes locales")
+    parser.add_argument("--agents", type=int, default=4, help="agentes locales a arrancar (por defecto 4)")
+    parser.add_argument("--hosts", type=int, default=200, help="entradas de equipo en el cliente (por defecto 200)")
+    parser.add_argument("--interval", type=float, default=1.0, help="segundos entre consultas (por defecto 1)")
+    parser.add_argument("--seconds", type=float, default=15.0, help="duración de la medida (por defecto 15)")
+    parser.add_argument("--port", type=int, default=FIRST_PORT, help=f"primer puerto de los agentes (por defecto {FIRST_PORT})")
+    return parser.parse_args(argv)
+
+
+# Método para arrancar un agente y esperar a que escuche
+def start_agent(port, interval):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, "agent.py"), "--listen", f"127.0.0.1:{port}",
+                                "--interval", str(interval)], stderr=subprocess.PIPE, text=True)
+    line = process.stderr.readline()
+    if "escuchando" not in line:
+        process.kill()
+        raise RuntimeError(f"El agente no ha arrancado: {line.strip()}")
+    return process
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    agents = [start_agent(args.port + index, args.interval) for index in range(args.agents)]
+    client = FleetClient((), args.interval, timeout=max(5.0, args.interval * 3))
+    # Varias entradas apuntan al mismo agente: se registran con una clave distinta
+    # cada una (el cliente sólo admite una entrada por dirección) y cada una tiene su conexión
+    addresses = [f"127.0.0.1:{args.port + index % args.agents}" for index in range(args.hosts)]
+    for index, address in enumerate(addresses):
+        client.hosts[f"{address}#{index}"] = HostState(address)
+    process = psutil.Process()
+    try:
+        threads_before = threading.active_count()
+        client.start()
+        # Esperar a que se conecten todos antes de medir
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            if all(host.status == "ok" and host.sections for host in client.hosts.values()):
+                break
+            time.sleep(0.2)
+        connected = sum(1 for host in client.hosts.values() if host.status == "ok")
+        process.cpu_percent(interval=None)
+        cpu_start = sum(process.cpu_times()[:2])
+        bytes_start = client.bytes_received
+        started = time.monotonic()
+        time.sleep(args.seconds)
+        elapsed = time.monotonic() - started
+        cpu = (sum(process.cpu_times()[:2]) - cpu_start) / elapsed * 100
+        received = client.bytes_received - bytes_start
+        snapshot = client.snapshot()
+        # Lo que ocuparía cada respuesta si se enviara siempre el resumen completo
+        full_sizes = [len(encode_message({"i": 0, "t": 0.0, "=": host.sections})) for host in client.hosts.values()]
+        latencies = [host.latency * 1000 for host in snapshot.hosts if host.latency is not None]
+        requests = len(addresses) * elapsed / args.interval
+        result = {
+            "agents": args.agents,
+            "hosts": args.hosts,
+            "connected": connected,
+            "interval_s": args.interval,
+            "client_threads": threading.active_count() - threads_before,
+            "process_threads": process.num_threads(),
+            "client_cpu_percent": cpu,
+            "bytes_per_response": received / requests if requests else 0.0,
+            "full_bytes_per_response": statistics.fmean(full_sizes) if full_sizes else 0.0,
+            "received_kb_per_s": received / elapsed / 1024,
+            "latency_ms_p50": statistics.median(latencies) if latencies else None,
+            "latency_ms_max": max(latencies) if latencies else None
+        }
+        print(json.dumps(result, indent=2))
+    finally:
+        client.stop()
+        for agent in agents:
+            agent.terminate()
+        for agent in agents:
+            agent.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
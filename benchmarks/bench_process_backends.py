@@ -0,0 +1,84 @@
+# Benchmark de la lista de procesos: psutil frente a la lectura directa de /proc.
+# Uso: python benchmarks/bench_process_backends.py [repeticiones] [hilos]
+# Mide el tiempo de pared y el tiempo de CPU de cada muestra en este equipo,
+# sin columnas de detalle, con detalle de los 50 procesos con más E/S y con
+# detalle de todos los procesos. Para psutil cuenta además los objetos Process
+# creados y las lecturas de /proc/[pid]/stat de una muestra ya en régimen.
+import builtins
+import os
+import sys
+import time
+
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collector import ProcessCache
+import procfs
+
+
+def run(cache, repeats):
+    # La primera muestra crea la caché de cada proceso y se mide aparte
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    rows = len(cache.sample().rows)
+    first = (time.perf_counter() - start, time.process_time() - cpu_start)
+    wall = cpu = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        rows = len(cache.sample().rows)
+        wall += time.perf_counter() - start
+        cpu += time.process_time() - cpu_start
+    return rows, first, (wall / repeats, cpu / repeats)
+
+
+# Método para contar los psutil.Process creados y los ficheros stat abiertos en una muestra
+def count_calls(cache):
+    counts = {"process": 0, "stat": 0}
+    original_init = psutil.Process.__init__
+    original_open = builtins.open
+
+    def counting_init(self, *args, **kwargs):
+        counts["process"] += 1
+        original_init(self, *args, **kwargs)
+
+    def counting_open(file, *args, **kwargs):
+        if isinstance(file, str) and file.endswith("/stat"):
+            counts["stat"] += 1
+        return original_open(file, *args, **kwargs)
+
+    psutil.Process.__init__ = counting_init
+    builtins.open = counting_open
+    try:
+        rows = len(cache.sample().rows)
+    finally:
+        psutil.Process.__init__ = original_init
+        builtins.open = original_open
+    return rows, counts
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    factories = [("psutil", ProcessCache)]
+    if procfs.available():
+        factories.append((f"/proc ({workers} hilos)", lambda: procfs.ProcFsProcessCache(workers)))
+        factories.append(("/proc (1 hilo)", lambda: procfs.ProcFsProcessCache(1)))
+    else:
+        print("/proc no disponible: sólo se mide psutil")
+    backends = []
+    for name, factory in factories:
+        for label, details in (("", None), (", top 50 por E/S", (50, "io")), (", detalle de todos", (None, "cpu"))):
+            cache = factory()
+            if details:
+                cache.details.configure(True, *details)
+            backends.append((name + label, cache))
+    for name, cache in backends:
+        rows, first, steady = run(cache, repeats)
+        print(f"\n{name}: {rows} procesos")
+        print(f"  primera muestra: {first[0] * 1000:.1f} ms (CPU {first[1] * 1000:.1f} ms)")
+        print(f"  muestra siguiente: {steady[0] * 1000:.1f} ms (CPU {steady[1] * 1000:.1f} ms)")
+        if isinstance(cache, ProcessCache):
+            rows, counts = count_calls(cache)
+            print(f"  por muestra: {counts['process']} Process creados, {counts['stat']} lecturas de stat ({rows} procesos)")
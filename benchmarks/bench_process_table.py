@@ -0,0 +1,224 @@
+# Benchmark de la tabla de procesos: lista completa frente a lista virtual,
+# carga, ordenación y filtros del almacén y actualización incremental del
+# árbol de procesos.
+# Uso: python benchmarks/bench_process_table.py [número de procesos]
+# Con pantalla disponible usa un Treeview real; sin ella usa un Treeview
+# simulado que cuenta las llamadas a Tk.
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collector import ProcessRow
+from process_table import ProcessStore, KeyedProcessView, VirtualProcessView, ProcessTreeModel, SORT_KEYS
+
+
+# Intérprete Tcl simulado: sólo responde a la consulta del alto de fila
+class FakeTcl:
+    def call(self, *args):
+        return 20
+
+
+# Treeview simulado: guarda los elementos y cuenta las llamadas
+class CountingTree:
+    def __init__(self):
+        self.tk = FakeTcl()
+        self.items = {}
+        self.calls = 0
+        self._next = 0
+        self._selection = ()
+
+    def insert(self, parent, index, values=()):
+        self.calls += 1
+        self._next += 1
+        item = f"I{self._next}"
+        self.items[item] = values
+        return item
+
+    def item(self, item, values=None):
+        self.calls += 1
+        if values is not None:
+            self.items[item] = values
+        return {"values": self.items[item]}
+
+    def move(self, item, parent, index):
+        self.calls += 1
+
+    def delete(self, *items):
+        self.calls += 1
+        for item in items:
+            del self.items[item]
+
+    def selection(self):
+        return self._selection
+
+    def selection_set(self, items):
+        self.calls += 1
+        self._selection = tuple(items) if isinstance(items, (tuple, list)) else (items,)
+
+    def winfo_height(self):
+        return 600
+
+    def configure(self, **kwargs):
+        pass
+
+    def yview(self, *args):
+        pass
+
+    def bind(self, sequence, handler, add=None):
+        return sequence
+
+    def unbind(self, sequence, funcid=None):
+        pass
+
+
+class CountingScrollbar:
+    def set(self, first, last):
+        pass
+
+    def configure(self, **kwargs):
+        pass
+
+
+# Método para generar procesos sintéticos
+def synthetic_rows(count, seed=0):
+    rnd = random.Random(seed)
+    users = ["root", "builder", "www-data", "postgres"]
+    return [ProcessRow(pid, f"proc-{pid}", "running", rnd.random() * 100, rnd.random() * 10, rnd.choice(users),
+                       rnd.randrange(1, pid) if pid > 1 else 0, rnd.randrange(1, 2**30))
+            for pid in range(1, count + 1)]
+
+
+# Método para simular un ciclo de refresco con procesos nuevos, terminados y modificados
+def churn(rows, fraction, seed=1):
+    rnd = random.Random(seed)
+    rows = list(rows)
+    changes = max(1, int(len(rows) * fraction))
+    for _ in range(changes):
+        i = rnd.randrange(len(rows))
+        rows[i] = rows[i]._replace(cpu=rnd.random() * 100)
+    del rows[:changes]
+    last = rows[-1].pid
+    rows.extend(ProcessRow(last + i, f"proc-{last + i}", "running", 0.0, 0.1, "root", 1, 4096) for i in range(1, changes + 1))
+    return rows
+
+
+def make_widgets():
+    if os.environ.get("DISPLAY") or sys.platform == "win32":
+        import tkinter as tk
+        from tkinter import ttk
+        root = tk.Tk()
+        root.geometry("800x600")
+        tree = ttk.Treeview(root, columns=('pid', 'name', 'status', 'cpu', 'memory', 'user'), show='headings')
+        scrollbar = ttk.Scrollbar(root, orient="vertical")
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        root.update()
+        return root, tree, scrollbar
+    return None, CountingTree(), CountingScrollbar()
+
+
+def run(view_class, count):
+    root, tree, scrollbar = make_widgets()
+    store = ProcessStore()
+    view = view_class(tree, scrollbar, store)
+    view.attach()
+    rows = synthetic_rows(count)
+    results = {}
+
+    start = time.perf_counter()
+    store.load(rows)
+    view.refresh()
+    if root:
+        root.update()
+    results["primera carga"] = time.perf_counter() - start
+
+    rows = churn(rows, 0.01)
+    start = time.perf_counter()
+    store.load(rows)
+    view.refresh()
+    if root:
+        root.update()
+    results["refresco (1% cambios)"] = time.perf_counter() - start
+
+    if isinstance(view, VirtualProcessView):
+        start = time.perf_counter()
+        for step in range(100):
+            view.yview("moveto", step / 100)
+        if root:
+            root.update()
+        results["100 desplazamientos"] = time.perf_counter() - start
+        items = len(view.slots)
+    else:
+        items = len(view.items)
+
+    calls = getattr(tree, "calls", None)
+    if root:
+        root.destroy()
+    return results, items, calls
+
+
+# Método para medir la carga de una instantánea en el almacén, con y sin ordenación, y los filtros
+def run_store(count):
+    rows = churn(synthetic_rows(count), 0.01)
+    results = {}
+    store = ProcessStore()
+    start = time.perf_counter()
+    store.load(rows)
+    results["carga sin ordenar"] = time.perf_counter() - start
+    store.set_sort("cpu", True)
+    start = time.perf_counter()
+    store.load(rows)
+    results["carga ordenada por CPU"] = time.perf_counter() - start
+    # La permutación de la columna activa se recalcula entera con cada instantánea
+    key = SORT_KEYS["cpu"]
+    start = time.perf_counter()
+    sorted(range(len(rows)), key=lambda i: key(rows[i]))
+    results["  de ello, ordenar por CPU"] = time.perf_counter() - start
+    start = time.perf_counter()
+    store.set_filter("proc-1")
+    results["filtro por nombre (crea el índice)"] = time.perf_counter() - start
+    start = time.perf_counter()
+    store.set_filter("123")
+    results["filtro por PID"] = time.perf_counter() - start
+    start = time.perf_counter()
+    for row in rows[::max(1, count // 1000)]:
+        store.row(row.pid)
+    results["1000 búsquedas por PID"] = time.perf_counter() - start
+    return results
+
+
+# Método para medir la carga completa del árbol frente a la actualización incremental
+def run_tree(count):
+    rows = synthetic_rows(count)
+    results = {}
+    model = ProcessTreeModel()
+    start = time.perf_counter()
+    model.load(rows)
+    results["primera carga"] = time.perf_counter() - start
+    rows = churn(rows, 0.01)
+    start = time.perf_counter()
+    model.load(rows)
+    results["actualización (1% cambios)"] = time.perf_counter() - start
+    start = time.perf_counter()
+    ProcessTreeModel().load(rows)
+    results["reconstrucción completa"] = time.perf_counter() - start
+    return results
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"Procesos sintéticos: {count}")
+    for view_class in (KeyedProcessView, VirtualProcessView):
+        results, items, calls = run(view_class, count)
+        print(f"\n{view_class.__name__}: {items} elementos en Tk" + (f", {calls} llamadas" if calls is not None else ""))
+        for name, seconds in results.items():
+            print(f"  {name}: {seconds * 1000:.1f} ms")
+    print("\nProcessStore:")
+    for name, seconds in run_store(count).items():
+        print(f"  {name}: {seconds * 1000:.1f} ms")
+    print("\nProcessTreeModel:")
+    for name, seconds in run_tree(count).items():
+        print(f"  {name}: {seconds * 1000:.1f} ms")
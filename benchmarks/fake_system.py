@@ -0,0 +1,339 @@
+# Sistema sintético para los benchmarks: sustituye las funciones de psutil que
+# usa la aplicación por datos generados (procesos, núcleos, particiones,
+# discos e interfaces de red) con semilla fija, así que los resultados no
+# dependen del equipo en el que se ejecutan. Cada llamada a tick() avanza los
+# contadores y renueva una fracción de los procesos, como entre dos muestras.
+import itertools
+import os
+import random
+import socket
+from collections import namedtuple
+
+import psutil
+
+CpuTimes = namedtuple("CpuTimes", ["user", "system"])
+MemoryInfo = namedtuple("MemoryInfo", ["rss", "vms"])
+IoCounters = namedtuple("IoCounters", ["read_count", "write_count", "read_bytes", "write_bytes"])
+CtxSwitches = namedtuple("CtxSwitches", ["voluntary", "involuntary"])
+VirtualMemory = namedtuple("VirtualMemory", ["total", "available", "percent", "used", "free"])
+SwapMemory = namedtuple("SwapMemory", ["total", "used", "free", "percent", "sin", "sout"])
+Partition = namedtuple("Partition", ["device", "mountpoint", "fstype", "opts"])
+DiskUsage = namedtuple("DiskUsage", ["total", "used", "free", "percent"])
+DiskCounters = namedtuple("DiskCounters", ["read_count", "write_count", "read_bytes", "write_bytes",
+                                           "read_time", "write_time"])
+NetCounters = namedtuple("NetCounters", ["bytes_sent", "bytes_recv", "packets_sent", "packets_recv",
+                                         "errin", "errout", "dropin", "dropout"])
+Address = namedtuple("Address", ["family", "address", "netmask", "broadcast", "ptp"])
+CpuFreq = namedtuple("CpuFreq", ["current", "min", "max"])
+Temperature = namedtuple("Temperature", ["label", "current", "high", "critical"])
+
+TOTAL_MEMORY = 256 * 1024**3
+BOOT_TIME = 1_700_000_000.0
+USERS = ("root", "builder", "www-data", "postgres", "nobody")
+
+
+# Datos de un proceso sintético
+class FakeProcessData:
+    __slots__ = ("pid", "ppid", "name", "user", "create_time", "cpu", "cpu_time", "rss", "status",
+                 "read_bytes", "write_bytes", "ctx", "threads", "fds")
+
+    def __init__(self, pid, ppid, rnd, now):
+        self.pid = pid
+        self.ppid = ppid
+        # Nombre y usuario no dependen del PID: un PID reutilizado es otro programa
+        self.name = f"proc-{rnd.randrange(997)}"
+        self.user = rnd.choice(USERS)
+        self.create_time = now - rnd.uniform(1, 86400)
+        self.cpu = rnd.uniform(0, 50)
+        self.cpu_time = self.cpu * (now - self.create_time) / 100
+        self.rss = rnd.randrange(1 << 20, 1 << 30)
+        self.status = "running" if rnd.random() < 0.1 else "sleeping"
+        self.read_bytes = rnd.randrange(1 << 30)
+        self.write_bytes = rnd.randrange(1 << 30)
+        self.ctx = rnd.randrange(1 << 20)
+        self.threads = rnd.randrange(1, 64)
+        self.fds = rnd.randrange(3, 512)
+
+
+# Sustituto de psutil.Process sobre los datos sintéticos.
+# Como en psutil, los métodos leen el proceso que tenga ahora el PID: si el PID
+# se ha reutilizado devuelven los datos del proceso nuevo. Sólo create_time()
+# (guardado al crear el objeto) e is_running() revelan el cambio.
+class FakeProcess:
+    def __init__(self, pid, system=None):
+        self._system = system or FakeProcess.system
+        data = self._system.processes.get(pid)
+        if data is None:
+            raise psutil.NoSuchProcess(pid)
+        self.pid = pid
+        self._create_time = data.create_time
+
+    def _current(self):
+        data = self._system.processes.get(self.pid)
+        if data is None:
+            raise psutil.NoSuchProcess(self.pid)
+        return data
+
+    def oneshot(self):
+        return _NullContext()
+
+    def create_time(self):
+        return self._create_time
+
+    def is_running(self):
+        data = self._system.processes.get(self.pid)
+        return data is not None and data.create_time == self._create_time
+
+    def name(self):
+        return self._current().name
+
+    def username(self):
+        return self._current().user
+
+    def status(self):
+        return self._current().status
+
+    def ppid(self):
+        return self._current().ppid
+
+    def cpu_times(self):
+        return CpuTimes(self._current().cpu_time, 0.0)
+
+    def cpu_percent(self, interval=None):
+        return self._current().cpu
+
+    def memory_info(self):
+        return MemoryInfo(self._current().rss, self._current().rss * 2)
+
+    def io_counters(self):
+        data = self._current()
+        return IoCounters(0, 0, data.read_bytes, data.write_bytes)
+
+    def num_ctx_switches(self):
+        return CtxSwitches(self._current().ctx, 0)
+
+    def num_threads(self):
+        return self._current().threads
+
+    def num_fds(self):
+        return self._current().fds
+
+    def terminate(self):
+        pass
+
+    kill = terminate
+
+
+class _NullContext:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+# Sistema sintético completo
+class FakeSystem:
+    def __init__(self, processes=1000, cores=64, partitions=8, disks=4, nics=4, churn=0.01, reuse=0.2, seed=0):
+        self.random = random.Random(seed)
+        self.cores = cores
+        self.churn = churn
+        self.reuse = reuse      # fracción de procesos nuevos que reutilizan el PID de uno terminado
+        self.clock = BOOT_TIME + 3600.0
+        self.processes = {}
+        self.next_pid = 1
+        for _ in range(processes):
+            self._spawn()
+        self.partitions = [Partition(f"/dev/sd{chr(97 + i % 26)}{i // 26 + 1}", "/" if i == 0 else f"/mnt/data{i}",
+                                     "ext4", "rw") for i in range(partitions)]
+        self.disks = {f"sd{chr(97 + i % 26)}": [0, 0, 0, 0] for i in range(disks)}
+        self.nics = {f"eth{i}": [0, 0, 0, 0] for i in range(nics)}
+        self._saved = {}
+
+    def _spawn(self, pid=None):
+        if pid is None:
+            pid = self.next_pid
+            self.next_pid += 1
+        # Los padres son procesos anteriores, así se forma un árbol de varios niveles
+        ppid = self.random.randrange(1, pid) if pid > 1 and self.processes else 0
+        if ppid not in self.processes:
+            ppid = 1 if 1 in self.processes and pid != 1 else 0
+        self.processes[pid] = FakeProcessData(pid, ppid, self.random, self.clock)
+
+    # Método para avanzar un intervalo: contadores, uso de CPU y procesos que nacen y terminan
+    def tick(self, seconds=1.0):
+        self.clock += seconds
+        rnd = self.random
+        pids = list(self.processes)
+        changes = max(1, int(len(pids) * self.churn)) if pids else 0
+        freed = []
+        for pid in rnd.sample(pids, min(changes, len(pids))):
+            if pid != 1:
+                del self.processes[pid]
+                freed.append(pid)
+        for _ in range(changes):
+            # Algunos procesos nuevos reciben el PID de uno que acaba de terminar
+            self._spawn(freed.pop() if freed and rnd.random() < self.reuse else None)
+        for pid in rnd.sample(list(self.processes), min(len(self.processes), changes * 10)):
+            data = self.processes[pid]
+            data.cpu = rnd.uniform(0, 100)
+            data.cpu_time += data.cpu * seconds / 100
+            data.read_bytes += rnd.randrange(1 << 20)
+            data.write_bytes += rnd.randrange(1 << 20)
+            data.ctx += rnd.randrange(1000)
+        for counters in list(self.disks.values()) + list(self.nics.values()):
+            for i in range(4):
+                counters[i] += rnd.randrange(1 << 20)
+
+    # Funciones de psutil sustituidas
+    def pids(self):
+        return list(self.processes)
+
+    def cpu_percent(self, interval=None, percpu=False):
+        if percpu:
+            return [round(self.random.uniform(0, 100), 1) for _ in range(self.cores)]
+        return round(self.random.uniform(0, 100), 1)
+
+    def cpu_count(self, logical=True):
+        return self.cores if logical else max(1, self.cores // 2)
+
+    def cpu_freq(self, percpu=False):
+        return CpuFreq(2400.0, 800.0, 3600.0)
+
+    def getloadavg(self):
+        return (self.cores * 0.5, self.cores * 0.4, self.cores * 0.3)
+
+    def sensors_temperatures(self, fahrenheit=False):
+        return {"coretemp": [Temperature(f"Core {i}", 45.0 + i % 10, 90.0, 100.0) for i in range(self.cores // 2)]}
+
+    def virtual_memory(self):
+        used = sum(data.rss for data in itertools.islice(self.processes.values(), 1000)) % TOTAL_MEMORY
+        return VirtualMemory(TOTAL_MEMORY, TOTAL_MEMORY - used, used / TOTAL_MEMORY * 100, used, TOTAL_MEMORY - used)
+
+    def swap_memory(self):
+        return SwapMemory(8 * 1024**3, 1024**3, 7 * 1024**3, 12.5, 0, 0)
+
+    def boot_time(self):
+        return BOOT_TIME
+
+    def disk_partitions(self, all=False):
+        return list(self.partitions)
+
+    def disk_usage(self, path):
+        total = 1024**4
+        used = sum(path.encode()) % 100 * total // 100
+        return DiskUsage(total, used, total - used, used / total * 100)
+
+    def disk_io_counters(self, perdisk=False):
+        counters = {name: DiskCounters(values[0], values[1], values[2], values[3], 0, 0)
+                    for name, values in self.disks.items()}
+        if perdisk:
+            return counters
+        return DiskCounters(*(sum(column) for column in zip(*counters.values())))
+
+    def net_io_counters(self, pernic=False):
+        counters = {name: NetCounters(values[0], values[1], values[2], values[3], 0, 0, 0, 0)
+                    for name, values in self.nics.items()}
+        if pernic:
+            return counters
+        return NetCounters(*(sum(column) for column in zip(*counters.values())))
+
+    def net_if_addrs(self):
+        return {name: [Address(socket.AF_INET, f"10.0.{i}.1", "255.255.255.0", None, None),
+                       Address(getattr(socket, "AF_PACKET", psutil.AF_LINK), f"02:00:00:00:00:{i:02x}", None, None, None)]
+                for i, name in enumerate(self.nics)}
+
+    # Método para crear un árbol /sys/class/hwmon sintético en una carpeta: un chip coretemp
+    # por zócalo (encapsulado y un sensor por núcleo físico), acpitz y un chip con ventiladores
+    def write_hwmon(self, directory, sockets=2):
+        chips = []
+        cores_per_socket = max(1, self.cores // 2 // sockets)
+        for socket_index in range(sockets):
+            sensors = [("temp", 1, "Package id %d" % socket_index, 60000)]
+            sensors += [("temp", core + 2, f"Core {core}", 45000 + core % 20 * 500) for core in range(cores_per_socket)]
+            chips.append(("coretemp", sensors))
+        chips.append(("acpitz", [("temp", 1, None, 27800)]))
+        chips.append(("nct6775", [("fan", index, f"fan{index}", 900 + index * 100) for index in range(1, 6)]))
+        for chip_index, (name, sensors) in enumerate(chips):
+            path = os.path.join(directory, f"hwmon{chip_index}")
+            os.makedirs(path, exist_ok=True)
+            with open(os.path.join(path, "name"), "w") as name_file:
+                name_file.write(name + "\n")
+            for kind, index, label, value in sensors:
+                files = {"input": value}
+                if label:
+                    files["label"] = label
+                if kind == "temp":
+                    files.update(max=90000, crit=100000)
+                for suffix, content in files.items():
+                    with open(os.path.join(path, f"{kind}{index}_{suffix}"), "w") as sensor_file:
+                        sensor_file.write(f"{content}\n")
+        return directory
+
+    # Método para crear un /proc sintético con /proc/net/tcp y tcp6 y los descriptores de
+    # los procesos dueños (enlaces "socket:[inodo]"), para medir el listado de conexiones
+    def write_proc_net(self, directory, connections=10000, processes=100):
+        rnd = random.Random(len(self.processes))
+        os.makedirs(os.path.join(directory, "net"), exist_ok=True)
+        header = "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode\n"
+        files = {"tcp": [header], "tcp6": [header], "udp": [header], "udp6": [header]}
+        owned = {}
+        for index in range(connections):
+            proto = ("tcp", "tcp", "tcp6", "udp")[index % 4]
+            chance = rnd.random()
+            state = 0x0A if chance < 0.02 else (0x06 if chance < 0.15 else 0x01)
+            if proto == "udp":
+                state = 0x07
+            # Los sockets en TIME_WAIT ya no tienen inodo ni proceso
+            inode = 0 if state == 0x06 else index + 1000
+            if proto == "tcp6":
+                local = f"0000000000000000FFFF0000{rnd.getrandbits(32):08X}:{rnd.randrange(1, 65536):04X}"
+                remote = f"0000000000000000FFFF0000{rnd.getrandbits(32):08X}:{rnd.randrange(1, 65536):04X}"
+            else:
+                local = f"{rnd.getrandbits(32):08X}:{rnd.randrange(1, 65536):04X}"
+                remote = f"{rnd.getrandbits(32):08X}:{rnd.randrange(1, 65536):04X}"
+            lines = files[proto]
+            lines.append(f"{len(lines) - 1:>5}: {local} {remote} {state:02X} 00000000:00000000 00:00000000 "
+                         f"00000000  1000        0 {inode} 1 0000000000000000 20 4 30 10 -1\n")
+            if inode:
+                owned.setdefault(index % processes + 1, []).append(inode)
+        for name, lines in files.items():
+            with open(os.path.join(directory, "net", name), "w") as net_file:
+                net_file.writelines(lines)
+        for pid in range(1, processes + 1):
+            fd_dir = os.path.join(directory, str(pid), "fd")
+            os.makedirs(fd_dir, exist_ok=True)
+            with open(os.path.join(directory, str(pid), "stat"), "w") as stat_file:
+                stat_file.write(f"{pid} (proc-{pid}) S 1 {' '.join(['0'] * 17)} {pid * 100} 0 0\n")
+            targets = ["/dev/null", "/dev/null", "/dev/null"] + [f"socket:[{inode}]" for inode in owned.get(pid, ())]
+            for fd, target in enumerate(targets):
+                os.symlink(target, os.path.join(fd_dir, str(fd)))
+        return directory
+
+    # Método para sustituir psutil por este sistema (restore() lo deshace)
+    def install(self):
+        FakeProcess.system = self
+        replacements = {"Process": FakeProcess}
+        for name in ("pids", "cpu_percent", "cpu_count", "cpu_freq", "getloadavg", "sensors_temperatures",
+                     "virtual_memory", "swap_memory", "boot_time", "disk_partitions", "disk_usage",
+                     "disk_io_counters", "net_io_counters", "net_if_addrs"):
+            replacements[name] = getattr(self, name)
+        for name, value in replacements.items():
+            self._saved[name] = getattr(psutil, name, None)
+            setattr(psutil, name, value)
+        return self
+
+    def restore(self):
+        for name, value in self._saved.items():
+            if value is None:
+                delattr(psutil, name)
+            else:
+                setattr(psutil, name, value)
+        self._saved = {}
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc):
+        self.restore()
+        return False
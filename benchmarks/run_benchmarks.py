@@ -0,0 +1,382 @@
+# Batería de benchmarks reproducibles de la recogida de datos y de la
+# actualización de la interfaz, sobre un sistema sintético (fake_system.py) en
+# lugar del psutil real: de 100 a 50 000 procesos y de 64 a 256 núcleos.
+# Con pantalla (o bajo Xvfb) los widgets son de Tk real; sin ella se usa el
+# sustituto de tk_stub.py, que mide sólo el coste en Python.
+#
+# Uso:
+#   python benchmarks/run_benchmarks.py                          # todos los casos
+#   python benchmarks/run_benchmarks.py --quick                  # sólo los tamaños pequeños
+#   python benchmarks/run_benchmarks.py --filter ui. --output resultados.json
+#   python benchmarks/run_benchmarks.py --baseline base.json --threshold 0.25
+#   xvfb-run -a python benchmarks/run_benchmarks.py --tk real
+#
+# Con --baseline el programa termina con código 1 si algún caso es más lento
+# (mediana) o reserva más memoria (pico de tracemalloc) que la referencia en
+# más del umbral indicado. Los resultados de --output sirven como referencia.
+import argparse
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, BENCHMARKS_DIR)
+
+from fake_system import FakeSystem
+
+PROCESS_COUNTS = (100, 1000, 10000, 50000)
+CONNECTION_COUNTS = (10000, 100000)
+QUICK_CONNECTION_COUNTS = (10000,)
+CORE_COUNTS = (64, 128, 256)
+QUICK_PROCESS_COUNTS = (100, 1000)
+QUICK_CORE_COUNTS = (64,)
+PROCESS_VIEWS = ("virtual", "keyed", "tree")
+# Diferencias por debajo de estas no se consideran regresiones (ruido de medida)
+MIN_DELTA_MS = 0.05
+MIN_DELTA_KB = 64
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de Analiza Tu Sistema sobre un sistema sintético")
+    parser.add_argument("--quick", action="store_true", help="sólo 100 y 1000 procesos y 64 núcleos")
+    parser.add_argument("--filter", default="", help="ejecutar sólo los casos cuyo nombre contenga este texto")
+    parser.add_argument("--tk", choices=("auto", "real", "stub"), default="auto",
+                        help="widgets de Tk reales (necesita pantalla o Xvfb) o sustitutos (por defecto auto)")
+    parser.add_argument("--repeats", type=int, default=15, help="repeticiones máximas por caso (por defecto 15)")
+    parser.add_argument("--budget", type=float, default=3.0,
+                        help="segundos como máximo por caso; siempre se hacen al menos 3 repeticiones (por defecto 3)")
+    parser.add_argument("--output", metavar="FICHERO", help="guardar los resultados en JSON")
+    parser.add_argument("--baseline", metavar="FICHERO", help="resultados de referencia con los que comparar")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="empeoramiento máximo admitido frente a la referencia (por defecto 0.25 = 25%%)")
+    return parser.parse_args(argv)
+
+
+# Caso de benchmark: factory() prepara el estado y devuelve (prepare, run);
+# prepare() se ejecuta sin medir antes de cada repetición y run() es lo que se mide
+class Case:
+    def __init__(self, name, params, factory):
+        self.name = name
+        self.params = params
+        self.factory = factory
+
+
+# Método para medir un caso: tiempos de cada repetición y pico de memoria de una de ellas
+def measure(case, repeats, budget):
+    prepare, run = case.factory()
+    prepare()
+    run()  # calentamiento
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeats and (len(times) < 3 or time.perf_counter() - started < budget):
+        prepare()
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) * 1000)
+    prepare()
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "params": case.params,
+        "repeats": len(times),
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "mean_ms": statistics.fmean(times),
+        "stdev_ms": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "peak_kb": peak / 1024
+    }
+
+
+# Casos de recogida de datos (collector, rates, caché de procesos)
+def collection_cases(process_counts, core_counts, connection_counts):
+    import collector
+    from collector import ProcessCache
+    from rates import IoRateEngine
+    from sensors import HwmonSensors, PsutilSensors
+    from connections import ProcNetConnections
+
+    cases = []
+    for cores in core_counts:
+        def factory(cores=cores):
+            FakeSystem(processes=100, cores=cores).install()
+            return (lambda: None), collector.sample_cpu
+        cases.append(Case(f"collect.cpu[cores={cores}]", {"cores": cores}, factory))
+
+        # Sensores sobre un árbol hwmon sintético en una carpeta temporal
+        def hwmon_factory(cores=cores):
+            directory = tempfile.mkdtemp(prefix="ats-hwmon-")
+            atexit.register(shutil.rmtree, directory, True)
+            sensors = HwmonSensors(FakeSystem(processes=1, cores=cores).write_hwmon(directory))
+            sensors.sample()
+            return (lambda: None), sensors.sample
+        cases.append(Case(f"collect.sensors_hwmon[cores={cores}]", {"cores": cores}, hwmon_factory))
+
+        def psutil_sensors_factory(cores=cores):
+            FakeSystem(processes=1, cores=cores).install()
+            return (lambda: None), PsutilSensors().sample
+        cases.append(Case(f"collect.sensors_psutil[cores={cores}]", {"cores": cores}, psutil_sensors_factory))
+
+    def memory_factory():
+        FakeSystem(processes=100).install()
+        return (lambda: None), collector.collect_memory
+    cases.append(Case("collect.memory", {}, memory_factory))
+
+    def disks_factory():
+        FakeSystem(processes=10, partitions=32).install()
+        # Sin caché: cada muestra consulta todos los montajes, como al vencer el TTL
+        prober = collector.DiskUsageProber(ttl=0)
+        return (lambda: None), lambda: collector.collect_disks(prober)
+    cases.append(Case("collect.disks[partitions=32]", {"partitions": 32}, disks_factory))
+
+    def network_factory():
+        FakeSystem(processes=10, nics=16).install()
+        return (lambda: None), collector.collect_network
+    cases.append(Case("collect.network[nics=16]", {"nics": 16}, network_factory))
+
+    def rates_factory():
+        system = FakeSystem(processes=10, disks=16, nics=16).install()
+        engine = IoRateEngine()
+        engine.sample()
+        return system.tick, engine.sample
+    cases.append(Case("collect.io_rates[disks=16,nics=16]", {"disks": 16, "nics": 16}, rates_factory))
+
+    for count in process_counts:
+        def factory(count=count, details=None):
+            system = FakeSystem(processes=count).install()
+            cache = ProcessCache()
+            if details:
+                cache.details.configure(True, *details)
+            cache.sample()
+            return system.tick, cache.sample
+        cases.append(Case(f"collect.processes[n={count}]", {"processes": count}, factory))
+        cases.append(Case(f"collect.processes_details[n={count},top=50,metric=io]",
+                          {"processes": count, "top": 50, "metric": "io"},
+                          lambda factory=factory: factory(details=(50, "io"))))
+
+    # Conexiones sobre un /proc sintético (tras la primera muestra sólo se resuelven los descriptores nuevos)
+    for count in connection_counts:
+        def factory(count=count):
+            directory = tempfile.mkdtemp(prefix="ats-proc-")
+            atexit.register(shutil.rmtree, directory, True)
+            reader = ProcNetConnections(FakeSystem(processes=1).write_proc_net(directory, count, 200))
+            reader.sample()
+            return (lambda: None), reader.sample
+        cases.append(Case(f"collect.connections[n={count}]", {"connections": count}, factory))
+    return cases
+
+
+# Método para crear la aplicación sin su constructor (sin hilos de muestreo ni inventario)
+def make_app(tk):
+    from types import SimpleNamespace
+    from main import SystemInfoApp
+    from collector import ProcessCache
+    from history import MetricHistory
+
+    root = tk.Tk()
+    app = SystemInfoApp.__new__(SystemInfoApp)
+    app.root = root
+    app.style = None
+    app.settings = {}
+    app.history = MetricHistory(seconds=600, resolution=1.0)
+    app.charts = []
+    app.inventory = SimpleNamespace(results={})
+    app.inventory_labels = {}
+    app.sampler = SimpleNamespace(trigger=lambda name: None)
+    app.process_cache = ProcessCache()
+    return app
+
+
+# Método para que Tk real procese el dibujo pendiente (no hace nada con el sustituto)
+def flush(app):
+    update = getattr(app.root, "update_idletasks", None)
+    if update is not None:
+        update()
+
+
+def close_app(app):
+    destroy = getattr(app.root, "destroy", None)
+    if destroy is not None:
+        destroy()
+
+
+# Casos de actualización de la interfaz (métodos de SystemInfoApp)
+def ui_cases(tk, process_counts, core_counts, connection_counts):
+    import collector
+    from sensors import PsutilSensors
+    from connections import ProcNetConnections
+
+    cases = []
+    apps = []
+    for cores in core_counts:
+        def factory(cores=cores):
+            FakeSystem(processes=100, cores=cores).install()
+            app = make_app(tk)
+            apps.append(app)
+            app.create_cpu_tab(app.root)
+            sensors = PsutilSensors()
+            app.update_sensors(sensors.sample())
+            flush(app)
+            state = {}
+
+            def prepare():
+                state["snapshot"] = collector.sample_cpu()
+                state["sensors"] = sensors.sample()
+
+            def run():
+                snapshot = state["snapshot"]
+                app.record_cpu_history(snapshot)
+                app.update_cpu_info(snapshot)
+                app.update_sensors(state["sensors"])
+                app.redraw_charts()
+                flush(app)
+            return prepare, run
+        cases.append(Case(f"ui.cpu[cores={cores}]", {"cores": cores}, factory))
+
+    def memory_factory():
+        FakeSystem(processes=100).install()
+        app = make_app(tk)
+        apps.append(app)
+        app.create_memory_tab(app.root)
+        flush(app)
+        state = {}
+
+        def prepare():
+            state["snapshot"] = collector.collect_memory()
+
+        def run():
+            snapshot = state["snapshot"]
+            app.record_memory_history(snapshot)
+            app.update_memory_info(snapshot)
+            app.redraw_charts()
+            flush(app)
+        return prepare, run
+    cases.append(Case("ui.memory", {}, memory_factory))
+
+    for count in process_counts:
+        for view in PROCESS_VIEWS:
+            def factory(count=count, view=view):
+                system = FakeSystem(processes=count).install()
+                app = make_app(tk)
+                apps.append(app)
+                app.create_process_tab(app.root)
+                label = next(label for label, mode in app.process_view_modes.items() if mode == view)
+                app.process_view_var.set(label)
+                app.on_process_view_change()
+                app.update_process_list(app.process_cache.sample())
+                flush(app)
+                state = {}
+
+                def prepare():
+                    system.tick()
+                    state["snapshot"] = app.process_cache.sample()
+
+                def run():
+                    app.update_process_list(state["snapshot"])
+                    flush(app)
+                return prepare, run
+            cases.append(Case(f"ui.processes[n={count},view={view}]", {"processes": count, "view": view}, factory))
+
+    for count in connection_counts:
+        def factory(count=count):
+            directory = tempfile.mkdtemp(prefix="ats-proc-")
+            atexit.register(shutil.rmtree, directory, True)
+            snapshot = ProcNetConnections(FakeSystem(processes=1).write_proc_net(directory, count, 200)).sample()
+            app = make_app(tk)
+            apps.append(app)
+            app.last_snapshots = {"connections": snapshot}
+            app.create_connections_section(app.root)
+            app.update_connections(snapshot)
+            flush(app)
+
+            def run():
+                app.update_connections(snapshot)
+                flush(app)
+            return (lambda: None), run
+        cases.append(Case(f"ui.connections[n={count}]", {"connections": count}, factory))
+    return cases, apps
+
+
+# Método para comparar con la referencia: devuelve la lista de regresiones
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for key, min_delta in (("median_ms", MIN_DELTA_MS), ("peak_kb", MIN_DELTA_KB)):
+            old, new = base.get(key), result.get(key)
+            if old is None or new is None:
+                continue
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append(f"{name}: {key} {old:.2f} -> {new:.2f} (+{(new / old - 1) * 100 if old else 0:.0f}%)")
+    return regressions
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    use_real = args.tk == "real" or (args.tk == "auto" and (os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin")))
+    if not use_real:
+        import tk_stub
+        tk_stub.install()
+    import tkinter as tk
+
+    process_counts = QUICK_PROCESS_COUNTS if args.quick else PROCESS_COUNTS
+    core_counts = QUICK_CORE_COUNTS if args.quick else CORE_COUNTS
+    connection_counts = QUICK_CONNECTION_COUNTS if args.quick else CONNECTION_COUNTS
+    cases = collection_cases(process_counts, core_counts, connection_counts)
+    interface_cases, apps = ui_cases(tk, process_counts, core_counts, connection_counts)
+    cases += interface_cases
+    cases = [case for case in cases if args.filter in case.name]
+
+    results = {}
+    print(f"{'caso':<60} {'mediana ms':>11} {'mín ms':>9} {'pico KB':>10} {'rep':>4}")
+    for case in cases:
+        result = measure(case, args.repeats, args.budget)
+        results[case.name] = result
+        print(f"{case.name:<60} {result['median_ms']:>11.3f} {result['min_ms']:>9.3f} "
+              f"{result['peak_kb']:>10.1f} {result['repeats']:>4}", flush=True)
+        while apps:
+            close_app(apps.pop())
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "tk": "real" if use_real else "stub",
+            "quick": args.quick
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("meta", {}).get("tk") != report["meta"]["tk"]:
+            print("Aviso: la referencia se midió con otro tipo de widgets de Tk", file=sys.stderr)
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        if regressions:
+            print(f"\nRegresiones (umbral {args.threshold * 100:.0f}%):", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\nSin regresiones frente a {args.baseline} (umbral {args.threshold * 100:.0f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+# Sustituto de tkinter para medir sin pantalla.
+# Los widgets guardan sus opciones y no dibujan nada; el Treeview mantiene sus
+# elementos (padres, hijos, valores) igual que el real para que las vistas de
+# la tabla de procesos hagan el mismo trabajo. Así se mide el coste en Python
+# de las actualizaciones de la interfaz sin el de Tk. Con pantalla (o Xvfb) se
+# usa el tkinter real.
+# Debe instalarse antes de importar main, charts o process_table.
+import sys
+import types
+
+CONSTANTS = {
+    "END": "end", "LEFT": "left", "RIGHT": "right", "TOP": "top", "BOTTOM": "bottom",
+    "BOTH": "both", "X": "x", "Y": "y", "N": "n", "S": "s", "E": "e", "W": "w",
+    "NW": "nw", "NE": "ne", "SW": "sw", "SE": "se", "CENTER": "center",
+    "NORMAL": "normal", "DISABLED": "disabled", "HORIZONTAL": "horizontal", "VERTICAL": "vertical",
+    "NONE": "none", "WORD": "word", "INSERT": "insert"
+}
+
+
+class TclError(Exception):
+    pass
+
+
+# Método que acepta cualquier llamada y no hace nada
+def _noop(*args, **kwargs):
+    return None
+
+
+class Variable:
+    default = ""
+
+    def __init__(self, master=None, value=None, name=None):
+        self._value = self.default if value is None else value
+        self._traces = []
+
+    def get(self):
+        return self._value
+
+    def set(self, value):
+        self._value = value
+        for callback in self._traces:
+            callback("", "", "write")
+
+    def trace_add(self, mode, callback):
+        self._traces.append(callback)
+        return str(len(self._traces))
+
+
+class StringVar(Variable):
+    default = ""
+
+
+class BooleanVar(Variable):
+    default = False
+
+
+class IntVar(Variable):
+    default = 0
+
+
+class DoubleVar(Variable):
+    default = 0.0
+
+
+# Widget genérico: guarda las opciones y acepta cualquier método
+class Widget:
+    def __init__(self, master=None, **options):
+        self.master = master
+        self.options = dict(options)
+        self.children_list = []
+        if isinstance(master, Widget):
+            master.children_list.append(self)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return _noop
+
+    def configure(self, cnf=None, **options):
+        self.options.update(cnf or {}, **options)
+
+    config = configure
+
+    def cget(self, key):
+        return self.options.get(key, "")
+
+    def __getitem__(self, key):
+        return self.options.get(key, "")
+
+    def __setitem__(self, key, value):
+        self.options[key] = value
+
+    def bind(self, sequence=None, func=None, add=None):
+        return sequence
+
+    def after(self, ms, func=None, *args):
+        return "after#0"
+
+    def winfo_width(self):
+        return int(self.options.get("width") or 200)
+
+    def winfo_height(self):
+        return int(self.options.get("height") or 600)
+
+    def winfo_reqwidth(self):
+        return self.winfo_width()
+
+    def winfo_reqheight(self):
+        return self.winfo_height()
+
+    def winfo_viewable(self):
+        return 1
+
+    def winfo_children(self):
+        return list(self.children_list)
+
+    def winfo_rootx(self):
+        return 0
+
+    def winfo_rooty(self):
+        return 0
+
+    def destroy(self):
+        if isinstance(self.master, Widget) and self in self.master.children_list:
+            self.master.children_list.remove(self)
+
+
+class Canvas(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self._items = 0
+
+    def _create(self, *args, **options):
+        self._items += 1
+        return self._items
+
+    create_line = create_text = create_window = create_rectangle = create_oval = _create
+
+    def bbox(self, *args):
+        return (0, 0, 0, 0)
+
+
+# Treeview con elementos reales (sin dibujo)
+class Treeview(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self.items = {"": {"parent": None, "children": [], "values": (), "text": "", "open": False}}
+        self._next = 0
+        self._selection = ()
+        self._focus = ""
+
+    def insert(self, parent, index, iid=None, text="", values=(), open=False, **options):
+        if iid is None:
+            self._next += 1
+            iid = f"I{self._next:03X}"
+        elif iid in self.items:
+            raise TclError(f"Item {iid} already exists")
+        self.items[iid] = {"parent": parent, "children": [], "values": tuple(values), "text": text, "open": open}
+        siblings = self.items[parent]["children"]
+        if index == "end" or index >= len(siblings):
+            siblings.append(iid)
+        else:
+            siblings.insert(index, iid)
+        return iid
+
+    def item(self, iid, option=None, **options):
+        item = self.items[iid]
+        for key, value in options.items():
+            item[key] = tuple(value) if key == "values" else value
+        if option is not None:
+            return item.get(option, "")
+        if not options:
+            return dict(item)
+        return None
+
+    def delete(self, *iids):
+        for iid in iids:
+            item = self.items.get(iid)
+            if item is None:
+                continue
+            self.items[item["parent"]]["children"].remove(iid)
+            self._drop(iid)
+
+    def _drop(self, iid):
+        for child in self.items.pop(iid)["children"]:
+            self._drop(child)
+
+    def move(self, iid, parent, index):
+        item = self.items[iid]
+        self.items[item["parent"]]["children"].remove(iid)
+        item["parent"] = parent
+        siblings = self.items[parent]["children"]
+        if index == "end" or index >= len(siblings):
+            siblings.append(iid)
+        else:
+            siblings.insert(index, iid)
+
+    def get_children(self, item=""):
+        return tuple(self.items[item]["children"])
+
+    def parent(self, iid):
+        return self.items[iid]["parent"]
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def index(self, iid):
+        return self.items[self.items[iid]["parent"]]["children"].index(iid)
+
+    def selection(self):
+        return self._selection
+
+    def selection_set(self, *items):
+        if len(items) == 1 and isinstance(items[0], (tuple, list)):
+            items = items[0]
+        self._selection = tuple(items)
+
+    def selection_remove(self, *items):
+        if len(items) == 1 and isinstance(items[0], (tuple, list)):
+            items = items[0]
+        self._selection = tuple(item for item in self._selection if item not in items)
+
+    def focus(self, iid=None):
+        if iid is None:
+            return self._focus
+        self._focus = iid
+
+    def identify_row(self, y):
+        return ""
+
+
+class Style:
+    def __init__(self, master=None):
+        pass
+
+    def lookup(self, style, option, state=None, default=None):
+        return default or ""
+
+    configure = map = theme_use = layout = _noop
+
+
+# Método para crear un módulo con los widgets indicados
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+
+# Método para sustituir tkinter en sys.modules (devuelve el módulo falso)
+def install():
+    widgets = {name: type(name, (Widget,), {}) for name in (
+        "Tk", "Toplevel", "Frame", "Label", "Button", "Menu", "Entry", "Scrollbar", "Text", "Listbox", "PhotoImage"
+    )}
+    ttk_widgets = {name: type(name, (Widget,), {}) for name in (
+        "Frame", "LabelFrame", "Label", "Button", "Checkbutton", "Radiobutton", "Combobox", "Entry", "Notebook",
+        "Progressbar", "Scrollbar", "Scale", "Spinbox", "Separator", "Sizegrip"
+    )}
+    ttk = _module("tkinter.ttk", Treeview=Treeview, Style=Style, **ttk_widgets)
+    filedialog = _module("tkinter.filedialog", askopenfilename=_noop, asksaveasfilename=_noop, askdirectory=_noop)
+    messagebox = _module("tkinter.messagebox", showerror=_noop, showinfo=_noop, showwarning=_noop,
+                         askyesno=lambda *args, **kwargs: False)
+    tkinter = _module(
+        "tkinter", TclError=TclError, Widget=Widget, Canvas=Canvas, Variable=Variable, StringVar=StringVar,
+        BooleanVar=BooleanVar, IntVar=IntVar, DoubleVar=DoubleVar, TkVersion=8.6, ttk=ttk,
+        filedialog=filedialog, messagebox=messagebox, **widgets, **CONSTANTS
+    )
+    tkinter.__path__ = []
+    sys.modules.update({"tkinter": tkinter, "tkinter.ttk": ttk, "tkinter.filedialog": filedialog,
+                        "tkinter.messagebox": messagebox})
+    return tkinter
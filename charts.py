@@ -0,0 +1,46 @@
+# Gráficas ligeras dibujadas sobre un Canvas de Tk.
+# Los elementos del canvas se crean una sola vez y en cada redibujado sólo se
+# actualizan sus coordenadas y su texto.
+import tkinter as tk
+
+
+# Gráfica de línea (sparkline) asociada a un RingBuffer
+class Sparkline(tk.Canvas):
+    def __init__(self, parent, buffer, label="", maximum=None, formatter=None,
+                 color="green", width=200, height=40):
+        super().__init__(parent, width=width, height=height, highlightthickness=1,
+                         highlightbackground="#cccccc", background="white")
+        self.buffer = buffer
+        self.label = label
+        self.maximum = maximum          # None: escala automática según la ventana
+        self.formatter = formatter or (lambda value: f"{value:.1f}%")
+        self.line = self.create_line(0, 0, 0, 0, fill=color, width=1)
+        self.text = self.create_text(3, 2, anchor="nw", text=label, font=("TkDefaultFont", 8))
+
+    # Método para redibujar la línea con los valores actuales del buffer
+    def redraw(self):
+        # No se dibuja nada mientras la gráfica no esté a la vista
+        if not self.winfo_viewable():
+            return
+        width = self.winfo_width()
+        height = self.winfo_height()
+        values = self.buffer.values()
+        count = len(values)
+        if count < 2 or width < 2:
+            return
+
+        # Un punto como mucho por píxel: se toma uno de cada "stride" valores
+        stride = max(1, -(-self.buffer.size // width))
+        values = values[(count - 1) % stride::stride]
+        maximum = self.maximum or max(values) or 1.0
+        step = width / max(1, self.buffer.size // stride - 1)
+        x = width - (len(values) - 1) * step
+        scale = (height - 4) / maximum
+        coords = []
+        for value in values:
+            coords.append(x)
+            coords.append(height - 2 - min(value, maximum) * scale)
+            x += step
+        self.coords(self.line, coords)
+        current = self.formatter(values[-1])
+        self.itemconfigure(self.text, text=f"{self.label}: {current}" if self.label else current)
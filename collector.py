@@ -0,0 +1,573 @@
+# Recogida de datos del sistema, independiente de la interfaz gráfica.
+# Todas las funciones devuelven instantáneas inmutables (namedtuple) con los
+# valores en bruto; el formato para mostrarlos lo decide quien las usa.
+# Este módulo no debe importar tkinter ni PIL: lo usan también el modo sin
+# interfaz (headless.py) y los hilos de muestreo.
+import getpass
+import heapq
+import os
+import platform
+import socket
+import threading
+import time
+from collections import namedtuple
+
+import psutil
+
+# Instantáneas inmutables
+SystemSnapshot = namedtuple("SystemSnapshot", [
+    "system", "version", "edition", "architecture", "hostname", "user", "boot_time",
+    "manufacturer", "model", "motherboard", "memory_total", "ram_modules", "gpu", "battery"
+])
+CpuInfoSnapshot = namedtuple("CpuInfoSnapshot", ["model", "physical_cores", "logical_cores", "max_freq", "current_freq", "arch"])
+# Datos rápidos del equipo para las pestañas de sistema y CPU (el resto llega del inventario)
+HostSnapshot = namedtuple("HostSnapshot", [
+    "timestamp", "boot_time", "memory_total", "battery", "physical_cores", "logical_cores", "max_freq", "current_freq"
+])
+CpuSnapshot = namedtuple("CpuSnapshot", ["timestamp", "usage", "per_core", "load_avg"])
+MemorySnapshot = namedtuple("MemorySnapshot", [
+    "timestamp", "total", "available", "used", "percent",
+    "swap_total", "swap_used", "swap_free", "swap_percent"
+])
+# state: "ok", "unresponsive" (la consulta no ha respondido a tiempo) o "error".
+# Sin respuesta se conservan los últimos valores conocidos (None si no los hay) y
+# age indica su antigüedad en segundos.
+DiskPartition = namedtuple("DiskPartition", ["device", "mountpoint", "fstype", "total", "used", "free", "percent", "state", "age"])
+DiskIo = namedtuple("DiskIo", ["read_count", "write_count", "read_bytes", "write_bytes"])
+DiskSnapshot = namedtuple("DiskSnapshot", ["timestamp", "partitions", "io"])
+NetworkInterface = namedtuple("NetworkInterface", [
+    "name", "ip", "mac", "bytes_sent", "bytes_recv", "packets_sent", "packets_recv"
+])
+NetworkSnapshot = namedtuple("NetworkSnapshot", ["timestamp", "interfaces"])
+ProcessSnapshot = namedtuple("ProcessSnapshot", ["timestamp", "rows"])
+# Fila de proceso: (pid, nombre, estado, cpu%, memoria%, usuario, pid del padre, memoria residente en bytes)
+# y columnas de detalle opcionales: bytes leídos/escritos por segundo, cambios de
+# contexto por segundo, hilos y descriptores abiertos (None si no se han leído)
+ProcessRow = namedtuple("ProcessRow", [
+    "pid", "name", "status", "cpu", "memory", "user", "ppid", "rss",
+    "read_rate", "write_rate", "ctx_switches", "threads", "fds"
+], defaults=(None,) * 5)
+# Métricas por las que se eligen los procesos que se resuelven en el modo top-N
+DETAIL_METRICS = ("cpu", "memory", "io")
+
+
+# Método para convertir una instantánea (y las que contenga) en tipos JSON
+def to_dict(value):
+    if hasattr(value, "_asdict"):
+        return {key: to_dict(item) for key, item in value._asdict().items()}
+    if isinstance(value, (list, tuple)):
+        return [to_dict(item) for item in value]
+    if isinstance(value, dict):
+        return {key: to_dict(item) for key, item in value.items()}
+    return value
+
+
+# Método para obtener el usuario de la sesión (os.getlogin falla sin terminal, p. ej. en cron)
+def get_login_user():
+    try:
+        return os.getlogin()
+    except OSError:
+        return getpass.getuser()
+
+
+# Método para obtener el fabricante del equipo
+def get_pc_manufacturer():
+    try:
+        if platform.system() == "Windows":
+            return platform.win32_edition()
+        return open("/sys/devices/virtual/dmi/id/sys_vendor").read().strip()
+    except: return "No se ha podido obtener la información del sistema"
+
+
+# Método para obtener el modelo de la PC
+def get_pc_model():
+    try:
+        if platform.system() == "Windows":
+            return platform.win32_ver()[1]
+        return open("/sys/devices/virtual/dmi/id/product_name").read().strip()
+    except: return "No se ha podido obtener el modelo"
+
+
+# Método para obtener información de la placa base
+def get_motherboard_info():
+    try:
+        if platform.system() == "Windows":
+            import wmi
+            c = wmi.WMI()
+            board = c.Win32_BaseBoard()[0]
+            return f"{board.Manufacturer} {board.Product}" # Fabricante y modelo
+        else:
+            vendor = open("/sys/devices/virtual/dmi/id/board_vendor").read().strip()
+            name = open("/sys/devices/virtual/dmi/id/board_name").read().strip()
+            return f"{vendor} {name}"
+    except Exception as e:
+        return "No disponible"
+
+
+# Método para obtener información de los módulos de RAM
+def get_ram_type():
+    try:
+        if platform.system() == "Windows":
+            import wmi
+            c = wmi.WMI()
+            rams = c.Win32_PhysicalMemory() # Lista de módulos de RAM
+            return "\n".join([f"Módulo {i+1}: {ram.Capacity} bytes {ram.Speed}MHz"
+                            for i, ram in enumerate(rams)]) # Mostrar capacidad y velocidad de los módulos encontrados
+        else:
+            import subprocess
+            result = subprocess.run(["dmidecode", "--type", "memory"],
+                                capture_output=True, text=True)
+            # Sin permisos de administrador dmidecode termina con error y sin salida
+            return result.stdout if result.returncode == 0 else "No disponible"
+    except:
+        return "No disponible"
+
+
+# Método para obtener información de la GPU
+def get_gpu_info():
+    try:
+        if platform.system() == "Windows":
+            import wmi
+            c = wmi.WMI()
+            gpu_info = []
+            for gpu in c.Win32_VideoController():
+                gpu_info.append(gpu.Name.strip())
+            return ", ".join(gpu_info)
+        else:
+            import subprocess
+            result = subprocess.run(["lspci", "-nn"], capture_output=True, text=True)
+            gpus = [line.split(': ')[-1] for line in result.stdout.split('\n') if 'VGA' in line]
+            return ", ".join(gpus)
+    except:
+        return "No disponible"
+
+
+# Método para obtener el estado de la batería
+def get_battery_status():
+    try:
+        battery = psutil.sensors_battery()
+        return f"{battery.percent}% ({'Cargando' if battery.power_plugged else 'Batería'})"
+    except: return "No hay una batería conectada!!"
+
+
+# Método para recoger la información del sistema operativo y del hardware
+def collect_system():
+    manufacturer = get_pc_manufacturer()
+    return SystemSnapshot(
+        platform.system(),
+        platform.version(),
+        manufacturer,
+        f"{platform.machine()} ({platform.architecture()[0]})",
+        socket.gethostname(),
+        get_login_user(),
+        psutil.boot_time(),
+        manufacturer,
+        get_pc_model(),
+        get_motherboard_info(),
+        psutil.virtual_memory().total,
+        get_ram_type(),
+        get_gpu_info(),
+        get_battery_status()
+    )
+
+
+# Método para recoger la información estática del procesador
+def collect_cpu_info():
+    import cpuinfo  # Importación diferida: es lenta y sólo hace falta aquí
+    info = cpuinfo.get_cpu_info()
+    freq = psutil.cpu_freq()
+    return CpuInfoSnapshot(
+        info.get('brand_raw'),
+        psutil.cpu_count(logical=False),
+        psutil.cpu_count(logical=True),
+        freq.max if freq else None,
+        freq.current if freq else None,
+        info.get('arch')
+    )
+
+
+# Método para recoger los datos rápidos del equipo: arranque, memoria total, batería y frecuencia
+def collect_host():
+    freq = psutil.cpu_freq()
+    return HostSnapshot(
+        time.time(),
+        psutil.boot_time(),
+        psutil.virtual_memory().total,
+        get_battery_status(),
+        psutil.cpu_count(logical=False),
+        psutil.cpu_count(logical=True),
+        freq.max if freq else None,
+        freq.current if freq else None
+    )
+
+
+# Método para tomar una muestra del uso de CPU
+def sample_cpu():
+    # interval=None no bloquea: mide desde la llamada anterior
+    usage = psutil.cpu_percent(interval=None)
+    per_core = tuple(psutil.cpu_percent(interval=None, percpu=True))
+    if hasattr(psutil, "getloadavg"):
+        load_avg = tuple(psutil.getloadavg())
+    else:
+        load_avg = None
+    return CpuSnapshot(time.time(), usage, per_core, load_avg)
+
+
+# Método para recoger el estado de la memoria y de la swap
+def collect_memory():
+    mem = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    return MemorySnapshot(
+        time.time(), mem.total, mem.available, mem.used, mem.percent,
+        swap.total, swap.used, swap.free, swap.percent
+    )
+
+
+# Consulta del uso de las particiones sin bloquear.
+# Cada punto de montaje se consulta en su propio hilo (daemon, para que un
+# montaje colgado no impida cerrar el programa) y se espera como mucho
+# "timeout" segundos. Los resultados se guardan durante "ttl" segundos. Un
+# montaje que no responde (NFS/CIFS caído) queda marcado y no se vuelve a
+# consultar mientras su hilo anterior siga bloqueado, así que nunca hay más de
+# un hilo colgado por montaje.
+class DiskUsageProber:
+    def __init__(self, timeout=2.0, ttl=30.0):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache = {}       # punto de montaje -> (instante, uso de psutil o excepción)
+        self.inflight = {}    # punto de montaje -> instante en que empezó la consulta
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+
+    def _probe(self, mountpoint):
+        try:
+            result = psutil.disk_usage(mountpoint)
+        except Exception as e:
+            result = e
+        with self._lock:
+            self.cache[mountpoint] = (time.monotonic(), result)
+            del self.inflight[mountpoint]
+            self._done.notify_all()
+
+    # Método para obtener el uso de varios puntos de montaje: punto -> (estado, uso, antigüedad)
+    def usage(self, mountpoints):
+        now = time.monotonic()
+        with self._lock:
+            for mountpoint in mountpoints:
+                cached = self.cache.get(mountpoint)
+                fresh = cached is not None and now - cached[0] < self.ttl
+                if not fresh and mountpoint not in self.inflight:
+                    self.inflight[mountpoint] = now
+                    threading.Thread(target=self._probe, args=(mountpoint,), name="disk-usage", daemon=True).start()
+            # Esperar a las consultas en marcha, cada una como mucho hasta su plazo
+            # (las que ya lo habían superado en llamadas anteriores no se esperan)
+            while True:
+                now = time.monotonic()
+                deadlines = [self.inflight[mountpoint] + self.timeout for mountpoint in mountpoints
+                             if mountpoint in self.inflight and self.inflight[mountpoint] + self.timeout > now]
+                if not deadlines:
+                    break
+                self._done.wait(max(deadlines) - now)
+            now = time.monotonic()
+            results = {}
+            for mountpoint in mountpoints:
+                cached = self.cache.get(mountpoint)
+                usage = cached[1] if cached else None
+                age = now - cached[0] if cached else None
+                if mountpoint in self.inflight and now - self.inflight[mountpoint] >= self.timeout:
+                    state = "unresponsive"
+                elif isinstance(usage, Exception):
+                    state = "error"
+                elif usage is None:
+                    state = "unresponsive"
+                else:
+                    state = "ok"
+                results[mountpoint] = (state, None if isinstance(usage, Exception) else usage, age)
+            return results
+
+
+_disk_usage_prober = DiskUsageProber()
+
+
+# Método para recoger el uso de las particiones y la actividad de disco
+def collect_disks(prober=None):
+    prober = prober or _disk_usage_prober
+    mounted = [part for part in psutil.disk_partitions() if part.fstype]
+    usage = prober.usage([part.mountpoint for part in mounted])
+    partitions = []
+    for part in mounted:
+        state, result, age = usage[part.mountpoint]
+        if result is None:
+            partitions.append(DiskPartition(part.device, part.mountpoint, part.fstype,
+                                            None, None, None, None, state, age))
+        else:
+            partitions.append(DiskPartition(
+                part.device, part.mountpoint, part.fstype,
+                result.total, result.used, result.free, result.percent, state, age
+            ))
+    io = psutil.disk_io_counters()
+    if io is not None:
+        io = DiskIo(io.read_count, io.write_count, io.read_bytes, io.write_bytes)
+    return DiskSnapshot(time.time(), tuple(partitions), io)
+
+
+# Método para recoger las direcciones y contadores de cada interfaz de red
+def collect_network():
+    stats = psutil.net_io_counters(pernic=True)
+    interfaces = []
+    for intf, addrs in psutil.net_if_addrs().items():
+        # Obtener dirección MAC según el sistema operativo
+        if platform.system() == "Windows":
+            mac = next((addr.address for addr in addrs if addr.family == psutil.AF_LINK), "N/A")
+        else:
+            mac = next((addr.address for addr in addrs if addr.family == socket.AF_PACKET), "N/A")
+        ip = next((addr.address for addr in addrs if addr.family == socket.AF_INET), "N/A")
+        io = stats.get(intf)
+        interfaces.append(NetworkInterface(
+            intf, ip, mac,
+            io.bytes_sent if io else 0,
+            io.bytes_recv if io else 0,
+            io.packets_sent if io else 0,
+            io.packets_recv if io else 0
+        ))
+    return NetworkSnapshot(time.time(), tuple(interfaces))
+
+
+# Columnas de detalle de los procesos (E/S, cambios de contexto, hilos y
+# descriptores). Las tasas se calculan con la diferencia de los contadores
+# acumulados entre muestras. En el modo top-N sólo se leen los detalles de los
+# N procesos con más valor de la métrica elegida (selección parcial con heapq);
+# ordenar por E/S necesita el contador de E/S de todos los procesos, pero el
+# resto de detalles sigue leyéndose sólo para los elegidos.
+class ProcessDetails:
+    def __init__(self):
+        self.enabled = False
+        self.top_n = None         # None: todos los procesos
+        self.metric = "cpu"
+        self.io_counters = {}     # (pid, inicio) -> (instante, (leídos, escritos))
+        self.ctx_counters = {}    # (pid, inicio) -> (instante, (cambios de contexto,))
+
+    # Método para activar o desactivar las columnas de detalle
+    def configure(self, enabled, top_n=None, metric="cpu"):
+        if metric not in DETAIL_METRICS:
+            raise ValueError(f"Métrica desconocida: {metric}")
+        self.top_n = top_n
+        self.metric = metric
+        self.enabled = enabled
+        if not enabled:
+            self.io_counters = {}
+            self.ctx_counters = {}
+
+    # Método para elegir los procesos cuyos detalles se leen
+    def select(self, rows, io_rates=None):
+        if self.top_n is None or self.top_n >= len(rows):
+            return rows
+        if self.metric == "io":
+            key = lambda row: sum(io_rates.get(row.pid) or (0.0,))
+        elif self.metric == "memory":
+            key = lambda row: row.rss
+        else:
+            key = lambda row: row.cpu
+        return heapq.nlargest(self.top_n, rows, key=key)
+
+    # Método para calcular las tasas por segundo de unos contadores acumulados
+    def _rates(self, counters, key, now, values):
+        if values is None:
+            return None
+        previous = counters.get(key)
+        counters[key] = (now, values)
+        if previous is None or now <= previous[0]:
+            return None
+        elapsed = now - previous[0]
+        return tuple(max(0.0, (value - old) / elapsed) for value, old in zip(values, previous[1]))
+
+    # Método para añadir los detalles a las filas de una muestra.
+    # keys: pid -> identidad del proceso; read_io(pid) -> (leídos, escritos) o None;
+    # read_extra(pid) -> (cambios de contexto, hilos, descriptores) o None;
+    # map_pids(función, pids) permite al recolector repartir las lecturas entre hilos
+    def apply(self, rows, keys, read_io, read_extra, map_pids=None):
+        if not self.enabled or not rows:
+            return rows
+        if map_pids is None:
+            map_pids = lambda func, pids: [func(pid) for pid in pids]
+        now = time.monotonic()
+        io_rates = {}
+        if self.metric == "io":
+            pids = [row.pid for row in rows]
+            for pid, values in zip(pids, map_pids(read_io, pids)):
+                io_rates[pid] = self._rates(self.io_counters, keys[pid], now, values)
+            selected = [row.pid for row in self.select(rows, io_rates)]
+        else:
+            selected = [row.pid for row in self.select(rows)]
+            for pid, values in zip(selected, map_pids(read_io, selected)):
+                io_rates[pid] = self._rates(self.io_counters, keys[pid], now, values)
+        extra = dict(zip(selected, map_pids(read_extra, selected)))
+
+        result = []
+        for row in rows:
+            rates = io_rates.get(row.pid)
+            details = extra.get(row.pid)
+            if rates is None and details is None:
+                result.append(row)
+                continue
+            ctx, threads, fds = details or (None, None, None)
+            ctx_rate = self._rates(self.ctx_counters, keys[row.pid], now, (ctx,) if ctx is not None else None)
+            result.append(row._replace(
+                read_rate=rates[0] if rates else None,
+                write_rate=rates[1] if rates else None,
+                ctx_switches=ctx_rate[0] if ctx_rate else None,
+                threads=threads,
+                fds=fds
+            ))
+
+        # Olvidar los contadores de procesos que han terminado o cuyo PID se ha reutilizado
+        for counters in (self.io_counters, self.ctx_counters):
+            for key in [key for key in counters if keys.get(key[0]) != key]:
+                del counters[key]
+        return result
+
+
+# Método para llamar a una consulta de psutil devolviendo None si no está permitida
+def _try_read(func):
+    try:
+        return func()
+    except (psutil.AccessDenied, psutil.ZombieProcess, NotImplementedError):
+        return None
+
+
+# Proceso guardado en la caché junto a los datos que no cambian durante su vida
+class CachedProcess:
+    __slots__ = ("proc", "key", "start", "name", "user")
+
+    def __init__(self, proc, key, start, name, user):
+        self.proc = proc
+        self.key = key            # (pid, create_time): identidad del proceso
+        self.start = start        # inicio en ticks de /proc/[pid]/stat (None fuera de Linux)
+        self.name = name
+        self.user = user
+
+
+# Método para obtener los campos de /proc/[pid]/stat que psutil ya ha leído dentro
+# de oneshot() (el fichero se lee una sola vez para estado y tiempos). De ahí salen
+# el inicio en ticks (create_time() no sirve: psutil lo guarda la primera vez) y el
+# padre (ppid() comprueba la reutilización del PID creando otro Process en cada
+# llamada). None si psutil no lo permite en esta plataforma
+def _stat_fields(proc):
+    parse = getattr(getattr(proc, "_proc", None), "_parse_stat_file", None)
+    if parse is None:
+        return None
+    return parse()
+
+
+# Caché persistente de objetos psutil.Process entre muestras.
+# Cada proceso conserva su referencia de tiempos de CPU, así que
+# cpu_percent(interval=None) devuelve el uso real desde la muestra anterior
+# sin necesidad de esperas. Los procesos que terminan se eliminan y la
+# reutilización de un PID se detecta por su identidad (pid, create_time).
+class ProcessCache:
+    def __init__(self):
+        self.entries = {}
+        self.total_memory = psutil.virtual_memory().total
+        self.details = ProcessDetails()
+
+    # Método para añadir un proceso nuevo a la caché y devolver su primera fila
+    def _add(self, pid, now):
+        proc = psutil.Process(pid)
+        with proc.oneshot():
+            create_time = proc.create_time()
+            name = proc.name()
+            try:
+                user = proc.username()
+            except (psutil.AccessDenied, KeyError):
+                user = None
+            times = proc.cpu_times()
+            # Primera llamada: fija la referencia para la siguiente muestra
+            proc.cpu_percent(interval=None)
+            status = proc.status()
+            ppid = proc.ppid()
+            rss = proc.memory_info().rss
+            stat = _stat_fields(proc)
+            start = stat["create_time"] if stat is not None else None
+        cpu_total = times.user + times.system
+        self.entries[pid] = CachedProcess(proc, (pid, create_time), start, name, user)
+        # Sin muestra previa se usa la media desde el arranque del proceso
+        age = now - create_time
+        cpu = round(cpu_total / age * 100, 1) if age > 0 else 0.0
+        return ProcessRow(pid, name, status, cpu, rss / self.total_memory * 100, user, ppid, rss)
+
+    # Método para leer un proceso ya conocido (None si el PID es de otro proceso)
+    def _read(self, entry):
+        proc = entry.proc
+        with proc.oneshot():
+            # Si el inicio no coincide con el guardado el PID se ha reutilizado y el
+            # nombre, el usuario y la referencia de cpu_percent son de otro proceso
+            stat = _stat_fields(proc) if entry.start is not None else None
+            if stat is not None:
+                if stat["create_time"] != entry.start:
+                    return None
+                ppid = int(stat["ppid"])
+            elif not proc.is_running():
+                # Sin el inicio en bruto: is_running() compara create_time con otro Process
+                return None
+            else:
+                ppid = proc.ppid()
+            # memory_percent() volvería a leer la memoria: se calcula con la RSS
+            rss = proc.memory_info().rss
+            return ProcessRow(
+                proc.pid,
+                entry.name,
+                proc.status(),
+                proc.cpu_percent(interval=None),
+                rss / self.total_memory * 100,
+                entry.user,
+                ppid,
+                rss
+            )
+
+    # Método para leer los bytes leídos y escritos de un proceso
+    def _read_io(self, pid):
+        proc = self.entries[pid].proc
+        try:
+            counters = proc.io_counters()
+        except (psutil.Error, AttributeError):
+            # Sin permiso, proceso terminado o sistema sin contadores de E/S (macOS)
+            return None
+        return counters.read_bytes, counters.write_bytes
+
+    # Método para leer cambios de contexto, hilos y descriptores de un proceso
+    def _read_extra(self, pid):
+        proc = self.entries[pid].proc
+        count_fds = proc.num_fds if hasattr(proc, "num_fds") else proc.num_handles
+        try:
+            with proc.oneshot():
+                ctx = _try_read(proc.num_ctx_switches)
+                return (sum(ctx) if ctx else None, _try_read(proc.num_threads), _try_read(count_fds))
+        except psutil.NoSuchProcess:
+            return None
+
+    # Método para tomar una muestra de la lista de procesos
+    def sample(self):
+        pids = psutil.pids()
+        alive = set(pids)
+        # Eliminar los procesos que han terminado
+        for pid in [pid for pid in self.entries if pid not in alive]:
+            del self.entries[pid]
+
+        now = time.time()
+        rows = []
+        for pid in pids:
+            try:
+                entry = self.entries.get(pid)
+                row = self._read(entry) if entry is not None else None
+                if row is None:
+                    # Proceso nuevo o PID reutilizado por otro proceso
+                    row = self._add(pid, now)
+                rows.append(row)
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                self.entries.pop(pid, None)
+            except psutil.AccessDenied:
+                continue
+        if self.details.enabled:
+            keys = {pid: entry.key for pid, entry in self.entries.items()}
+            rows = self.details.apply(rows, keys, self._read_io, self._read_extra)
+        return ProcessSnapshot(now, tuple(rows))
@@ -0,0 +1,249 @@
+# Conexiones de red (TCP y UDP) por proceso y por estado.
+# En Linux se leen en bloque /proc/net/tcp, tcp6, udp y udp6 y el dueño de cada
+# socket se busca por su inodo en un índice descriptor -> inodo que se
+# mantiene entre muestras: de cada proceso sólo se resuelven (readlink) los
+# descriptores nuevos, y cada RESCAN_EVERY muestras se revisan todos los de
+# una fracción de los procesos para detectar descriptores reutilizados. Fuera
+# de Linux se usa psutil.net_connections().
+#
+# La muestra devuelve los recuentos por estado y por proceso y las filas en
+# bruto; las direcciones sólo se descodifican para la página que se muestra
+# (page()), así que refrescar cada pocos segundos es barato aunque haya cientos
+# de miles de conexiones. Este módulo no depende de la interfaz gráfica.
+import os
+import socket
+import sys
+import time
+from collections import namedtuple
+
+import psutil
+
+PROC_ROOT = "/proc"
+# Ficheros de /proc/net y protocolo de cada uno
+PROC_NET_FILES = (("tcp", "net/tcp"), ("tcp6", "net/tcp6"), ("udp", "net/udp"), ("udp6", "net/udp6"))
+# Estados de TCP en /proc/net (include/net/tcp_states.h), con los nombres de psutil
+TCP_STATES = {
+    b"01": "ESTABLISHED", b"02": "SYN_SENT", b"03": "SYN_RECV", b"04": "FIN_WAIT1", b"05": "FIN_WAIT2",
+    b"06": "TIME_WAIT", b"07": "CLOSE", b"08": "CLOSE_WAIT", b"09": "LAST_ACK", b"0A": "LISTEN",
+    b"0B": "CLOSING", b"0C": "SYN_RECV"
+}
+# UDP no tiene estados: sólo se distingue si el socket está conectado
+UDP_STATES = {b"01": "ESTABLISHED"}
+# Cada cuántas muestras se revisan todos los descriptores de un proceso
+RESCAN_EVERY = 10
+# Filtro de page() para no filtrar por proceso
+ANY_PID = -1
+
+# Fila descodificada del listado; pid y name son None si no se conoce el dueño
+# (sockets de otros usuarios sin permisos, o en TIME_WAIT, que ya no tienen proceso)
+ConnectionRow = namedtuple("ConnectionRow", ["proto", "local", "remote", "state", "pid", "name"])
+# Conexiones de un proceso: total y recuento por estado ((estado, n), de más a menos)
+ProcessConnections = namedtuple("ProcessConnections", ["pid", "name", "total", "states"])
+# Muestra de las conexiones. rows son las filas en bruto (proto, estado, pid, local, remota)
+# que page() descodifica; names es la tabla pid -> nombre de los dueños
+ConnectionsSnapshot = namedtuple("ConnectionsSnapshot", [
+    "timestamp", "total", "states", "processes", "unowned", "rows", "names"
+])
+
+
+# Método para comprobar si se puede usar /proc/net
+def available(root=PROC_ROOT):
+    return sys.platform.startswith("linux") and os.path.exists(os.path.join(root, "net", "tcp"))
+
+
+# Método para descodificar una dirección de /proc/net ("0100007F:0050") como texto
+def decode_address(value):
+    if isinstance(value, str):
+        return value
+    host, _, port = value.partition(b":")
+    raw = bytes.fromhex(host.decode())
+    port = int(port, 16)
+    # Las direcciones están en palabras de 32 bits en el orden del procesador
+    raw = b"".join(raw[i:i + 4][::-1] for i in range(0, len(raw), 4)) if sys.byteorder == "little" else raw
+    if not port and not raw.strip(b"\0"):
+        return "*"
+    if len(raw) == 4:
+        return f"{socket.inet_ntop(socket.AF_INET, raw)}:{port}"
+    return f"[{socket.inet_ntop(socket.AF_INET6, raw)}]:{port}"
+
+
+# Método para contar las conexiones por estado y por proceso
+def summarize(rows, names):
+    states = {}
+    processes = {}
+    unowned = 0
+    for proto, state, pid, local, remote in rows:
+        states[state] = states.get(state, 0) + 1
+        if pid is None:
+            unowned += 1
+            continue
+        counts = processes.get(pid)
+        if counts is None:
+            counts = processes[pid] = {}
+        counts[state] = counts.get(state, 0) + 1
+    by_process = [
+        ProcessConnections(pid, names.get(pid, "?"), sum(counts.values()),
+                           tuple(sorted(counts.items(), key=lambda item: item[1], reverse=True)))
+        for pid, counts in processes.items()
+    ]
+    by_process.sort(key=lambda process: process.total, reverse=True)
+    return ConnectionsSnapshot(
+        time.time(), len(rows), tuple(sorted(states.items(), key=lambda item: item[1], reverse=True)),
+        tuple(by_process), unowned, tuple(rows), {pid: names.get(pid, "?") for pid in processes}
+    )
+
+
+# Método para obtener una página del listado: (filas que cumplen el filtro, filas de la página)
+def page(snapshot, offset=0, limit=100, pid=ANY_PID, state=None):
+    rows = snapshot.rows
+    if pid != ANY_PID or state is not None:
+        rows = [row for row in rows if (pid == ANY_PID or row[2] == pid) and (state is None or row[1] == state)]
+    names = snapshot.names
+    return len(rows), [
+        ConnectionRow(proto, decode_address(local), decode_address(remote), row_state, row_pid, names.get(row_pid))
+        for proto, row_state, row_pid, local, remote in rows[offset:offset + limit]
+    ]
+
+
+# Proceso del índice de sockets: nombre y descriptor -> inodo (None si no es un socket)
+class IndexedProcess:
+    __slots__ = ("key", "name", "fds")
+
+    def __init__(self, key, name):
+        self.key = key        # (pid, inicio en ticks): identidad del proceso, como en procfs
+        self.name = name
+        self.fds = {}
+
+
+# Índice inodo de socket -> PID mantenido entre muestras
+class SocketIndex:
+    def __init__(self, root=PROC_ROOT, rescan_every=RESCAN_EVERY):
+        self.root = root
+        self.rescan_every = rescan_every
+        self.processes = {}
+        self.owners = {}
+        self.generation = 0
+        self.unreadable = 0      # procesos cuyos descriptores no se pueden leer (otros usuarios)
+        self.resolved = 0        # readlink de la última actualización
+
+    # Método para leer el nombre y el instante de inicio (ticks) de /proc/[pid]/stat
+    def _identity(self, pid):
+        with open(os.path.join(self.root, str(pid), "stat"), "rb") as stat_file:
+            data = stat_file.read()
+        # El nombre va entre paréntesis y puede contener espacios o paréntesis
+        close = data.rindex(b")")
+        return data[data.index(b"(") + 1:close].decode("utf-8", "replace"), int(data[close + 2:].split()[19])
+
+    def update(self):
+        self.generation += 1
+        root = self.root
+        processes = {}
+        unreadable = resolved = 0
+        for name in os.listdir(root):
+            if not name.isdigit():
+                continue
+            pid = int(name)
+            try:
+                process_name, start = self._identity(pid)
+            except (OSError, ValueError, IndexError):
+                # El proceso ha terminado
+                continue
+            fd_dir = os.path.join(root, name, "fd")
+            try:
+                fd_names = os.listdir(fd_dir)
+            except OSError:
+                # Sin permisos o el proceso ha terminado
+                unreadable += 1
+                continue
+            entry = self.processes.get(pid)
+            if entry is None or entry.key != (pid, start):
+                # Proceso nuevo o PID reutilizado: los descriptores conocidos eran de otro proceso
+                entry = IndexedProcess((pid, start), process_name)
+            # Revisión completa repartida: cada proceso una vez cada rescan_every muestras
+            known = entry.fds if (pid + self.generation) % self.rescan_every else {}
+            fds = {}
+            for fd in fd_names:
+                if fd in known:
+                    fds[fd] = known[fd]
+                    continue
+                try:
+                    target = os.readlink(os.path.join(fd_dir, fd))
+                except OSError:
+                    continue
+                resolved += 1
+                fds[fd] = int(target[8:-1]) if target.startswith("socket:[") else None
+            entry.fds = fds
+            processes[pid] = entry
+        # Los procesos que han terminado desaparecen al sustituir la tabla
+        self.processes = processes
+        self.owners = {inode: pid for pid, entry in processes.items() for inode in entry.fds.values() if inode}
+        self.unreadable = unreadable
+        self.resolved = resolved
+
+
+# Conexiones desde /proc/net con el índice de sockets
+class ProcNetConnections:
+    def __init__(self, root=PROC_ROOT):
+        self.root = root
+        self.index = SocketIndex(root)
+
+    def sample(self):
+        self.index.update()
+        owners = self.index.owners
+        rows = []
+        for proto, path in PROC_NET_FILES:
+            try:
+                with open(os.path.join(self.root, path), "rb") as net_file:
+                    data = net_file.read()
+            except OSError:
+                continue
+            states = UDP_STATES if proto.startswith("udp") else TCP_STATES
+            default = "NONE" if proto.startswith("udp") else "CLOSE"
+            for line in data.split(b"\n")[1:]:
+                # sl local remota estado colas temporizador reintentos uid timeout inodo ...
+                fields = line.split(None, 10)
+                if len(fields) < 10:
+                    continue
+                rows.append((proto, states.get(fields[3], default), owners.get(int(fields[9])), fields[1], fields[2]))
+        names = {pid: entry.name for pid, entry in self.index.processes.items()}
+        return summarize(rows, names)
+
+
+# Conexiones a través de psutil (fuera de Linux)
+class PsutilConnections:
+    def __init__(self):
+        self.names = {}
+
+    def sample(self):
+        try:
+            connections = psutil.net_connections(kind="inet")
+        except (psutil.AccessDenied, OSError):
+            connections = []
+        rows = []
+        names = {}
+        for conn in connections:
+            proto = "tcp" if conn.type == socket.SOCK_STREAM else "udp"
+            if conn.family == socket.AF_INET6:
+                proto += "6"
+            local = f"{conn.laddr.ip}:{conn.laddr.port}" if conn.laddr else "*"
+            remote = f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else "*"
+            pid = conn.pid
+            if pid is not None and pid not in names:
+                name = self.names.get(pid)
+                if name is None:
+                    try:
+                        name = psutil.Process(pid).name()
+                    except (psutil.NoSuchProcess, psutil.AccessDenied):
+                        name = "?"
+                names[pid] = name
+            rows.append((proto, conn.status, pid, local, remote))
+        # Sólo se conservan los nombres de los procesos que siguen teniendo conexiones
+        self.names = names
+        return summarize(rows, names)
+
+
+# Método para crear el lector de conexiones adecuado al sistema
+def create_connections():
+    if available():
+        return ProcNetConnections()
+    return PsutilConnections()
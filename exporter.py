@@ -0,0 +1,207 @@
+# Exportador de métricas en formato OpenMetrics (compatible con Prometheus).
+# Un servidor HTTP de la biblioteca estándar responde en /metrics con las
+# últimas instantáneas publicadas por el muestreo. Las peticiones nunca
+# llaman a psutil: el texto se genera una vez por cada instantánea nueva y se
+# reutiliza en todas las peticiones hasta la siguiente. Este módulo no
+# depende de la interfaz gráfica.
+#
+# Prueba local:
+#   curl http://127.0.0.1:9877/metrics
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9877
+# Procesos con más CPU que se exportan con etiquetas (limita la cardinalidad)
+DEFAULT_TOP_PROCESSES = 20
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+TEXT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# Método para escapar el valor de una etiqueta
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+# Método para separar "host:puerto" (o sólo "puerto")
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return host or DEFAULT_HOST, int(port)
+
+
+# Constructor del texto de una exposición: agrupa las muestras por métrica
+class MetricsText:
+    def __init__(self):
+        self.lines = []
+
+    # Método para añadir una familia de métricas: muestras = [(etiquetas, valor)]
+    # Los contadores llevan el sufijo "_total" en cada muestra
+    def family(self, name, kind, help_text, samples):
+        if not samples:
+            return
+        self.lines.append(f"# TYPE {name} {kind}")
+        self.lines.append(f"# HELP {name} {help_text}")
+        sample_name = name + "_total" if kind == "counter" else name
+        for labels, value in samples:
+            if labels:
+                label_text = ",".join(f'{key}="{escape_label(val)}"' for key, val in labels.items())
+                self.lines.append(f"{sample_name}{{{label_text}}} {value!r}")
+            else:
+                self.lines.append(f"{sample_name} {value!r}")
+
+    def render(self):
+        return "\n".join(self.lines + ["# EOF", ""]).encode("utf-8")
+
+
+# Método para generar la exposición a partir de las instantáneas por trabajo
+def render_metrics(snapshots, top_processes=DEFAULT_TOP_PROCESSES):
+    text = MetricsText()
+    text.family("ats_last_sample_timestamp_seconds", "gauge", "Instante de la última muestra de cada trabajo.",
+                [({"job": name}, float(snapshot.timestamp)) for name, snapshot in sorted(snapshots.items())])
+
+    cpu = snapshots.get("cpu")
+    if cpu:
+        text.family("ats_cpu_usage_percent", "gauge", "Uso total de CPU.", [({}, float(cpu.usage))])
+        text.family("ats_cpu_core_usage_percent", "gauge", "Uso de CPU por núcleo lógico.",
+                    [({"core": core}, float(usage)) for core, usage in enumerate(cpu.per_core)])
+        if cpu.load_avg:
+            text.family("ats_load_average", "gauge", "Carga media del sistema.",
+                        [({"period": period}, float(load)) for period, load in zip(("1m", "5m", "15m"), cpu.load_avg)])
+
+    memory = snapshots.get("memory")
+    if memory:
+        text.family("ats_memory_bytes", "gauge", "Memoria RAM.",
+                    [({"state": "total"}, float(memory.total)), ({"state": "available"}, float(memory.available)),
+                     ({"state": "used"}, float(memory.used))])
+        text.family("ats_memory_usage_percent", "gauge", "Uso de memoria RAM.", [({}, float(memory.percent))])
+        text.family("ats_swap_bytes", "gauge", "Memoria de intercambio.",
+                    [({"state": "total"}, float(memory.swap_total)), ({"state": "used"}, float(memory.swap_used)),
+                     ({"state": "free"}, float(memory.swap_free))])
+        text.family("ats_swap_usage_percent", "gauge", "Uso de la memoria de intercambio.", [({}, float(memory.swap_percent))])
+
+    io = snapshots.get("io")
+    if io:
+        text.family("ats_disk_read_bytes_per_second", "gauge", "Lectura de disco por dispositivo.",
+                    [({"device": disk.name}, float(disk.read_bytes)) for disk in io.disks])
+        text.family("ats_disk_write_bytes_per_second", "gauge", "Escritura de disco por dispositivo.",
+                    [({"device": disk.name}, float(disk.write_bytes)) for disk in io.disks])
+        text.family("ats_disk_read_iops", "gauge", "Operaciones de lectura por segundo por dispositivo.",
+                    [({"device": disk.name}, float(disk.read_iops)) for disk in io.disks])
+        text.family("ats_disk_write_iops", "gauge", "Operaciones de escritura por segundo por dispositivo.",
+                    [({"device": disk.name}, float(disk.write_iops)) for disk in io.disks])
+        text.family("ats_network_receive_bytes_per_second", "gauge", "Bytes recibidos por segundo por interfaz.",
+                    [({"interface": nic.name}, float(nic.bytes_recv)) for nic in io.nics])
+        text.family("ats_network_transmit_bytes_per_second", "gauge", "Bytes enviados por segundo por interfaz.",
+                    [({"interface": nic.name}, float(nic.bytes_sent)) for nic in io.nics])
+        text.family("ats_network_receive_packets_per_second", "gauge", "Paquetes recibidos por segundo por interfaz.",
+                    [({"interface": nic.name}, float(nic.packets_recv)) for nic in io.nics])
+        text.family("ats_network_transmit_packets_per_second", "gauge", "Paquetes enviados por segundo por interfaz.",
+                    [({"interface": nic.name}, float(nic.packets_sent)) for nic in io.nics])
+
+    network = snapshots.get("network")
+    if network:
+        text.family("ats_network_receive_bytes", "counter", "Bytes recibidos por interfaz desde el arranque.",
+                    [({"interface": nic.name}, float(nic.bytes_recv)) for nic in network.interfaces])
+        text.family("ats_network_transmit_bytes", "counter", "Bytes enviados por interfaz desde el arranque.",
+                    [({"interface": nic.name}, float(nic.bytes_sent)) for nic in network.interfaces])
+
+    disks = snapshots.get("disks")
+    if disks:
+        # Los montajes que no responden y sin datos previos no tienen valores
+        partitions = [part for part in disks.partitions if part.total is not None]
+        labels = [{"device": part.device, "mountpoint": part.mountpoint, "fstype": part.fstype} for part in partitions]
+        text.family("ats_filesystem_size_bytes", "gauge", "Tamaño de la partición.",
+                    [(label, float(part.total)) for label, part in zip(labels, partitions)])
+        text.family("ats_filesystem_used_bytes", "gauge", "Espacio usado de la partición.",
+                    [(label, float(part.used)) for label, part in zip(labels, partitions)])
+        text.family("ats_filesystem_free_bytes", "gauge", "Espacio libre de la partición.",
+                    [(label, float(part.free)) for label, part in zip(labels, partitions)])
+        text.family("ats_filesystem_responsive", "gauge", "1 si la consulta del montaje ha respondido a tiempo.",
+                    [({"device": part.device, "mountpoint": part.mountpoint, "fstype": part.fstype},
+                      0.0 if part.state == "unresponsive" else 1.0) for part in disks.partitions])
+        if disks.io:
+            text.family("ats_disk_read_bytes", "counter", "Bytes leídos de disco desde el arranque.", [({}, float(disks.io.read_bytes))])
+            text.family("ats_disk_written_bytes", "counter", "Bytes escritos en disco desde el arranque.", [({}, float(disks.io.write_bytes))])
+
+    profile = snapshots.get("profile")
+    if profile:
+        text.family("ats_self_cpu_percent", "gauge", "Uso de CPU del propio monitor.", [({}, float(profile.cpu))])
+        text.family("ats_self_resident_bytes", "gauge", "Memoria residente del propio monitor.", [({}, float(profile.rss))])
+        text.family("ats_self_threads", "gauge", "Hilos del propio monitor.", [({}, float(profile.threads))])
+
+    processes = snapshots.get("processes")
+    if processes:
+        text.family("ats_processes", "gauge", "Número de procesos.", [({}, float(len(processes.rows)))])
+        top = sorted(processes.rows, key=lambda row: row.cpu, reverse=True)[:top_processes]
+        text.family("ats_process_cpu_percent", "gauge", "Uso de CPU de los procesos con más CPU.",
+                    [({"pid": row.pid, "name": row.name, "user": row.user}, float(row.cpu)) for row in top])
+        text.family("ats_process_memory_percent", "gauge", "Uso de memoria de los procesos con más CPU.",
+                    [({"pid": row.pid, "name": row.name, "user": row.user}, float(row.memory)) for row in top])
+    return text.render()
+
+
+# Servidor de métricas que responde desde las últimas instantáneas publicadas
+class MetricsExporter:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, top_processes=DEFAULT_TOP_PROCESSES):
+        self.host = host
+        self.port = port
+        self.top_processes = top_processes
+        self.snapshots = {}
+        self.scrapes = 0
+        self._body = None
+        self._lock = threading.Lock()
+        self._server = None
+
+    # Método para publicar instantáneas nuevas (trabajo -> instantánea)
+    def update(self, snapshots):
+        with self._lock:
+            self.snapshots = dict(self.snapshots, **snapshots)
+            self._body = None
+
+    # Método para obtener la exposición, generándola sólo si hay instantáneas nuevas
+    def body(self):
+        with self._lock:
+            self.scrapes += 1
+            if self._body is None:
+                self._body = render_metrics(self.snapshots, self.top_processes)
+            return self._body
+
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] == "/metrics":
+                    body = exporter.body()
+                    accept = self.headers.get("Accept", "")
+                    content_type = OPENMETRICS_TYPE if "application/openmetrics-text" in accept else TEXT_TYPE
+                    status = 200
+                elif self.path == "/":
+                    body = b"Analiza Tu Sistema: metricas en /metrics\n"
+                    content_type = "text/plain; charset=utf-8"
+                    status = 200
+                else:
+                    body = b"No encontrado\n"
+                    content_type = "text/plain; charset=utf-8"
+                    status = 404
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            # Sin registro de cada petición en la salida de errores
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="exporter", daemon=True).start()
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,376 @@
+# Modo flota: un agente ligero en cada equipo sirve un resumen de sus
+# instantáneas (CPU, memoria, particiones, tasas de disco y red y procesos con
+# más CPU) y la interfaz consulta muchos agentes a la vez.
+#
+# Protocolo: líneas JSON sobre TCP con conexiones persistentes.
+#   cliente -> {"op": "hello", "v": 1, "token": ...}
+#   agente  -> {"i": 0, "ok": true, "h": "nombre del equipo", "v": 1}
+#   cliente -> {"i": N, "op": "get"}           (varias en vuelo sin esperar respuesta)
+#   agente  -> {"i": N, "t": instante, "=": {sección: valor}, "+": {sección: [cambiados, borrados]}, "-": [secciones]}
+# Cada respuesta sólo lleva lo que ha cambiado desde la anterior enviada por
+# esa conexión: "=" sustituye secciones completas, "+" actualiza por clave las
+# secciones que son diccionarios (particiones, procesos) y "-" borra
+# secciones. Si no hay datos nuevos la respuesta queda vacía.
+#
+# El cliente usa asyncio en un único hilo para todos los equipos: cada equipo
+# tiene una conexión y hasta MAX_INFLIGHT peticiones en vuelo; si un agente no
+# responde a tiempo se reconecta con espera creciente. Este módulo no depende
+# de la interfaz gráfica.
+import asyncio
+import heapq
+import json
+import random
+import socket
+import threading
+import time
+from collections import namedtuple
+
+PROTOCOL_VERSION = 1
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9878
+# Procesos con más CPU que envía el agente
+DEFAULT_TOP = 10
+# Peticiones sin respuesta permitidas por conexión antes de saltarse un ciclo
+MAX_INFLIGHT = 2
+# Espera máxima entre reintentos de conexión (s)
+MAX_BACKOFF = 30.0
+# Longitud máxima de una línea del protocolo
+LINE_LIMIT = 1 << 20
+
+# Resumen de un equipo de la flota (None en los datos que todavía no han llegado)
+HostSummary = namedtuple("HostSummary", [
+    "address", "name", "status", "error", "cpu", "cores", "load", "memory", "swap", "disk",
+    "disk_read", "disk_write", "net_recv", "net_sent", "top_process", "latency", "age"
+])
+# Instantánea de la flota: equipos y bytes recibidos por segundo entre todos
+FleetSnapshot = namedtuple("FleetSnapshot", ["timestamp", "hosts", "received_rate"])
+
+
+# Método para separar "host:puerto" (o sólo "host")
+def parse_address(text, default_port=DEFAULT_PORT):
+    text = text.strip()
+    host, separator, port = text.rpartition(":")
+    if not separator or "]" in port:
+        return text, default_port
+    return host.strip("[]") or DEFAULT_HOST, int(port)
+
+
+# Método para codificar las instantáneas en secciones compactas (listas y diccionarios)
+def encode_snapshots(snapshots, top=DEFAULT_TOP):
+    sections = {}
+    cpu = snapshots.get("cpu")
+    if cpu:
+        sections["cpu"] = [round(cpu.usage, 1), len(cpu.per_core)] + [round(load, 2) for load in cpu.load_avg or ()]
+    memory = snapshots.get("memory")
+    if memory:
+        sections["mem"] = [memory.total, round(memory.percent, 1), round(memory.swap_percent, 1)]
+    io = snapshots.get("io")
+    if io:
+        disk, net = io.disk_total, io.net_total
+        sections["io"] = [round(disk.read_bytes) if disk else 0, round(disk.write_bytes) if disk else 0,
+                          round(net.bytes_recv) if net else 0, round(net.bytes_sent) if net else 0]
+    disks = snapshots.get("disks")
+    if disks:
+        sections["fs"] = {part.mountpoint: [round(part.percent, 1), part.total]
+                          for part in disks.partitions if part.percent is not None}
+    processes = snapshots.get("processes")
+    if processes:
+        rows = heapq.nlargest(top, processes.rows, key=lambda row: row.cpu)
+        sections["ps"] = {str(row.pid): [row.name, round(row.cpu, 1), round(row.memory, 1), row.user] for row in rows}
+    return sections
+
+
+# Método para calcular los cambios entre las secciones enviadas y las actuales
+def diff_sections(previous, current):
+    delta = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if value == old:
+            continue
+        if isinstance(value, dict) and isinstance(old, dict):
+            changed = {item: row for item, row in value.items() if old.get(item) != row}
+            removed = [item for item in old if item not in value]
+            delta.setdefault("+", {})[key] = [changed, removed]
+        else:
+            delta.setdefault("=", {})[key] = value
+    removed = [key for key in previous if key not in current]
+    if removed:
+        delta["-"] = removed
+    return delta
+
+
+# Método para aplicar una respuesta a las secciones conocidas de un equipo
+def apply_delta(sections, message):
+    for key, value in message.get("=", {}).items():
+        sections[key] = value
+    for key, (changed, removed) in message.get("+", {}).items():
+        section = sections.setdefault(key, {})
+        section.update(changed)
+        for item in removed:
+            section.pop(item, None)
+    for key in message.get("-", ()):
+        sections.pop(key, None)
+
+
+# Método para serializar un mensaje en una línea compacta
+def encode_message(message):
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+# Servidor del agente: codifica una vez cada instantánea nueva y calcula los
+# cambios de cada conexión respecto a lo que ya le envió
+class FleetAgent:
+    def __init__(self, source, host=DEFAULT_HOST, port=DEFAULT_PORT, token=None, top=DEFAULT_TOP):
+        self.source = source          # función que devuelve las instantáneas nuevas (trabajo -> instantánea)
+        self.host = host
+        self.port = port
+        self.token = token
+        self.top = top
+        self.hostname = socket.gethostname()
+        self.snapshots = {}
+        self.sections = {}
+        self.timestamp = 0.0
+        self.connections = 0
+        self._server = None
+
+    # Método para obtener las secciones actuales (sólo se recodifican si hay instantáneas nuevas)
+    def current(self):
+        snapshots = self.source()
+        if snapshots:
+            self.snapshots.update(snapshots)
+            self.sections = encode_snapshots(self.snapshots, self.top)
+            self.timestamp = max(snapshot.timestamp for snapshot in self.snapshots.values())
+        return self.sections
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if hello.get("op") != "hello" or hello.get("v") != PROTOCOL_VERSION:
+                writer.write(encode_message({"i": 0, "ok": False, "error": "protocolo no compatible"}))
+                return
+            if self.token and hello.get("token") != self.token:
+                writer.write(encode_message({"i": 0, "ok": False, "error": "token no válido"}))
+                return
+            writer.write(encode_message({"i": 0, "ok": True, "h": self.hostname, "v": PROTOCOL_VERSION}))
+            sent = {}
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = json.loads(line)
+                current = self.current()
+                message = diff_sections(sent, current)
+                message["i"] = request.get("i")
+                message["t"] = self.timestamp
+                sent = current
+                writer.write(encode_message(message))
+                await writer.drain()
+        except (OSError, ValueError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port, limit=LINE_LIMIT)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+
+# Estado de un equipo en el cliente
+class HostState:
+    def __init__(self, address):
+        self.address = address
+        self.host, self.port = parse_address(address)
+        self.name = None
+        self.status = "connecting"    # connecting, ok, unreachable, timeout, error
+        self.error = None
+        self.sections = {}
+        self.timestamp = None         # instante de la última muestra del agente
+        self.received = 0.0           # instante local de la última respuesta
+        self.latency = None
+        self.inflight = {}            # id de petición -> instante de envío
+        self.task = None
+
+
+# Cliente de la flota: un hilo con un bucle asyncio para todos los equipos
+class FleetClient:
+    def __init__(self, addresses=(), interval=1.0, timeout=5.0, token=None):
+        self.interval = interval
+        self.timeout = timeout
+        self.token = token
+        self.hosts = {address: HostState(address) for address in addresses}
+        self.bytes_received = 0
+        self._rate_base = (time.monotonic(), 0)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._stopped = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="fleet", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def _run(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._stopped = asyncio.Event()
+        for host in list(self.hosts.values()):
+            host.task = self._loop.create_task(self._run_host(host))
+        ready.set()
+        try:
+            self._loop.run_until_complete(self._stopped.wait())
+            for host in list(self.hosts.values()):
+                if host.task is not None:
+                    host.task.cancel()
+            self._loop.run_until_complete(asyncio.gather(
+                *(host.task for host in self.hosts.values() if host.task is not None), return_exceptions=True))
+        finally:
+            self._loop.close()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stopped.set)
+        self._thread.join(timeout=2)
+        self._thread = None
+
+    # Método para añadir un equipo ("host:puerto") mientras el cliente está en marcha
+    def add_host(self, address):
+        with self._lock:
+            if address in self.hosts:
+                return
+            host = self.hosts[address] = HostState(address)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._start_host, host)
+
+    def _start_host(self, host):
+        host.task = self._loop.create_task(self._run_host(host))
+
+    def remove_host(self, address):
+        with self._lock:
+            host = self.hosts.pop(address, None)
+        if host is not None and host.task is not None:
+            self._loop.call_soon_threadsafe(host.task.cancel)
+
+    # Bucle de un equipo: conectar, consultar y reconectar con espera creciente
+    async def _run_host(self, host):
+        backoff = self.interval
+        while True:
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host.host, host.port, limit=LINE_LIMIT), self.timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                host.status, host.error = "unreachable", str(e) or type(e).__name__
+                await asyncio.sleep(backoff * random.uniform(0.8, 1.2))
+                backoff = min(MAX_BACKOFF, backoff * 2)
+                continue
+            # La sesión sólo termina con una excepción (o al cancelarse la tarea)
+            try:
+                await self._session(host, reader, writer)
+            except asyncio.TimeoutError:
+                failure = ("timeout", "El agente no responde")
+            except (OSError, ValueError, ConnectionError) as e:
+                failure = ("error", str(e) or type(e).__name__)
+            finally:
+                writer.close()
+            # Si el saludo se aceptó la conexión llegó a funcionar: se vuelve a la espera mínima
+            if host.status == "ok":
+                backoff = self.interval
+            host.status, host.error = failure
+            await asyncio.sleep(backoff)
+            backoff = min(MAX_BACKOFF, backoff * 2)
+
+    async def _session(self, host, reader, writer):
+        writer.write(encode_message({"op": "hello", "v": PROTOCOL_VERSION, "token": self.token}))
+        await writer.drain()
+        line = await asyncio.wait_for(reader.readline(), self.timeout)
+        hello = json.loads(line or b"{}")
+        if not hello.get("ok"):
+            raise ConnectionError(hello.get("error", "conexión rechazada"))
+        # El agente envía los cambios respecto a lo que ya ha enviado por esta conexión
+        with self._lock:
+            host.sections = {}
+            host.inflight = {}
+        host.name = hello.get("h")
+        host.status, host.error = "ok", None
+        sender = asyncio.ensure_future(self._send_loop(host, writer))
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(), self.timeout + self.interval)
+                if not line:
+                    raise ConnectionError("El agente ha cerrado la conexión")
+                self.bytes_received += len(line)
+                message = json.loads(line)
+                now = time.monotonic()
+                sent = host.inflight.pop(message.get("i"), None)
+                if sent is not None:
+                    host.latency = now - sent
+                with self._lock:
+                    apply_delta(host.sections, message)
+                host.timestamp = message.get("t")
+                host.received = now
+                host.status = "ok"
+        finally:
+            sender.cancel()
+            # Recoger el resultado del envío para que su error no se avise como no recuperado
+            sender.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    # Envío periódico de peticiones sin esperar a las respuestas anteriores
+    async def _send_loop(self, host, writer):
+        loop = asyncio.get_running_loop()
+        # Desfase aleatorio para no consultar todos los equipos en el mismo instante
+        await asyncio.sleep(random.uniform(0, self.interval))
+        next_time = loop.time()
+        while True:
+            if len(host.inflight) < MAX_INFLIGHT:
+                self._next_id += 1
+                host.inflight[self._next_id] = time.monotonic()
+                writer.write(encode_message({"i": self._next_id, "op": "get"}))
+                await writer.drain()
+            next_time += self.interval
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+
+    # Método para obtener el resumen de todos los equipos (se puede llamar desde cualquier hilo)
+    def snapshot(self):
+        now = time.monotonic()
+        hosts = []
+        with self._lock:
+            for host in self.hosts.values():
+                hosts.append(summarize(host, now))
+            base_time, base_bytes = self._rate_base
+            received = self.bytes_received
+            self._rate_base = (now, received)
+        rate = (received - base_bytes) / (now - base_time) if now > base_time else 0.0
+        return FleetSnapshot(time.time(), tuple(hosts), rate)
+
+
+# Método para resumir el estado de un equipo en una fila
+def summarize(host, now):
+    sections = host.sections
+    cpu = sections.get("cpu") or [None, None]
+    mem = sections.get("mem") or [None, None, None]
+    io = sections.get("io") or [None] * 4
+    cores = cpu[1]
+    # Carga: media de 1 minuto por núcleo (en %) o, sin carga media (Windows), el uso de CPU
+    load = cpu[2] / cores * 100 if len(cpu) > 2 and cores else cpu[0]
+    filesystems = sections.get("fs")
+    disk = max((values[0] for values in filesystems.values()), default=None) if filesystems else None
+    processes = sections.get("ps")
+    top = max(processes.values(), key=lambda row: row[1]) if processes else None
+    return HostSummary(
+        host.address, host.name, host.status, host.error, cpu[0], cores, load, mem[1], mem[2], disk,
+        io[0], io[1], io[2], io[3], f"{top[0]} ({top[1]:.1f}%)" if top else None,
+        host.latency, now - host.received if host.received else None
+    )
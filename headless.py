@@ -0,0 +1,206 @@
+# Modo sin interfaz gráfica: muestra las instantáneas del sistema como líneas JSON.
+# No importa tkinter ni PIL, así que puede ejecutarse en servidores sin
+# pantalla, desde cron o como proceso auxiliar.
+#
+# Ejemplos:
+#   python3 headless.py --count 1
+#   python3 headless.py --interval 5 --sections cpu,memory --top 20
+#   python3 headless.py --sections processes --top 10 --details io
+#   python3 headless.py --record ~/grabaciones --quiet
+#   python3 headless.py --serve 0.0.0.0:9877 --quiet
+import argparse
+import json
+import sys
+import time
+
+import psutil
+
+import collector
+from rates import IoRateEngine
+from sensors import create_sensors
+from connections import create_connections
+from collector import DETAIL_METRICS
+from procfs import create_process_cache, BACKENDS
+from recorder import Recorder, default_recordings_dir
+from exporter import MetricsExporter, parse_address, DEFAULT_PORT
+from alerts import AlertEngine, AlertLog, DEFAULT_RULES
+from settings import load_settings
+from profiler import Profiler
+
+SECTIONS = ("system", "cpuinfo", "cpu", "sensors", "memory", "disks", "network", "rates", "processes", "connections")
+DEFAULT_SECTIONS = "cpu,sensors,memory,disks,network,rates,processes"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analiza Tu Sistema sin interfaz gráfica (salida en líneas JSON)")
+    parser.add_argument("-i", "--interval", type=float, default=1.0,
+                        help="segundos entre muestras (por defecto 1)")
+    parser.add_argument("-n", "--count", type=int, default=0,
+                        help="número de muestras; 0 para no parar (por defecto 0)")
+    parser.add_argument("-s", "--sections", default=DEFAULT_SECTIONS,
+                        help=f"secciones separadas por comas: {', '.join(SECTIONS)} (por defecto {DEFAULT_SECTIONS})")
+    parser.add_argument("-t", "--top", type=int, default=10,
+                        help="procesos con más CPU a incluir; 0 para todos (por defecto 10)")
+    parser.add_argument("-b", "--backend", choices=BACKENDS, default="auto",
+                        help="lectura de procesos: /proc en Linux (procfs), psutil o automática (por defecto auto)")
+    parser.add_argument("-d", "--details", choices=DETAIL_METRICS,
+                        help="añadir E/S por segundo, cambios de contexto, hilos y descriptores a los procesos "
+                             "con más cpu, memory o io (sólo se leen para los --top elegidos)")
+    parser.add_argument("-r", "--record", nargs="?", const=default_recordings_dir(), metavar="CARPETA",
+                        help=f"grabar las secciones cpu, memory, rates y processes en disco (por defecto en {default_recordings_dir()})")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="no escribir las líneas JSON (útil junto con --record o --serve)")
+    parser.add_argument("-a", "--alerts", action="store_true",
+                        help="evaluar las reglas de alertas de las preferencias y escribir los avisos en la salida de errores")
+    parser.add_argument("-p", "--profile", metavar="FICHERO",
+                        help="guardar al terminar un informe JSON con los tiempos de cada sección y el coste del propio proceso")
+    parser.add_argument("--serve", metavar="[HOST:]PUERTO",
+                        help=f"servir las secciones pedidas en formato OpenMetrics en /metrics (p. ej. {DEFAULT_PORT})")
+    args = parser.parse_args(argv)
+    args.sections = [section.strip() for section in args.sections.split(",") if section.strip()]
+    unknown = [section for section in args.sections if section not in SECTIONS]
+    if unknown:
+        parser.error(f"secciones desconocidas: {', '.join(unknown)}")
+    if args.serve:
+        try:
+            args.serve = parse_address(args.serve)
+        except ValueError:
+            parser.error(f"dirección no válida: {args.serve}")
+    return args
+
+
+# Secciones cuyo nombre de instantánea es distinto (el del trabajo equivalente en la interfaz)
+SNAPSHOT_NAMES = {"rates": "io"}
+
+
+# Recolector de una muestra con todas las secciones pedidas
+class HeadlessCollector:
+    def __init__(self, sections, top, recorder=None, exporter=None, backend="auto", alerts=None, alert_log=None, details=None,
+                 profiler=None):
+        self.sections = sections
+        self.top = top
+        self.recorder = recorder
+        self.exporter = exporter
+        self.alerts = alerts
+        self.alert_log = alert_log
+        self.profiler = profiler
+        self.process_cache = create_process_cache(backend)
+        self.details = details
+        if details:
+            self.process_cache.details.configure(True, top or None, details)
+        self.io_rates = IoRateEngine()
+        self.sensors = create_sensors()
+        self.connections = create_connections()
+        # Primera lectura de contadores: las tasas aparecen desde la segunda muestra
+        self.io_rates.sample()
+        # Primera llamada para fijar la referencia de cpu_percent(interval=None)
+        psutil.cpu_percent(interval=None, percpu=True)
+        psutil.cpu_percent(interval=None)
+
+    def collect(self):
+        sample = {"timestamp": time.time()}
+        snapshots = {}
+        for section in self.sections:
+            start = time.perf_counter()
+            if section == "system":
+                sample["system"] = collector.collect_system()
+            elif section == "cpuinfo":
+                sample["cpuinfo"] = collector.collect_cpu_info()
+            elif section == "cpu":
+                sample["cpu"] = collector.sample_cpu()
+            elif section == "sensors":
+                sample["sensors"] = self.sensors.sample()
+            elif section == "memory":
+                sample["memory"] = collector.collect_memory()
+            elif section == "disks":
+                sample["disks"] = collector.collect_disks()
+            elif section == "network":
+                sample["network"] = collector.collect_network()
+            elif section == "rates":
+                sample["rates"] = self.io_rates.sample()
+            elif section == "connections":
+                # Sólo los recuentos: el listado completo puede tener cientos de miles de filas
+                snapshot = self.connections.sample()
+                processes = snapshot.processes[:self.top] if self.top else snapshot.processes
+                sample["connections"] = snapshot._replace(processes=processes, rows=None, names=None)
+            elif section == "processes":
+                snapshot = self.process_cache.sample()
+                snapshots["processes"] = snapshot
+                rows = snapshot.rows
+                if self.top:
+                    if self.details == "io":
+                        key = lambda row: (row.read_rate or 0.0) + (row.write_rate or 0.0)
+                    elif self.details == "memory":
+                        key = lambda row: row.rss
+                    else:
+                        key = lambda row: row.cpu
+                    rows = sorted(rows, key=key, reverse=True)[:self.top]
+                sample["processes"] = rows
+            if section != "processes":
+                snapshots[SNAPSHOT_NAMES.get(section, section)] = sample[section]
+            if self.profiler is not None:
+                self.profiler.record(f"muestreo: {section}", time.perf_counter() - start)
+        if self.recorder is not None:
+            self.recorder.update(snapshots)
+        if self.exporter is not None:
+            self.exporter.update({name: snapshot for name, snapshot in snapshots.items() if hasattr(snapshot, "timestamp")})
+        if self.alerts is not None:
+            for event in self.alerts.update(snapshots):
+                sys.stderr.write(json.dumps({"rule": event.rule.name, "state": event.state, "value": event.value,
+                                             "message": event.message}, ensure_ascii=False) + "\n")
+                if self.alert_log is not None:
+                    self.alert_log.write(event)
+        return collector.to_dict(sample)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    recorder = Recorder(args.record) if args.record else None
+    exporter = None
+    if args.serve:
+        exporter = MetricsExporter(*args.serve)
+        exporter.start()
+    alerts = alert_log = None
+    if args.alerts:
+        alert_settings = load_settings().get("alerts", {})
+        alerts = AlertEngine(alert_settings.get("rules", DEFAULT_RULES))
+        for error in alerts.errors:
+            print(f"Regla no válida: {error}", file=sys.stderr)
+        missing = {source if source != "io" else "rates" for source in alerts.sources()} - set(args.sections)
+        if missing:
+            print(f"Las reglas necesitan las secciones: {', '.join(sorted(missing))}", file=sys.stderr)
+        alert_log = AlertLog(alert_settings.get("log_path")) if alert_settings.get("log") else None
+    profiler = Profiler() if args.profile else None
+    headless = HeadlessCollector(args.sections, args.top, recorder, exporter, args.backend, alerts, alert_log, args.details,
+                                 profiler)
+    emitted = 0
+    next_time = time.monotonic()
+    try:
+        while True:
+            sample = headless.collect()
+            if not args.quiet:
+                sys.stdout.write(json.dumps(sample, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+            emitted += 1
+            if args.count and emitted >= args.count:
+                break
+            # Mantener el ritmo aunque la recogida tarde
+            next_time += args.interval
+            time.sleep(max(0.0, next_time - time.monotonic()))
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        if recorder is not None:
+            recorder.close()
+        if exporter is not None:
+            exporter.stop()
+        if profiler is not None:
+            try:
+                profiler.export(args.profile)
+            except OSError as e:
+                print(f"No se pudo guardar el informe de rendimiento: {e}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# Historial de métricas en buffers circulares de tamaño fijo.
+# Cada métrica ocupa un array('f') preasignado: añadir una muestra no reserva
+# memoria y leer la ventana completa es una copia en C.
+from array import array
+
+
+# Buffer circular de valores numéricos
+class RingBuffer:
+    def __init__(self, size, typecode='f'):
+        self.size = size
+        self.data = array(typecode, [0]) * size
+        self.head = 0    # posición donde se escribirá el siguiente valor
+        self.count = 0
+
+    def append(self, value):
+        self.data[self.head] = value
+        self.head = (self.head + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+
+    # Método para obtener los valores en orden cronológico (del más antiguo al más reciente)
+    def values(self):
+        if self.count < self.size:
+            return self.data[:self.count]
+        return self.data[self.head:] + self.data[:self.head]
+
+    def last(self):
+        if not self.count:
+            return None
+        return self.data[self.head - 1]
+
+    def __len__(self):
+        return self.count
+
+
+# Conjunto de buffers con nombre, todos con la misma capacidad
+class MetricHistory:
+    def __init__(self, seconds=600, resolution=1.0):
+        self.size = max(2, int(seconds / resolution))
+        self.buffers = {}
+
+    def buffer(self, name):
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            buffer = self.buffers[name] = RingBuffer(self.size)
+        return buffer
+
+    def append(self, name, value):
+        self.buffer(name).append(value)
@@ -0,0 +1,160 @@
+# Servicio de inventario de hardware.
+# Las consultas lentas (dmidecode, lspci, ficheros DMI, WMI, cpuinfo) se
+# ejecutan a la vez en un grupo de hilos y cada resultado se publica en una
+# cola en cuanto termina. Los resultados se guardan en disco junto con el
+# identificador del arranque actual, así que mientras no se reinicie el equipo
+# los siguientes inicios no repiten las consultas. Sólo se guardan las que han
+# funcionado: las que fallan (sin permisos, sin la herramienta) se repiten en
+# cada inicio.
+import json
+import os
+import platform
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+import collector
+
+
+# Método para obtener el modelo y la arquitectura del procesador (una sola llamada a cpuinfo)
+def get_cpu_model():
+    try:
+        import cpuinfo
+        info = cpuinfo.get_cpu_info()
+        return {"model": info.get('brand_raw'), "arch": info.get('arch')}
+    except Exception:
+        return {"model": "No disponible", "arch": "No disponible"}
+
+
+# Consultas del inventario: nombre -> función
+PROBES = {
+    "manufacturer": collector.get_pc_manufacturer,
+    "model": collector.get_pc_model,
+    "motherboard": collector.get_motherboard_info,
+    "ram_modules": collector.get_ram_type,
+    "gpu": collector.get_gpu_info,
+    "cpu": get_cpu_model
+}
+
+
+# Valores con los que las consultas indican que no han podido obtener el dato
+FAILURE_VALUES = {
+    "", "No disponible", "No se ha podido obtener la información del sistema", "No se ha podido obtener el modelo"
+}
+
+
+# Método para saber si el resultado de una consulta es un fallo (no se guarda en la caché)
+def probe_failed(value):
+    if isinstance(value, dict):
+        return any(probe_failed(item) for item in value.values())
+    return value is None or (isinstance(value, str) and value.strip() in FAILURE_VALUES)
+
+
+# Método para obtener un identificador único del arranque actual
+def get_boot_id():
+    try:
+        return open("/proc/sys/kernel/random/boot_id").read().strip()
+    except OSError:
+        return str(int(psutil.boot_time()))
+
+
+# Método para obtener la ruta del fichero de caché del inventario
+def default_cache_path():
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "analiza_tu_sistema", "inventory.json")
+
+
+# Método para ejecutar una consulta en un hilo del grupo
+def run_probe(func):
+    if platform.system() == "Windows":
+        # WMI necesita inicializar COM en cada hilo
+        try:
+            import pythoncom
+            pythoncom.CoInitialize()
+        except ImportError:
+            pass
+    return func()
+
+
+class HardwareInventory:
+    def __init__(self, cache_path=None, probes=None, max_workers=None):
+        self.cache_path = cache_path or default_cache_path()
+        self.probes = probes or PROBES
+        self.max_workers = max_workers or len(self.probes)
+        self.queue = queue.Queue()
+        self.results = {}
+        self.failed = set()     # consultas que han fallado en este inicio
+        self.boot_id = get_boot_id()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    # Método para cargar los resultados guardados si son del arranque actual
+    def load_cache(self):
+        try:
+            with open(self.cache_path, encoding="utf-8") as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if data.get("boot_id") != self.boot_id:
+            return {}
+        return {name: value for name, value in data.get("results", {}).items()
+                if name in self.probes and not probe_failed(value)}
+
+    # Método para guardar los resultados (escritura atómica)
+    def save_cache(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as cache_file:
+                with self._lock:
+                    results = {name: value for name, value in self.results.items() if name not in self.failed}
+                json.dump({"boot_id": self.boot_id, "results": results}, cache_file, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass
+
+    # Método para iniciar las consultas (o publicar las de la caché)
+    def start(self):
+        cached = self.load_cache()
+        for name, value in cached.items():
+            self.results[name] = value
+            self.queue.put((name, value))
+        # Las consultas que no están en la caché (o fallaron la vez anterior) se repiten
+        pending = {name: func for name, func in self.probes.items() if name not in cached}
+        if not pending:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending)), thread_name_prefix="inventory")
+        for name, func in pending.items():
+            future = self._executor.submit(run_probe, func)
+            future.add_done_callback(lambda future, name=name: self._on_done(name, future))
+        self._executor.shutdown(wait=False)
+
+    def _on_done(self, name, future):
+        try:
+            value = future.result()
+            failed = probe_failed(value)
+        except Exception:
+            value = "No disponible"
+            failed = True
+        with self._lock:
+            self.results[name] = value
+            if failed:
+                self.failed.add(name)
+            complete = set(self.results) == set(self.probes)
+        self.queue.put((name, value))
+        if complete:
+            self.save_cache()
+
+    # Método para obtener los resultados publicados desde la última llamada
+    def drain(self):
+        results = []
+        while True:
+            try:
+                results.append(self.queue.get_nowait())
+            except queue.Empty:
+                return results
@@ -1,15 +1,74 @@
+import time
+APP_START = time.perf_counter() # Referencia para medir el tiempo de arranque (incluye las importaciones)
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
 import psutil
 import platform
-import cpuinfo
 import socket
 import os
+import sys
 from datetime import datetime
 import webbrowser
+import collector
+from collector import sample_cpu, collect_memory
+from procfs import create_process_cache
+from rates import IoRateEngine
+from sensors import create_sensors
+import connections
+from inventory import HardwareInventory, PROBES
+from sampler import Sampler
+from history import MetricHistory, RingBuffer
+from charts import Sparkline
+from process_table import ProcessStore, KeyedProcessView, VirtualProcessView, ProcessTreeView, BASE_COLUMNS, DETAIL_COLUMNS
+from settings import load_settings, save_settings
+from recorder import Recorder, RecordingReader, default_recordings_dir
+from exporter import MetricsExporter, DEFAULT_HOST, DEFAULT_PORT
+from alerts import AlertEngine, AlertLog, DEFAULT_RULES, default_log_path, notify_desktop
+from profiler import Profiler, LOOP_LAG, default_profiles_dir
+from fleet import FleetClient, parse_address as parse_agent_address
+from collections import deque
+
+# Presupuesto de arranque hasta el primer fotograma (ms). Si se supera se muestra
+# el informe de tiempos; con ATS_STARTUP_REPORT=1 se muestra siempre.
+STARTUP_BUDGET_MS = 500
+
+# Intervalos de muestreo por defecto (segundos) y nombre de cada trabajo en la interfaz
+DEFAULT_INTERVALS = {"cpu": 1.0, "sensors": 1.0, "memory": 1.0, "io": 1.0, "processes": 5.0, "disks": 10.0,
+                     "connections": 5.0, "host": 5.0, "network": 5.0}
+JOB_LABELS = {"cpu": "CPU", "sensors": "Sensores", "memory": "Memoria", "io": "Disco y red", "processes": "Procesos",
+              "disks": "Particiones", "connections": "Conexiones", "host": "Sistema y frecuencia",
+              "network": "Interfaces de red"}
+# Modos de las columnas de detalle de procesos: (top N o None para todos, métrica de selección)
+PROCESS_DETAIL_MODES = {
+    "Sin detalle": None,
+    "Detalle de todos": (None, "cpu"),
+    "Top 50 por CPU": (50, "cpu"),
+    "Top 50 por memoria": (50, "memory"),
+    "Top 50 por E/S": (50, "io")
+}
+# Filas por página del listado de conexiones y procesos mostrados en su resumen
+CONNECTIONS_PAGE_SIZE = 100
+CONNECTION_PROCESSES = 100
+# Estados con columna propia en el resumen de conexiones por proceso
+CONNECTION_STATES = ("ESTABLISHED", "LISTEN", "TIME_WAIT", "CLOSE_WAIT")
+# Intervalo de la muestra del coste del propio monitor (segundos)
+PROFILE_INTERVAL = 2.0
+# Intervalo de consulta a los agentes de la flota y de refresco de su tabla (segundos)
+FLEET_INTERVAL = 1.0
+# Estados de los equipos de la flota
+FLEET_STATUS = {"connecting": "Conectando", "ok": "Conectado", "unreachable": "Sin conexión",
+                "timeout": "Sin respuesta", "error": "Error"}
+# Factor de alargamiento de los intervalos con la ventana minimizada
+MINIMIZED_SLOWDOWN = 5
+# Gráficas por núcleo en cada fila de la pestaña de CPU
+CORE_CHART_COLUMNS = 4
+# Cadencia con la que el hilo de Tk recoge las instantáneas (ms)
+POLL_INTERVAL_MS = 100
+MINIMIZED_POLL_INTERVAL_MS = 1000
 
 class SystemInfoApp:
     def __init__(self, root):
+        self.startup_timings = [("Importaciones", (time.perf_counter() - APP_START) * 1000)]
         self.root = root
         self.root.title("Analiza Tu Sistema")
         self.root.geometry("800x600")
@@ -18,8 +77,230 @@ class SystemInfoApp:
         if platform.system() == "Windows":
             from ctypes import windll
             windll.shcore.SetProcessDpiAwareness(1) # Para evitar problemas de escalado en pantallas de alta resolución
-        self.create_ui() # Crear la interfaz de usuario
+        # Planificador de muestreo: es el único que programa trabajos periódicos y
+        # toda la recogida de datos de psutil se hace fuera del hilo de Tk
+        self.settings = load_settings()
+        intervals = dict(DEFAULT_INTERVALS, **self.settings.get("intervals", {}))
+        # Tiempos de los puntos calientes del propio monitor (pestaña de rendimiento)
+        self.profiler = Profiler()
+        timed = self.profiler.wrap
+        self.sampler = Sampler()
+        self.sampler.add_job("cpu", timed("muestreo: cpu", sample_cpu), intervals["cpu"])
+        # Sensores: en Linux los ficheros de hwmon se abren una vez y se releen en cada muestra
+        self.sensors = create_sensors()
+        self.sampler.add_job("sensors", timed("muestreo: sensors", self.sensors.sample), intervals["sensors"], paused=True)
+        # En Linux los procesos se leen directamente de /proc ("process_backend": "psutil" para desactivarlo)
+        self.process_cache = create_process_cache(self.settings.get("process_backend", "auto"))
+        # Columnas de detalle (E/S, hilos, descriptores): sólo se leen si se activan
+        details = self.settings.get("process_details")
+        if details:
+            self.process_cache.details.configure(True, details.get("top"), details.get("metric", "cpu"))
+        self.sampler.add_job("processes", timed("muestreo: processes", self.process_cache.sample), intervals["processes"], paused=True)
+        self.sampler.add_job("memory", timed("muestreo: memory", collect_memory), intervals["memory"])
+        # Arranque, batería y frecuencia (pestañas de sistema y CPU) e interfaces de red
+        self.sampler.add_job("host", timed("muestreo: host", collector.collect_host), intervals["host"], paused=True)
+        self.sampler.add_job("network", timed("muestreo: network", collector.collect_network), intervals["network"], paused=True)
+        self.io_rates = IoRateEngine()
+        self.sampler.add_job("io", timed("muestreo: io", self.io_rates.sample), intervals["io"])
+        # Uso de las particiones: cada montaje se consulta con un plazo máximo
+        self.sampler.add_job("disks", timed("muestreo: disks", collector.collect_disks), intervals["disks"], paused=True)
+        self.sampler.add_job("profile", self.profiler.sample, PROFILE_INTERVAL, paused=True)
+        # Conexiones de red: recuentos por proceso y estado; el listado se pagina en la interfaz
+        self.connections = connections.create_connections()
+        self.sampler.add_job("connections", timed("muestreo: connections", self.connections.sample),
+                             intervals["connections"], paused=True)
+        # Modo flota: un único hilo con asyncio consulta a todos los agentes (agent.py)
+        fleet_settings = self.settings.get("fleet", {})
+        self.fleet = FleetClient(fleet_settings.get("hosts", []), fleet_settings.get("interval", FLEET_INTERVAL),
+                                 token=fleet_settings.get("token"))
+        if self.fleet.hosts:
+            self.fleet.start()
+        self.sampler.add_job("fleet", self.fleet.snapshot, FLEET_INTERVAL, paused=True)
+        self.poll_interval_ms = POLL_INTERVAL_MS
+        # El historial se guarda siempre, aunque la pestaña no esté a la vista
+        self.snapshot_recorders = {
+            "cpu": self.record_cpu_history,
+            "memory": self.record_memory_history,
+            "io": self.record_io_history
+        }
+        # Actualización de widgets: sólo con su pestaña a la vista
+        self.snapshot_handlers = {
+            "host": [("🖥️ Sistema", self.update_system_info), ("⚡ CPU", self.update_cpu_static)],
+            "cpu": [("⚡ CPU", self.update_cpu_info)],
+            "sensors": [("⚡ CPU", self.update_sensors)],
+            "memory": [("💾 Memoria", self.update_memory_info)],
+            "processes": [("📋 Procesos", self.update_process_list)],
+            "io": [("💽 Discos", self.update_disk_rates), ("🌐 Red", self.update_nic_rates)],
+            "network": [("🌐 Red", self.update_network_interfaces)],
+            "connections": [("🌐 Red", self.update_connections)],
+            "disks": [("💽 Discos", self.update_disk_usage)],
+            "profile": [("📈 Rendimiento", self.update_profile)],
+            "fleet": [("🛰️ Flota", self.update_fleet)]
+        }
+        # Trabajos de muestreo que se pausan mientras su pestaña está oculta
+        self.tab_jobs = {"🖥️ Sistema": ["host"], "⚡ CPU": ["sensors", "host"], "🌐 Red": ["network", "connections"], "📋 Procesos": ["processes"], "💽 Discos": ["disks"], "📈 Rendimiento": ["profile"],
+                         "🛰️ Flota": ["fleet"]}
+        self.last_snapshots = {}
+        self.current_tab = None
+        # Grabación en disco (opcional) y grabación abierta para reproducir
+        self.recorder = Recorder() if self.settings.get("recording") else None
+        self.replay = None
+        self.replay_charts = []
+        # Alertas por umbrales: las reglas están en la sección "alerts" de las preferencias
+        alert_settings = self.settings.get("alerts", {})
+        self.alerts = AlertEngine(alert_settings.get("rules", DEFAULT_RULES))
+        self.alert_log = AlertLog(alert_settings.get("log_path")) if alert_settings.get("log") else None
+        self.alert_events = deque(maxlen=200)
+        self.alert_toast = None
+        # Servidor de métricas OpenMetrics (opcional)
+        self.exporter = None
+        self.exporter_error = None
+        if self.settings.get("exporter", {}).get("enabled"):
+            self.start_exporter()
+        # Historial de los últimos 10 minutos a 1 segundo de resolución
+        self.history = MetricHistory(seconds=600, resolution=1.0)
+        self.charts = []
+        # Inventario de hardware: consultas lentas en paralelo, con caché por arranque
+        # (dmidecode, lspci y cpuinfo se cronometran como el resto de puntos calientes)
+        self.inventory = HardwareInventory(probes={name: timed(f"inventario: {name}", func) for name, func in PROBES.items()})
+        self.inventory_labels = {}
+        self.inventory.start() # Las consultas lentas empiezan antes de crear la interfaz
+        self.time_step("Interfaz", self.create_ui) # Crear la interfaz de usuario
         self.get_system_info() # Obtener información del sistema
+        self.sampler.start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Unmap>", self.on_window_state, add="+")
+        self.root.bind("<Map>", self.on_window_state, add="+")
+        self.first_frame_ms = None
+        self.startup_report_pending = True
+        self.root.bind("<Map>", self.on_first_map, add="+")
+        self.poll_due = None
+        self.poll_snapshots()
+    
+    # Método para medir el tiempo de un paso del arranque
+    def time_step(self, name, func, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        self.startup_timings.append((name, elapsed * 1000))
+        self.profiler.record(f"construcción: {func.__name__}", elapsed)
+        return result
+    
+    # Método llamado al mostrarse la ventana: el primer fotograma se dibuja en el siguiente ciclo ocioso
+    def on_first_map(self, event):
+        if event.widget is self.root and self.startup_report_pending:
+            self.startup_report_pending = False
+            self.root.after_idle(self.report_startup)
+    
+    # Método para mostrar el informe de tiempos de arranque
+    def report_startup(self):
+        self.first_frame_ms = (time.perf_counter() - APP_START) * 1000
+        if os.environ.get("ATS_STARTUP_REPORT") or self.first_frame_ms > STARTUP_BUDGET_MS:
+            print(f"Tiempo hasta el primer fotograma: {self.first_frame_ms:.0f} ms (presupuesto {STARTUP_BUDGET_MS} ms)", file=sys.stderr)
+            for name, ms in self.startup_timings:
+                print(f"  {name}: {ms:.0f} ms", file=sys.stderr)
+        
+    # Método para recoger las instantáneas publicadas por los hilos de muestreo
+    def poll_snapshots(self):
+        if self.poll_due is not None:
+            # Retraso del bucle de eventos: cuánto después de lo programado llega esta llamada
+            self.profiler.record(LOOP_LAG, max(0.0, time.perf_counter() - self.poll_due))
+        snapshots = self.sampler.drain()
+        if snapshots and self.recorder is not None:
+            self.recorder.update(snapshots)
+        if snapshots and self.exporter is not None:
+            self.exporter.update(snapshots)
+        if snapshots and self.alerts.rules:
+            for event in self.alerts.update(snapshots):
+                self.on_alert(event)
+        for name, snapshot in snapshots.items():
+            self.last_snapshots[name] = snapshot
+            recorder = self.snapshot_recorders.get(name)
+            if recorder:
+                recorder(snapshot)
+            for tab, handler in self.snapshot_handlers.get(name, ()):
+                if tab == self.current_tab:
+                    self.profiler.call(f"interfaz: {handler.__name__}", handler, snapshot)
+        if snapshots:
+            self.profiler.call("interfaz: redraw_charts", self.redraw_charts)
+        for probe, value in self.inventory.drain():
+            self.update_inventory(probe, value)
+        if self.current_tab == "⚙️ Ajustes":
+            self.update_job_status()
+        elif self.current_tab == "⏪ Grabación":
+            self.update_recording_status()
+        elif self.current_tab == "🔔 Alertas" and snapshots:
+            self.update_alert_rules()
+        self.poll_due = time.perf_counter() + self.poll_interval_ms / 1000
+        self.root.after(self.poll_interval_ms, self.poll_snapshots)
+    
+    # Método para rellenar las etiquetas que esperaban un resultado del inventario
+    def update_inventory(self, probe, value):
+        if probe == "cpu":
+            values = {"cpu_model": value["model"], "cpu_arch": value["arch"]}
+        else:
+            values = {probe: value}
+        for key, text in values.items():
+            for label in self.inventory_labels.get(key, ()):
+                label.config(text=text)
+    
+    # Método para registrar etiquetas que se rellenarán con un resultado del inventario
+    def bind_inventory(self, labels, fields):
+        for text, key in fields.items():
+            self.inventory_labels.setdefault(key, []).append(labels[text])
+        # Si el resultado ya había llegado se muestra directamente
+        results = dict(self.inventory.results)
+        if "cpu" in results:
+            results["cpu_model"] = results["cpu"]["model"]
+            results["cpu_arch"] = results["cpu"]["arch"]
+        for text, key in fields.items():
+            if key in results:
+                labels[text].config(text=results[key])
+    
+    # Método para redibujar las gráficas (sólo se dibujan las que están a la vista)
+    def redraw_charts(self):
+        for chart in self.charts:
+            chart.redraw()
+    
+    # Método para añadir una gráfica de historial
+    def add_sparkline(self, parent, metric, label, maximum=100.0, formatter=None, width=200, height=40):
+        chart = Sparkline(parent, self.history.buffer(metric), label, maximum, formatter, width=width, height=height)
+        self.charts.append(chart)
+        return chart
+    
+    # Método para añadir una sección con gráficas de historial (métrica, etiqueta, máximo, formato)
+    def add_history_section(self, parent, title, items):
+        frame = ttk.LabelFrame(parent, text=title)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        for metric, label, maximum, formatter in items:
+            self.add_sparkline(frame, metric, label, maximum, formatter).pack(fill=tk.X, expand=True, padx=5, pady=2)
+        return frame
+    
+    # Método para espaciar el muestreo mientras la ventana está minimizada
+    def on_window_state(self, event):
+        if event.widget is not self.root:
+            return
+        if str(event.type) == "Unmap":
+            self.sampler.set_slowdown(MINIMIZED_SLOWDOWN)
+            self.poll_interval_ms = MINIMIZED_POLL_INTERVAL_MS
+        else:
+            self.sampler.set_slowdown(1)
+            self.poll_interval_ms = POLL_INTERVAL_MS
+    
+    # Método para cerrar la aplicación deteniendo los hilos de muestreo
+    def on_close(self):
+        self.sampler.stop()
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.replay is not None:
+            self.replay.close()
+        if self.exporter is not None:
+            self.exporter.stop()
+        if self.profiler.capture.active:
+            self.profiler.capture.stop(default_profiles_dir())
+        self.fleet.stop()
+        self.sensors.close()
+        self.root.destroy()
         
     # Método para crear la interfaz de usuario
     def create_ui(self):
@@ -40,13 +321,61 @@ class SystemInfoApp:
             "💽 Discos": self.create_disk_tab,
             "🌐 Red": self.create_network_tab,
             "📋 Procesos": self.create_process_tab,
+            "🔔 Alertas": self.create_alerts_tab,
+            "⏪ Grabación": self.create_recording_tab,
+            "🛰️ Flota": self.create_fleet_tab,
+            "📈 Rendimiento": self.create_profile_tab,
+            "⚙️ Ajustes": self.create_settings_tab,
             "📖 Info": self.create_info_tab 
         }
-        # Crear pestañas
-        for tab_name, tab_method in self.tabs.items():
+        # Crear pestañas vacías: su contenido se construye al seleccionarlas por primera vez
+        self.tab_frames = {}
+        self.built_tabs = set()
+        for tab_name in self.tabs:
             frame = ttk.Frame(self.notebook)
             self.notebook.add(frame, text=tab_name)
-            tab_method(frame)
+            self.tab_frames[tab_name] = frame
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        self.on_tab_changed()
+    
+    # Método para construir una pestaña la primera vez que se muestra
+    def build_tab(self, tab_name):
+        self.built_tabs.add(tab_name)
+        self.time_step(f"Pestaña {tab_name}", self.tabs[tab_name], self.tab_frames[tab_name])
+    
+    # Método llamado al cambiar de pestaña
+    def on_tab_changed(self, event=None):
+        tab_name = self.notebook.tab(self.notebook.select(), "text")
+        if tab_name == self.current_tab:
+            return
+        self.current_tab = tab_name
+        if tab_name not in self.built_tabs:
+            self.build_tab(tab_name)
+        self.update_paused_jobs()
+        # Mostrar de inmediato la última instantánea disponible
+        for name, handlers in self.snapshot_handlers.items():
+            snapshot = self.last_snapshots.get(name)
+            if snapshot is None:
+                continue
+            for tab, handler in handlers:
+                if tab == tab_name:
+                    handler(snapshot)
+        self.redraw_charts()
+    
+    # Método para pausar los trabajos de las pestañas ocultas y reanudar los de la visible
+    # Mientras se graba o se exportan métricas no se pausa ninguno: necesitan todas las muestras.
+    # Tampoco los que usan las reglas de alertas
+    def update_paused_jobs(self):
+        background = self.recorder is not None or self.exporter is not None
+        alert_sources = self.alerts.sources()
+        # Un trabajo puede servir a varias pestañas: sigue activo si lo usa la visible
+        active = set(self.tab_jobs.get(self.current_tab, ()))
+        for tab, jobs in self.tab_jobs.items():
+            for job in jobs:
+                if job in active or background or job in alert_sources:
+                    self.sampler.resume(job)
+                else:
+                    self.sampler.pause(job)
     
     # Método para crear un frame con scroll
     def create_scrollable_frame(self, parent):
@@ -81,39 +410,63 @@ class SystemInfoApp:
     # Método para crear pestaña de información del sistema
     def create_system_tab(self, parent):
         frame = self.create_scrollable_frame(parent)
-        self.add_section(frame, "Información del Sistema Operativo", [
+        # Los datos de las consultas lentas llegan del inventario de hardware
+        loading = "Cargando..."
+        labels = self.add_section(frame, "Información del Sistema Operativo", [
             ("Sistema", platform.system()),
             ("Versión", platform.version()),
-            ("Edición", self.get_pc_manufacturer()),
+            ("Edición", loading),
             ("Arquitectura", f"{platform.machine()} ({platform.architecture()[0]})"),
             ("Hostname", socket.gethostname()),
-            ("Usuario", os.getlogin()),
-            ("Hora de inicio", datetime.fromtimestamp(psutil.boot_time()).strftime("%d-%m-%Y %H:%M:%S"))
+            ("Usuario", collector.get_login_user()),
+            ("Hora de inicio", loading)
         ])
+        self.bind_inventory(labels, {"Edición": "manufacturer"})
+        # Arranque, memoria total y batería llegan con las instantáneas "host" del muestreo
+        self.system_labels = {"Hora de inicio": labels["Hora de inicio"]}
         
-        self.add_section(frame, "Hardware", [
-            ("Fabricante", self.get_pc_manufacturer()),
-            ("Modelo del equipo", self.get_pc_model()),
-            ("Placa base", self.get_motherboard_info()),
-            ("Memoria Total", self.format_size(psutil.virtual_memory().total)),
-            ("Módulos RAM", self.get_ram_type()),
-            ("GPU", self.get_gpu_info()),
-            ("Batería", self.get_battery_status())
+        labels = self.add_section(frame, "Hardware", [
+            ("Fabricante", loading),
+            ("Modelo del equipo", loading),
+            ("Placa base", loading),
+            ("Memoria Total", loading),
+            ("Módulos RAM", loading),
+            ("GPU", loading),
+            ("Batería", loading)
         ])
+        self.system_labels["Memoria Total"] = labels["Memoria Total"]
+        self.system_labels["Batería"] = labels["Batería"]
+        self.bind_inventory(labels, {
+            "Fabricante": "manufacturer",
+            "Modelo del equipo": "model",
+            "Placa base": "motherboard",
+            "Módulos RAM": "ram_modules",
+            "GPU": "gpu"
+        })
+    
+    # Método para actualizar el arranque, la memoria total y la batería
+    def update_system_info(self, snapshot):
+        self.system_labels["Hora de inicio"].config(
+            text=datetime.fromtimestamp(snapshot.boot_time).strftime("%d-%m-%Y %H:%M:%S"))
+        self.system_labels["Memoria Total"].config(text=self.format_size(snapshot.memory_total))
+        self.system_labels["Batería"].config(text=snapshot.battery)
     
     # Método para crear pestaña de información del CPU
     def create_cpu_tab(self, parent):
         frame = self.create_scrollable_frame(parent)
         
-        # Sección de información estática del CPU
-        self.add_section(frame, "Información del Procesador", [
-            ("Modelo", cpuinfo.get_cpu_info()['brand_raw']),
-            ("Núcleos físicos", psutil.cpu_count(logical=False)),
-            ("Núcleos lógicos", psutil.cpu_count(logical=True)),
-            ("Frecuencia máxima", f"{psutil.cpu_freq().max:.2f} MHz"),
-            ("Frecuencia actual", f"{psutil.cpu_freq().current:.2f} MHz"),
-            ("Arquitectura", cpuinfo.get_cpu_info()['arch'])
+        # Sección de información estática del CPU (modelo y arquitectura llegan del inventario;
+        # núcleos y frecuencias, con las instantáneas "host" del muestreo)
+        labels = self.add_section(frame, "Información del Procesador", [
+            ("Modelo", "Cargando..."),
+            ("Núcleos físicos", "Cargando..."),
+            ("Núcleos lógicos", "Cargando..."),
+            ("Frecuencia máxima", "Cargando..."),
+            ("Frecuencia actual", "Cargando..."),
+            ("Arquitectura", "Cargando...")
         ])
+        self.bind_inventory(labels, {"Modelo": "cpu_model", "Arquitectura": "cpu_arch"})
+        self.cpu_static_labels = labels
         
         # Sección dinámica de estadísticas en tiempo real
         dynamic_frame = ttk.LabelFrame(frame, text="Estadísticas en Tiempo Real")
@@ -143,160 +496,436 @@ class SystemInfoApp:
             style="green.Horizontal.TProgressbar"
         )
         self.cpu_progress.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=5)
+        # La actualización en tiempo real llega desde el hilo de muestreo ("cpu")
         
-        # Iniciar la actualización en tiempo real
-        self.update_cpu_info()
-
-    # Método para obtener información de la placa base
-    def get_motherboard_info(self):
-        try:
-            if platform.system() == "Windows":
-                import wmi
-                c = wmi.WMI()
-                board = c.Win32_BaseBoard()[0]
-                return f"{board.Manufacturer} {board.Product}" # Fabricante y modelo
-            else:
-                vendor = open("/sys/devices/virtual/dmi/id/board_vendor").read().strip()
-                name = open("/sys/devices/virtual/dmi/id/board_name").read().strip()
-                return f"{vendor} {name}"
-        except Exception as e:
-            return "No disponible"
+        # Sensores de temperatura y ventiladores agrupados por chip
+        sensors_frame = ttk.LabelFrame(frame, text="Sensores")
+        sensors_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        self.sensors_tree = ttk.Treeview(sensors_frame, columns=("value", "high", "critical"), show='tree headings', height=8)
+        self.sensors_tree.heading("#0", text="Sensor")
+        self.sensors_tree.column("#0", width=220)
+        for key, text in (("value", "Valor"), ("high", "Alto"), ("critical", "Crítico")):
+            self.sensors_tree.heading(key, text=text)
+            self.sensors_tree.column(key, width=90, anchor=tk.CENTER)
+        self.sensors_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
         
-    # Método para obtener información de los módulos de RAM
-    def get_ram_type(self):
-        try:
-            if platform.system() == "Windows":
-                import wmi
-                c = wmi.WMI()
-                rams = c.Win32_PhysicalMemory() # Lista de módulos de RAM
-                return "\n".join([f"Módulo {i+1}: {ram.Capacity} bytes {ram.Speed}MHz" 
-                                for i, ram in enumerate(rams)]) # Mostrar capacidad y velocidad de los módulos encontrados
-            else:
-                import subprocess
-                result = subprocess.run(["dmidecode", "--type", "memory"], 
-                                    capture_output=True, text=True)
-                return result.stdout
-        except:
-            return "No disponible"
+        # Historial de uso total y por núcleo
+        history_frame = self.add_history_section(frame, "Historial (10 minutos)", [
+            ("cpu", "CPU total", 100.0, None)
+        ])
+        # Las gráficas por núcleo se crean con la primera instantánea "cpu", que dice cuántos hay
+        self.cpu_cores_frame = ttk.Frame(history_frame)
+        self.cpu_cores_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        self.cpu_core_charts = 0
+        for column in range(CORE_CHART_COLUMNS):
+            self.cpu_cores_frame.grid_columnconfigure(column, weight=1)
+    
+    # Método para añadir las gráficas de los núcleos que aún no tienen
+    def add_core_charts(self, count):
+        for core in range(self.cpu_core_charts, count):
+            chart = self.add_sparkline(self.cpu_cores_frame, f"cpu{core}", f"Núcleo {core}", width=120, height=30)
+            chart.grid(row=core // CORE_CHART_COLUMNS, column=core % CORE_CHART_COLUMNS, sticky="ew", padx=1, pady=1)
+        self.cpu_core_charts = max(self.cpu_core_charts, count)
+    
+    # Método para actualizar los núcleos y las frecuencias del procesador
+    def update_cpu_static(self, snapshot):
+        labels = self.cpu_static_labels
+        labels["Núcleos físicos"].config(text=snapshot.physical_cores if snapshot.physical_cores is not None else "No disponible")
+        labels["Núcleos lógicos"].config(text=snapshot.logical_cores if snapshot.logical_cores is not None else "No disponible")
+        labels["Frecuencia máxima"].config(text=self.format_freq(snapshot.max_freq))
+        labels["Frecuencia actual"].config(text=self.format_freq(snapshot.current_freq))
 
-    # Método para obtener información de la GPU
-    def get_gpu_info(self):
-        try:
-            if platform.system() == "Windows":
-                import wmi
-                c = wmi.WMI()
-                gpu_info = []
-                for gpu in c.Win32_VideoController():
-                    gpu_info.append(gpu.Name.strip())
-                return ", ".join(gpu_info)
-            else:
-                import subprocess
-                result = subprocess.run(["lspci", "-nn"], capture_output=True, text=True)
-                gpus = [line.split(': ')[-1] for line in result.stdout.split('\n') if 'VGA' in line]
-                return ", ".join(gpus)
-        except:
-            return "No disponible"
-    
-    # Método para actualizar la información de CPU en tiempo real
-    def update_cpu_info(self):
+    # Método para actualizar la información de CPU en tiempo real a partir de una instantánea
+    def update_cpu_info(self, snapshot):
+        if len(snapshot.per_core) > self.cpu_core_charts:
+            self.add_core_charts(len(snapshot.per_core))
         # Actualizar uso actual de CPU
-        current_usage = psutil.cpu_percent(interval=0.5)
+        current_usage = snapshot.usage
         self.cpu_usage_label.config(text=f"Uso actual: {current_usage}%")
         
         # Actualizar uso por núcleo
-        core_usages = psutil.cpu_percent(percpu=True)
-        cores_text = ", ".join([f"{usage}%" for usage in core_usages])
+        cores_text = ", ".join([f"{usage}%" for usage in snapshot.per_core])
         self.cpu_cores_label.config(text=f"Uso por núcleo: {cores_text}")
         
-        # Actualizar temperatura (si está disponible)
-        temp = self.get_cpu_temperature()
-        self.cpu_temperature_label.config(text=f"Temperatura: {temp}")
-        
         # Actualizar promedio de carga según el sistema
-        if hasattr(psutil, "getloadavg"):
-            load_avg = "/".join([f"{x:.2f}" for x in psutil.getloadavg()])
+        if snapshot.load_avg is not None:
+            load_avg = "/".join([f"{x:.2f}" for x in snapshot.load_avg])
         else:
             load_avg = "No disponible en Windows"
         self.cpu_load_label.config(text=f"Promedio de carga: {load_avg}")
         
         # Actualizar la barra de progreso
         self.cpu_progress['value'] = current_usage
-        
-        # Programar la siguiente actualización en 1000 ms (1 segundo)
-        self.root.after(1000, self.update_cpu_info)
+    
+    # Método para mostrar las lecturas de los sensores: cada sensor es una fila con su clave
+    # como id, así que sólo se reescriben las que cambian
+    def update_sensors(self, snapshot):
+        if snapshot.cpu_temperature is not None:
+            temperature = f"{snapshot.cpu_temperature:.1f}°C"
+        elif snapshot.readings:
+            temperature = "N/A"
+        else:
+            temperature = "No hay sensores disponibles"
+        self.cpu_temperature_label.config(text=f"Temperatura: {temperature}")
+        tree = self.sensors_tree
+        keys = {reading.key for reading in snapshot.readings}
+        chips = {key.split("/")[0] for key in keys}
+        gone = [item for item in tree.get_children() if item not in chips]
+        gone += [item for chip in tree.get_children() if chip in chips for item in tree.get_children(chip) if item not in keys]
+        if gone:
+            tree.delete(*gone)
+        for reading in snapshot.readings:
+            chip = reading.key.split("/")[0]
+            if not tree.exists(chip):
+                tree.insert('', tk.END, iid=chip, text=reading.chip, open=True)
+            if reading.kind == "temp":
+                value_format = lambda value: "-" if value is None else f"{value:.1f}°C"
+            else:
+                value_format = lambda value: "-" if value is None else f"{value:.0f} rpm"
+            values = (value_format(reading.value), value_format(reading.high), value_format(reading.critical))
+            if tree.exists(reading.key):
+                if tuple(str(value) for value in tree.item(reading.key, 'values')) != values:
+                    tree.item(reading.key, values=values)
+            else:
+                tree.insert(chip, tk.END, iid=reading.key, text=reading.label, values=values)
+    
+    # Método para guardar en el historial el uso de CPU total y por núcleo
+    def record_cpu_history(self, snapshot):
+        self.history.append("cpu", snapshot.usage)
+        for core, usage in enumerate(snapshot.per_core):
+            self.history.append(f"cpu{core}", usage)
+    
+    # Método para guardar en el historial el uso de memoria y swap
+    def record_memory_history(self, snapshot):
+        self.history.append("memory", snapshot.percent)
+        self.history.append("swap", snapshot.swap_percent)
+    
+    # Método para guardar en el historial las tasas totales de E/S de disco y red
+    def record_io_history(self, snapshot):
+        if snapshot.disk_total:
+            self.history.append("disk_read_bytes", snapshot.disk_total.read_bytes)
+            self.history.append("disk_write_bytes", snapshot.disk_total.write_bytes)
+        if snapshot.net_total:
+            self.history.append("net_bytes_sent", snapshot.net_total.bytes_sent)
+            self.history.append("net_bytes_recv", snapshot.net_total.bytes_recv)
+    
+    # Método para actualizar la tabla de actividad por disco
+    def update_disk_rates(self, snapshot):
+        self.update_rate_table(self.disk_rate_tree, [
+            (disk.name, (disk.name, self.format_rate(disk.read_bytes), self.format_rate(disk.write_bytes),
+                         f"{disk.read_iops:.0f}", f"{disk.write_iops:.0f}"))
+            for disk in snapshot.disks
+        ])
+    
+    # Método para actualizar la tabla de tráfico por interfaz
+    def update_nic_rates(self, snapshot):
+        self.update_rate_table(self.nic_rate_tree, [
+            (nic.name, (nic.name, self.format_rate(nic.bytes_recv), self.format_rate(nic.bytes_sent),
+                        f"{nic.packets_recv:.0f}", f"{nic.packets_sent:.0f}"))
+            for nic in snapshot.nics
+        ])
+    
+    # Método para crear una tabla de tasas por dispositivo
+    def create_rate_table(self, parent, title, columns):
+        frame = ttk.LabelFrame(parent, text=title)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        tree = ttk.Treeview(frame, columns=[key for key, text in columns], show='headings', height=5)
+        for key, text in columns:
+            tree.heading(key, text=text)
+            tree.column(key, width=100, anchor=tk.CENTER, stretch=True)
+        tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        return tree
+    
+    # Método para actualizar una tabla de tasas: el nombre del dispositivo es el id de la fila,
+    # así que los dispositivos nuevos se añaden y los que desaparecen se borran
+    def update_rate_table(self, tree, rows):
+        names = {name for name, values in rows}
+        gone = [item for item in tree.get_children() if item not in names]
+        if gone:
+            tree.delete(*gone)
+        for name, values in rows:
+            if tree.exists(name):
+                if tuple(str(value) for value in tree.item(name, 'values')) != values:
+                    tree.item(name, values=values)
+            else:
+                tree.insert('', tk.END, iid=name, values=values)
     
     # Método para crear pestaña de información de memoria
     def create_memory_tab(self, parent):
         frame = self.create_scrollable_frame(parent)
-        mem = psutil.virtual_memory()
-        swap = psutil.swap_memory()
+        # Los valores llegan con las instantáneas "memory" del muestreo
+        loading = "Cargando..."
+        self.memory_labels = self.add_section(frame, "Memoria Principal", [
+            ("Total", loading),
+            ("Disponible", loading),
+            ("En uso", loading)
+        ])
         
-        self.add_section(frame, "Memoria Principal", [
-            ("Total", self.format_size(mem.total)),
-            ("Disponible", self.format_size(mem.available)),
-            ("En uso", f"{self.format_size(mem.used)} ({mem.percent}%)")
+        self.swap_labels = self.add_section(frame, "Memoria Swap", [
+            ("Total", loading),
+            ("En uso", loading),
+            ("Libre", loading)
         ])
         
-        self.add_section(frame, "Memoria Swap", [
-            ("Total", self.format_size(swap.total)),
-            ("En uso", f"{self.format_size(swap.used)} ({swap.percent}%)"),
-            ("Libre", self.format_size(swap.free))
+        self.memory_bars = self.add_progress_bars(frame, [
+            ("Uso de memoria", 0),
+            ("Uso de swap", 0)
         ])
         
-        self.add_progress_bars(frame, [
-            ("Uso de memoria", mem.percent),
-            ("Uso de swap", swap.percent)
+        self.add_history_section(frame, "Historial (10 minutos)", [
+            ("memory", "Memoria", 100.0, None),
+            ("swap", "Swap", 100.0, None)
         ])
     
+    # Método para actualizar la memoria y la swap a partir de una instantánea
+    def update_memory_info(self, snapshot):
+        self.memory_labels["Total"].config(text=self.format_size(snapshot.total))
+        self.memory_labels["Disponible"].config(text=self.format_size(snapshot.available))
+        self.memory_labels["En uso"].config(text=f"{self.format_size(snapshot.used)} ({snapshot.percent}%)")
+        self.swap_labels["Total"].config(text=self.format_size(snapshot.swap_total))
+        self.swap_labels["En uso"].config(text=f"{self.format_size(snapshot.swap_used)} ({snapshot.swap_percent}%)")
+        self.swap_labels["Libre"].config(text=self.format_size(snapshot.swap_free))
+        self.memory_bars["Uso de memoria"]['value'] = snapshot.percent
+        self.memory_bars["Uso de swap"]['value'] = snapshot.swap_percent
+    
     # Método para crear pestaña de información de discos
     def create_disk_tab(self, parent):
         frame = self.create_scrollable_frame(parent)
-        partitions = psutil.disk_partitions()
         
-        for part in partitions:
-            if part.fstype:
-                usage = psutil.disk_usage(part.mountpoint)
-                self.add_section(frame, f"Disco: {part.device}", [
+        # Particiones: se rellenan con las instantáneas "disks" del muestreo,
+        # así un montaje de red colgado no bloquea la interfaz
+        self.disk_partitions_frame = ttk.Frame(frame)
+        self.disk_partitions_frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(self.disk_partitions_frame, text="Cargando...").pack(padx=5, pady=5)
+        self.disk_partition_keys = None
+        self.disk_partition_widgets = []
+                
+        self.disk_rate_tree = self.create_rate_table(frame, "Actividad en tiempo real", [
+            ('device', 'Disco'), ('read', 'Lectura/s'), ('write', 'Escritura/s'),
+            ('read_iops', 'Lecturas (IOPS)'), ('write_iops', 'Escrituras (IOPS)')
+        ])
+        self.add_history_section(frame, "Historial de actividad (10 minutos)", [
+            ("disk_read_bytes", "Lectura", None, self.format_rate),
+            ("disk_write_bytes", "Escritura", None, self.format_rate)
+        ])
+                
+        # Actividad del disco (totales desde el arranque)
+        self.disk_io_labels = self.add_section(frame, "Actividad del Disco desde el arranque", [
+            ("Lecturas", "Cargando..."),
+            ("Escrituras", "Cargando..."),
+            ("Datos leídos", "Cargando..."),
+            ("Datos escritos", "Cargando...")
+        ])
+    
+    # Método para actualizar el uso de las particiones
+    def update_disk_usage(self, snapshot):
+        partitions = snapshot.partitions
+        # Las secciones sólo se vuelven a crear si cambian los montajes
+        keys = tuple((part.device, part.mountpoint) for part in partitions)
+        if keys != self.disk_partition_keys:
+            for child in self.disk_partitions_frame.winfo_children():
+                child.destroy()
+            self.disk_partition_widgets = []
+            for part in partitions:
+                labels = self.add_section(self.disk_partitions_frame, f"Disco: {part.device}", [
                     ("Punto de montaje", part.mountpoint),
                     ("Tipo de sistema", part.fstype),
-                    ("Espacio total", self.format_size(usage.total)),
-                    ("En uso", f"{self.format_size(usage.used)} ({usage.percent}%)"),
-                    ("Libre", self.format_size(usage.free))
-                ])
-                self.add_progress_bars(frame, [
-                    (f"Uso de {part.device}", usage.percent)
+                    ("Estado", ""),
+                    ("Espacio total", ""),
+                    ("En uso", ""),
+                    ("Libre", "")
                 ])
-                
-        # Actividad del disco
-        io = psutil.disk_io_counters()
-        self.add_section(frame, "Actividad del Disco", [
-            ("Lecturas", f"{io.read_count} operaciones"),
-            ("Escrituras", f"{io.write_count} operaciones"),
-            ("Datos leídos", self.format_size(io.read_bytes)),
-            ("Datos escritos", self.format_size(io.write_bytes))
-        ])
+                bar_text = f"Uso de {part.device}"
+                bars = self.add_progress_bars(self.disk_partitions_frame, [(bar_text, 0)])
+                self.disk_partition_widgets.append((labels, bars[bar_text]))
+            self.disk_partition_keys = keys
+        
+        for part, (labels, bar) in zip(partitions, self.disk_partition_widgets):
+            if part.state == "ok":
+                state = "Correcto"
+            elif part.state == "error":
+                state = "Error al consultar"
+            elif part.total is not None:
+                state = f"Sin respuesta (datos de hace {part.age:.0f} s)"
+            else:
+                state = "Sin respuesta"
+            labels["Estado"].config(text=state, foreground="" if part.state == "ok" else "red")
+            if part.total is None:
+                for text in ("Espacio total", "En uso", "Libre"):
+                    labels[text].config(text="No disponible")
+                bar['value'] = 0
+            else:
+                labels["Espacio total"].config(text=self.format_size(part.total))
+                labels["En uso"].config(text=f"{self.format_size(part.used)} ({part.percent}%)")
+                labels["Libre"].config(text=self.format_size(part.free))
+                bar['value'] = part.percent
+        
+        io = snapshot.io
+        if io is not None:
+            self.disk_io_labels["Lecturas"].config(text=f"{io.read_count} operaciones")
+            self.disk_io_labels["Escrituras"].config(text=f"{io.write_count} operaciones")
+            self.disk_io_labels["Datos leídos"].config(text=self.format_size(io.read_bytes))
+            self.disk_io_labels["Datos escritos"].config(text=self.format_size(io.write_bytes))
     
     # Método para crear pestaña de información de red
     def create_network_tab(self, parent):
         frame = self.create_scrollable_frame(parent)
-        interfaces = psutil.net_if_addrs()
-        stats = psutil.net_io_counters(pernic=True)
         
-        for intf, addrs in interfaces.items():
-            # Obtener dirección MAC según el sistema operativo
-            if platform.system() == "Windows":
-                mac = next((addr.address for addr in addrs if addr.family == psutil.AF_LINK), "N/A")
-            else:
-                mac = next((addr.address for addr in addrs if addr.family == socket.AF_PACKET), "N/A")
-            
-            self.add_section(frame, f"Interfaz: {intf}", [
-                ("Dirección IP", next((addr.address for addr in addrs if addr.family == socket.AF_INET), "N/A")),
-                ("MAC", mac),
-                ("Bytes enviados", self.format_size(stats[intf].bytes_sent)),
-                ("Bytes recibidos", self.format_size(stats[intf].bytes_recv)),
-                ("Paquetes enviados", stats[intf].packets_sent),
-                ("Paquetes recibidos", stats[intf].packets_recv)
-            ])
+        self.nic_rate_tree = self.create_rate_table(frame, "Tráfico en tiempo real", [
+            ('interface', 'Interfaz'), ('recv', 'Recibido/s'), ('sent', 'Enviado/s'),
+            ('packets_recv', 'Paquetes recibidos/s'), ('packets_sent', 'Paquetes enviados/s')
+        ])
+        self.add_history_section(frame, "Historial de tráfico (10 minutos)", [
+            ("net_bytes_recv", "Recibido", None, self.format_rate),
+            ("net_bytes_sent", "Enviado", None, self.format_rate)
+        ])
+        self.create_connections_section(frame)
+        
+        # Interfaces: se rellenan con las instantáneas "network" del muestreo
+        self.network_interfaces_frame = ttk.Frame(frame)
+        self.network_interfaces_frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(self.network_interfaces_frame, text="Cargando...").pack(padx=5, pady=5)
+        self.network_interface_names = None
+        self.network_interface_labels = []
+    
+    # Método para actualizar las direcciones y contadores de las interfaces de red
+    def update_network_interfaces(self, snapshot):
+        interfaces = snapshot.interfaces
+        # Las secciones sólo se vuelven a crear si cambian las interfaces
+        names = tuple(intf.name for intf in interfaces)
+        if names != self.network_interface_names:
+            for child in self.network_interfaces_frame.winfo_children():
+                child.destroy()
+            self.network_interface_labels = [
+                self.add_section(self.network_interfaces_frame, f"Interfaz: {name}", [
+                    ("Dirección IP", ""),
+                    ("MAC", ""),
+                    ("Bytes enviados", ""),
+                    ("Bytes recibidos", ""),
+                    ("Paquetes enviados", ""),
+                    ("Paquetes recibidos", "")
+                ])
+                for name in names
+            ]
+            self.network_interface_names = names
+        for intf, labels in zip(interfaces, self.network_interface_labels):
+            labels["Dirección IP"].config(text=intf.ip)
+            labels["MAC"].config(text=intf.mac)
+            labels["Bytes enviados"].config(text=self.format_size(intf.bytes_sent))
+            labels["Bytes recibidos"].config(text=self.format_size(intf.bytes_recv))
+            labels["Paquetes enviados"].config(text=intf.packets_sent)
+            labels["Paquetes recibidos"].config(text=intf.packets_recv)
+    
+    # Método para crear la sección de conexiones: resumen por proceso y listado paginado
+    def create_connections_section(self, parent):
+        section = ttk.LabelFrame(parent, text="Conexiones")
+        section.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        self.connections_summary = ttk.Label(section, text="Cargando...", anchor="w", wraplength=600, justify=tk.LEFT)
+        self.connections_summary.pack(anchor="w", padx=5, pady=2)
+        
+        # Procesos con más conexiones; al seleccionar uno se filtra el listado
+        columns = [("pid", "PID", 70), ("name", "Proceso", 160), ("total", "Total", 70)]
+        columns += [(state, state, 100) for state in CONNECTION_STATES] + [("other", "Otros", 70)]
+        self.connections_process_tree = ttk.Treeview(section, columns=[key for key, text, width in columns],
+                                                     show='headings', height=6)
+        for key, text, width in columns:
+            self.connections_process_tree.heading(key, text=text)
+            self.connections_process_tree.column(key, width=width, anchor=tk.W if key == "name" else tk.CENTER)
+        self.connections_process_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        self.connections_process_tree.bind("<<TreeviewSelect>>", self.on_connections_filter_change)
+        
+        filter_frame = ttk.Frame(section)
+        filter_frame.pack(fill=tk.X, padx=5, pady=2)
+        ttk.Label(filter_frame, text="Estado:").pack(side=tk.LEFT, padx=5)
+        self.connections_state_var = tk.StringVar(value="Todos")
+        self.connections_state_combo = ttk.Combobox(filter_frame, textvariable=self.connections_state_var,
+                                                    values=["Todos"], state="readonly", width=14)
+        self.connections_state_combo.pack(side=tk.LEFT, padx=5)
+        self.connections_state_combo.bind("<<ComboboxSelected>>", self.on_connections_filter_change)
+        ttk.Button(filter_frame, text="Todos los procesos", command=self.clear_connections_process).pack(side=tk.LEFT, padx=5)
+        ttk.Button(filter_frame, text="Siguiente ▶", command=lambda: self.move_connections_page(1)).pack(side=tk.RIGHT, padx=5)
+        ttk.Button(filter_frame, text="◀ Anterior", command=lambda: self.move_connections_page(-1)).pack(side=tk.RIGHT, padx=5)
+        self.connections_page_label = ttk.Label(filter_frame, text="")
+        self.connections_page_label.pack(side=tk.RIGHT, padx=5)
+        
+        columns = (("proto", "Protocolo", 70), ("local", "Dirección local", 180), ("remote", "Dirección remota", 180),
+                   ("state", "Estado", 100), ("pid", "PID", 70), ("name", "Proceso", 140))
+        self.connections_tree = ttk.Treeview(section, columns=[key for key, text, width in columns], show='headings', height=12)
+        for key, text, width in columns:
+            self.connections_tree.heading(key, text=text)
+            self.connections_tree.column(key, width=width, anchor=tk.CENTER if key in ("proto", "state", "pid") else tk.W)
+        self.connections_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        self.connections_offset = 0
+        self.connections_matches = 0
+    
+    # Método para mostrar los recuentos de conexiones y la página actual del listado
+    def update_connections(self, snapshot):
+        states = ", ".join(f"{state} {count}" for state, count in snapshot.states) or "ninguna"
+        self.connections_summary.config(text=(
+            f"{snapshot.total} conexiones TCP/UDP ({states}). "
+            f"{snapshot.unowned} sin proceso conocido (TIME_WAIT o de otros usuarios sin permisos)."
+        ))
+        state_values = ["Todos"] + [state for state, count in snapshot.states]
+        if list(self.connections_state_combo.cget("values")) != state_values:
+            self.connections_state_combo.config(values=state_values)
+        rows = []
+        for process in snapshot.processes[:CONNECTION_PROCESSES]:
+            counts = dict(process.states)
+            values = [str(process.pid), process.name, str(process.total)]
+            values += [str(counts.pop(state, 0)) for state in CONNECTION_STATES]
+            values.append(str(sum(counts.values())))
+            rows.append((str(process.pid), tuple(values)))
+        tree = self.connections_process_tree
+        self.update_rate_table(tree, rows)
+        order = tuple(item for item, values in rows)
+        if tree.get_children() != order:
+            for index, item in enumerate(order):
+                tree.move(item, "", index)
+        self.show_connections_page()
+    
+    # Método para descodificar y mostrar sólo la página visible del listado
+    def show_connections_page(self):
+        snapshot = self.last_snapshots.get("connections")
+        if snapshot is None:
+            return
+        selection = self.connections_process_tree.selection()
+        pid = int(selection[0]) if selection else connections.ANY_PID
+        state = self.connections_state_var.get()
+        state = None if state == "Todos" else state
+        matches, rows = connections.page(snapshot, self.connections_offset, CONNECTIONS_PAGE_SIZE, pid, state)
+        if rows or not matches:
+            self.connections_matches = matches
+        else:
+            # La página ya no existe (hay menos conexiones): volver a la última
+            self.connections_offset = (matches - 1) // CONNECTIONS_PAGE_SIZE * CONNECTIONS_PAGE_SIZE
+            return self.show_connections_page()
+        tree = self.connections_tree
+        items = tree.get_children()
+        values = [(row.proto, row.local, row.remote, row.state, "-" if row.pid is None else row.pid, row.name or "-")
+                  for row in rows]
+        # Se reutilizan las filas existentes y sólo se crean o borran las que sobran
+        for item, row_values in zip(items, values):
+            tree.item(item, values=row_values)
+        for row_values in values[len(items):]:
+            tree.insert("", tk.END, values=row_values)
+        if len(items) > len(values):
+            tree.delete(*items[len(values):])
+        first = self.connections_offset + 1 if values else 0
+        self.connections_page_label.config(text=f"{first}-{self.connections_offset + len(values)} de {matches}")
+    
+    def move_connections_page(self, step):
+        offset = self.connections_offset + step * CONNECTIONS_PAGE_SIZE
+        if 0 <= offset < self.connections_matches:
+            self.connections_offset = offset
+            self.show_connections_page()
+    
+    def on_connections_filter_change(self, event=None):
+        self.connections_offset = 0
+        self.show_connections_page()
+    
+    def clear_connections_process(self):
+        self.connections_process_tree.selection_remove(self.connections_process_tree.selection())
+        self.on_connections_filter_change()
     
     def create_process_tab(self, parent):
         frame = self.create_scrollable_frame(parent)
@@ -306,28 +935,67 @@ class SystemInfoApp:
         control_frame.pack(fill=tk.X, pady=5)
         
         # Botón de actualizar
-        refresh_btn = ttk.Button(control_frame, text="Actualizar", command=self.update_process_list)
+        refresh_btn = ttk.Button(control_frame, text="Actualizar", command=lambda: self.sampler.trigger("processes"))
         refresh_btn.pack(side=tk.LEFT, padx=5)
         
         # Botón de terminar proceso
         self.kill_btn = ttk.Button(control_frame, text="Terminar proceso", state=tk.DISABLED, command=self.terminate_process)
         self.kill_btn.pack(side=tk.LEFT, padx=5)
         
+        # Proceso seleccionado (la lista virtual lo conserva aunque su fila salga de la ventana)
+        self.process_selection_label = ttk.Label(control_frame, text="")
+        self.process_selection_label.pack(side=tk.LEFT, padx=5)
+        
+        # Modo de vista: lista virtual (sólo se crean en Tk las filas visibles),
+        # lista completa o árbol por proceso padre
+        self.process_view_modes = {"Lista virtual": "virtual", "Lista completa": "keyed", "Árbol": "tree"}
+        self.process_view_var = tk.StringVar(value="Lista virtual")
+        view_combo = ttk.Combobox(control_frame, textvariable=self.process_view_var, values=list(self.process_view_modes), state="readonly", width=13)
+        view_combo.pack(side=tk.LEFT, padx=5)
+        view_combo.bind("<<ComboboxSelected>>", lambda e: self.on_process_view_change())
+        
+        # Columnas de detalle: para todos los procesos o sólo para los N con más CPU, memoria o E/S
+        details = self.process_cache.details
+        current = (details.top_n, details.metric) if details.enabled else None
+        self.process_detail_var = tk.StringVar(value=next(
+            (label for label, mode in PROCESS_DETAIL_MODES.items() if mode == current), "Sin detalle"))
+        detail_combo = ttk.Combobox(control_frame, textvariable=self.process_detail_var, values=list(PROCESS_DETAIL_MODES), state="readonly", width=18)
+        detail_combo.pack(side=tk.LEFT, padx=5)
+        detail_combo.bind("<<ComboboxSelected>>", lambda e: self.on_process_detail_change())
+        
+        # Filtros por usuario y por texto (nombre o PID)
+        self.process_user_var = tk.StringVar(value="Todos")
+        self.process_user_combo = ttk.Combobox(control_frame, textvariable=self.process_user_var, values=["Todos"], state="readonly", width=12)
+        self.process_user_combo.pack(side=tk.RIGHT, padx=5)
+        self.process_user_combo.bind("<<ComboboxSelected>>", lambda e: self.on_process_filter_change())
+        ttk.Label(control_frame, text="Usuario:").pack(side=tk.RIGHT)
+        self.process_filter_var = tk.StringVar()
+        self.process_filter_var.trace_add("write", lambda *args: self.on_process_filter_change())
+        ttk.Entry(control_frame, textvariable=self.process_filter_var, width=15).pack(side=tk.RIGHT, padx=5)
+        ttk.Label(control_frame, text="Filtro:").pack(side=tk.RIGHT)
+        
         # Treeview para mostrar procesos
-        self.process_tree = ttk.Treeview(frame, columns=('pid', 'name', 'status', 'cpu', 'memory', 'user'), show='headings')
+        self.process_tree = ttk.Treeview(frame, columns=BASE_COLUMNS + DETAIL_COLUMNS, show='headings')
         
         # Columnas de los procesos mostrados
         columns = {
             'pid': {'text': 'PID', 'width': 70, 'stretch': False},
             'name': {'text': 'Nombre', 'width': 150, 'stretch': True},  # Esta columna se expandirá
             'status': {'text': 'Estado', 'width': 100, 'stretch': False},
-            'cpu': {'text': 'CPU%', 'width': 80, 'stretch': False},
-            'memory': {'text': 'Memoria%', 'width': 90, 'stretch': False},
-            'user': {'text': 'Usuario', 'width': 100, 'stretch': False}
+            'cpu': {'text': 'CPU%', 'tree_text': 'CPU% subárbol', 'width': 80, 'stretch': False},
+            'memory': {'text': 'Memoria%', 'tree_text': 'RSS subárbol', 'width': 90, 'stretch': False},
+            'user': {'text': 'Usuario', 'width': 100, 'stretch': False},
+            'read_rate': {'text': 'Lectura/s', 'width': 90, 'stretch': False},
+            'write_rate': {'text': 'Escritura/s', 'width': 90, 'stretch': False},
+            'ctx_switches': {'text': 'Cambios ctx/s', 'width': 100, 'stretch': False},
+            'threads': {'text': 'Hilos', 'width': 60, 'stretch': False},
+            'fds': {'text': 'Descriptores', 'width': 90, 'stretch': False}
         }
         
+        self.process_columns = columns
         for col, config in columns.items():
-            self.process_tree.heading(col, text=config['text'])
+            # Al pulsar la cabecera se ordena por esa columna
+            self.process_tree.heading(col, text=config['text'], command=lambda c=col: self.sort_processes(c))
             self.process_tree.column(
                 col, 
                 width=config['width'], 
@@ -335,9 +1003,8 @@ class SystemInfoApp:
                 stretch=config['stretch']  # Habilita la expansión para columnas seleccionadas
             )
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.process_tree.yview)
-        self.process_tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar (su comando lo configura la vista activa)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical")
         
         # Empaquetar
         self.process_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -352,13 +1019,90 @@ class SystemInfoApp:
         self.context_menu.add_command(label="Terminar por narices!!", command=self.kill_process)
         self.process_tree.bind("<Button-3>", self.show_context_menu)
         
-        # Cargar datos iniciales
-        self.update_process_list()
+        # Almacén con todos los procesos y vistas que lo muestran
+        self.process_store = ProcessStore()
+        self.process_views = {
+            "keyed": KeyedProcessView(self.process_tree, scrollbar, self.process_store),
+            "virtual": VirtualProcessView(self.process_tree, scrollbar, self.process_store),
+            "tree": ProcessTreeView(self.process_tree, scrollbar, self.process_store)
+        }
+        self.process_view = self.process_views[self.process_view_modes[self.process_view_var.get()]]
+        self.process_view.attach()
+        self.update_process_columns()
+        # Los datos llegan desde el hilo de muestreo ("processes")
+    
+    # Método para cambiar entre la lista completa, la lista virtual y el árbol
+    def on_process_view_change(self):
+        view = self.process_views[self.process_view_modes[self.process_view_var.get()]]
+        if view is self.process_view:
+            return
+        self.process_view.detach()
+        self.process_view = view
+        self.process_view.attach()
+        self.update_process_columns()
+        self.update_process_headings()
+        self.process_view.refresh()
+        self.update_process_selection()
+
+    # Método para mostrar u ocultar las columnas de detalle
+    def update_process_columns(self):
+        details = DETAIL_COLUMNS if self.process_cache.details.enabled else ()
+        self.process_view.show_columns(BASE_COLUMNS + details)
+
+    # Método para cambiar el modo de las columnas de detalle
+    def on_process_detail_change(self):
+        mode = PROCESS_DETAIL_MODES[self.process_detail_var.get()]
+        if mode is None:
+            self.process_cache.details.configure(False)
+            self.settings["process_details"] = None
+        else:
+            self.process_cache.details.configure(True, *mode)
+            self.settings["process_details"] = {"top": mode[0], "metric": mode[1]}
+        save_settings(self.settings)
+        self.update_process_columns()
+        # Nueva muestra para rellenar las columnas sin esperar al intervalo
+        self.sampler.trigger("processes")
+
+    # Método para ordenar la tabla por una columna (un segundo clic invierte el orden)
+    def sort_processes(self, column):
+        store = self.process_store
+        reverse = not store.sort_reverse if store.sort_column == column else column in ('cpu', 'memory') + DETAIL_COLUMNS
+        store.set_sort(column, reverse)
+        self.update_process_headings()
+        self.process_view.refresh()
+    
+    # Método para poner las cabeceras según la vista y la columna de ordenación
+    def update_process_headings(self):
+        store = self.process_store
+        tree_mode = isinstance(self.process_view, ProcessTreeView)
+        for col, config in self.process_columns.items():
+            # En el árbol, CPU y memoria son los totales de cada subárbol
+            text = config.get('tree_text', config['text']) if tree_mode else config['text']
+            arrow = (" ▼" if store.sort_reverse else " ▲") if col == store.sort_column else ""
+            self.process_tree.heading(col, text=text + arrow)
+    
+    # Método para aplicar los filtros de texto y usuario
+    def on_process_filter_change(self):
+        user = self.process_user_var.get()
+        self.process_store.set_filter(self.process_filter_var.get(), None if user == "Todos" else user)
+        self.process_view.refresh()
+        self.update_process_selection()
 
     # Método para actualizar el estado del botón de terminar proceso
     def on_process_select(self, event):
-        selected = self.process_tree.selection()
-        self.kill_btn['state'] = tk.NORMAL if selected else tk.DISABLED
+        # La vista actualiza su selección en su propio enlace, que se ejecuta después
+        self.root.after_idle(self.update_process_selection)
+
+    # Método para mostrar el proceso seleccionado y activar el botón de terminar
+    def update_process_selection(self):
+        pid = self.process_view.selected_pid()
+        row = self.process_store.row(pid) if pid is not None else None
+        if row is None:
+            self.process_selection_label.config(text="")
+            self.kill_btn['state'] = tk.DISABLED
+        else:
+            self.process_selection_label.config(text=f"Seleccionado: {row.name} (PID {pid})")
+            self.kill_btn['state'] = tk.NORMAL
 
     # Método para mostrar el menú contextual
     def show_context_menu(self, event):
@@ -367,34 +1111,14 @@ class SystemInfoApp:
             self.process_tree.selection_set(item)
             self.context_menu.post(event.x_root, event.y_root)
 
-    def update_process_list(self):
-        # Guardar selección actual
-        selected = self.process_tree.selection()
-        
-        # Limpiar lista
-        for item in self.process_tree.get_children():
-            self.process_tree.delete(item)
-        
-        # Obtener y cargar procesos
-        for proc in psutil.process_iter(['pid', 'name', 'status', 'cpu_percent', 'memory_percent', 'username']):
-            try:
-                self.process_tree.insert('', tk.END, values=(
-                    proc.info['pid'],
-                    proc.info['name'],
-                    proc.info['status'],
-                    f"{proc.info['cpu_percent']:.1f}",
-                    f"{proc.info['memory_percent']:.1f}",
-                    proc.info['username']
-                ))
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        
-        # Restaurar selección si sigue existiendo
-        if selected and self.process_tree.exists(selected):
-            self.process_tree.selection_set(selected)
-        
-        # Programar próxima actualización (5 segundos)
-        self.root.after(5000, self.update_process_list)
+    # Método para actualizar la lista de procesos a partir de una instantánea
+    def update_process_list(self, snapshot):
+        self.process_store.load(snapshot.rows)
+        users = ["Todos"] + self.process_store.users()
+        if list(self.process_user_combo['values']) != users:
+            self.process_user_combo['values'] = users
+        self.process_view.refresh()
+        self.update_process_selection()
 
     # Terminar proceso seleccionado
     def terminate_process(self):
@@ -404,11 +1128,14 @@ class SystemInfoApp:
         self._process_action('kill')
 
     def _process_action(self, action):
-        selected = self.process_tree.selection()
-        if not selected:
+        pid = self.process_view.selected_pid()
+        row = self.process_store.row(pid) if pid is not None else None
+        if row is None:
+            return
+        # Confirmar con el nombre: el proceso puede no estar a la vista en la lista
+        verb = "terminar" if action == 'terminate' else "forzar el cierre de"
+        if not messagebox.askyesno("Confirmar", f"¿Seguro que quieres {verb} el proceso {row.name} (PID {pid})?"):
             return
-        
-        pid = int(self.process_tree.item(selected[0], 'values')[0])
         
         try:
             process = psutil.Process(pid)
@@ -417,12 +1144,540 @@ class SystemInfoApp:
             elif action == 'kill':
                 process.kill()
             
-            # Actualizar lista después de 1 segundo
-            self.root.after(1000, self.update_process_list)
+            # Pedir una nueva muestra de procesos
+            self.sampler.trigger("processes")
             
         except Exception as e:
             tk.messagebox.showerror("Error", f"No se pudo {action} el proceso: {str(e)}")
     
+    # Método para crear pestaña de alertas
+    def create_alerts_tab(self, parent):
+        frame = self.create_scrollable_frame(parent)
+        alert_settings = self.settings.get("alerts", {})
+        
+        options = ttk.LabelFrame(frame, text="Avisos")
+        options.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        self.alert_desktop_var = tk.BooleanVar(value=alert_settings.get("desktop", False))
+        ttk.Checkbutton(options, text="Avisos del escritorio", variable=self.alert_desktop_var,
+                        command=self.save_alert_options).pack(anchor="w", padx=5, pady=2)
+        self.alert_log_var = tk.BooleanVar(value=self.alert_log is not None)
+        ttk.Checkbutton(options, text=f"Guardar en el registro ({alert_settings.get('log_path') or default_log_path()})",
+                        variable=self.alert_log_var, command=self.save_alert_options).pack(anchor="w", padx=5, pady=2)
+        ttk.Label(options, wraplength=500, justify=tk.LEFT, text=(
+            "Las reglas se definen en la sección \"alerts\" del fichero de preferencias."
+        )).pack(anchor="w", padx=5, pady=2)
+        for error in self.alerts.errors:
+            ttk.Label(options, text=f"Regla no válida: {error}", foreground="red", wraplength=500,
+                      justify=tk.LEFT).pack(anchor="w", padx=5, pady=2)
+        
+        rules_frame = ttk.LabelFrame(frame, text="Reglas")
+        rules_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        columns = (("name", "Regla", 150), ("condition", "Condición", 250), ("state", "Estado", 90), ("value", "Valor", 90))
+        self.alert_rules_tree = ttk.Treeview(rules_frame, columns=[key for key, text, width in columns],
+                                             show='headings', height=max(3, min(10, len(self.alerts.rules))))
+        for key, text, width in columns:
+            self.alert_rules_tree.heading(key, text=text)
+            self.alert_rules_tree.column(key, width=width, anchor=tk.W if key == "condition" else tk.CENTER)
+        for index, rule in enumerate(self.alerts.rules):
+            self.alert_rules_tree.insert('', tk.END, iid=str(index), values=(rule.name, rule.describe(), "", ""))
+        self.alert_rules_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        
+        events_frame = ttk.LabelFrame(frame, text="Historial")
+        events_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        self.alert_events_tree = ttk.Treeview(events_frame, columns=("time", "message"), show='headings', height=8)
+        self.alert_events_tree.heading("time", text="Hora")
+        self.alert_events_tree.heading("message", text="Alerta")
+        self.alert_events_tree.column("time", width=140, stretch=False)
+        self.alert_events_tree.column("message", width=400)
+        self.alert_events_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        for event in self.alert_events:
+            self.add_alert_event_row(event)
+        self.update_alert_rules()
+    
+    # Método para mostrar el estado y el último valor de cada regla
+    def update_alert_rules(self):
+        states = {"ok": "Normal", "pending": "Pendiente", "firing": "⚠ Activa"}
+        for index, rule in enumerate(self.alerts.rules):
+            state = self.alerts.state(rule)
+            values = (rule.name, rule.describe(), states[state.state],
+                      "" if state.value is None else f"{state.value:.1f}")
+            if tuple(self.alert_rules_tree.item(str(index), 'values')) != values:
+                self.alert_rules_tree.item(str(index), values=values)
+    
+    def add_alert_event_row(self, event):
+        when = datetime.fromtimestamp(event.timestamp).strftime("%Y-%m-%d %H:%M:%S")
+        self.alert_events_tree.insert('', 0, values=(when, event.message))
+        children = self.alert_events_tree.get_children()
+        if len(children) > self.alert_events.maxlen:
+            self.alert_events_tree.delete(*children[self.alert_events.maxlen:])
+    
+    # Método para guardar las opciones de aviso
+    def save_alert_options(self):
+        alert_settings = self.settings.setdefault("alerts", {})
+        alert_settings["desktop"] = self.alert_desktop_var.get()
+        alert_settings["log"] = self.alert_log_var.get()
+        self.alert_log = AlertLog(alert_settings.get("log_path")) if alert_settings["log"] else None
+        save_settings(self.settings)
+    
+    # Método llamado cuando una regla cambia de estado
+    def on_alert(self, event):
+        self.alert_events.append(event)
+        if self.alert_log is not None:
+            self.alert_log.write(event)
+        if "🔔 Alertas" in self.built_tabs:
+            self.add_alert_event_row(event)
+        if event.state != "firing":
+            return
+        if self.settings.get("alerts", {}).get("desktop") and notify_desktop("Analiza Tu Sistema", event.message):
+            return
+        self.show_toast(event.message)
+    
+    # Método para mostrar un aviso dentro de la aplicación durante unos segundos
+    def show_toast(self, message):
+        if self.alert_toast is not None:
+            self.alert_toast.destroy()
+        toast = tk.Toplevel(self.root)
+        toast.overrideredirect(True)
+        toast.attributes("-topmost", True)
+        ttk.Label(toast, text=f"⚠ {message}", padding=10, background="#fff3cd", wraplength=300).pack()
+        toast.update_idletasks()
+        x = self.root.winfo_rootx() + self.root.winfo_width() - toast.winfo_reqwidth() - 20
+        y = self.root.winfo_rooty() + self.root.winfo_height() - toast.winfo_reqheight() - 20
+        toast.geometry(f"+{max(0, x)}+{max(0, y)}")
+        self.root.bell()
+        self.alert_toast = toast
+        toast.after(6000, lambda: self.close_toast(toast))
+    
+    def close_toast(self, toast):
+        if self.alert_toast is toast:
+            self.alert_toast = None
+        toast.destroy()
+    
+    # Método para crear pestaña de grabación y reproducción de métricas
+    def create_recording_tab(self, parent):
+        frame = self.create_scrollable_frame(parent)
+        
+        section = ttk.LabelFrame(frame, text="Grabación")
+        section.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        self.recording_var = tk.BooleanVar(value=self.recorder is not None)
+        ttk.Checkbutton(section, text="Grabar métricas en disco", variable=self.recording_var,
+                        command=self.toggle_recording).pack(anchor="w", padx=5, pady=2)
+        self.recording_status = ttk.Label(section, text="", anchor="w")
+        self.recording_status.pack(anchor="w", padx=5, pady=2)
+        ttk.Label(section, text=f"Carpeta: {default_recordings_dir()}", anchor="w").pack(anchor="w", padx=5, pady=2)
+        
+        replay = ttk.LabelFrame(frame, text="Reproducción")
+        replay.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        control_frame = ttk.Frame(replay)
+        control_frame.pack(fill=tk.X, padx=5, pady=2)
+        ttk.Button(control_frame, text="Abrir grabación...", command=self.open_recording).pack(side=tk.LEFT)
+        self.replay_file_label = ttk.Label(control_frame, text="Ninguna grabación abierta", anchor="w")
+        self.replay_file_label.pack(side=tk.LEFT, padx=5)
+        # Barra para desplazarse por la grabación, registro a registro
+        self.replay_scale = ttk.Scale(replay, from_=0, to=0, orient=tk.HORIZONTAL, command=self.on_replay_scrub)
+        self.replay_scale.pack(fill=tk.X, padx=5, pady=5)
+        self.replay_chart_frame = ttk.Frame(replay)
+        self.replay_chart_frame.pack(fill=tk.X, padx=5, pady=2)
+        self.replay_labels = self.add_section(replay, "Registro", [
+            ("Fecha y hora:", "-"),
+            ("Uso de CPU:", "-"),
+            ("Uso por núcleo:", "-"),
+            ("Memoria:", "-"),
+            ("Swap:", "-"),
+            ("Disco (lectura / escritura):", "-"),
+            ("Red (recibido / enviado):", "-")
+        ])
+        self.replay_labels["Uso por núcleo:"].config(wraplength=450, justify=tk.LEFT)
+        columns = ("pid", "name", "cpu", "memory")
+        self.replay_tree = ttk.Treeview(replay, columns=columns, show='headings', height=10)
+        for column, text in zip(columns, ("PID", "Nombre", "CPU %", "Memoria %")):
+            self.replay_tree.heading(column, text=text)
+            self.replay_tree.column(column, width=100, anchor=tk.CENTER, stretch=True)
+        self.replay_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        self.update_recording_status()
+    
+    # Método para activar o desactivar la grabación
+    def toggle_recording(self):
+        if self.recording_var.get():
+            if self.recorder is None:
+                self.recorder = Recorder()
+        elif self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+        self.update_paused_jobs()
+        self.settings["recording"] = self.recorder is not None
+        save_settings(self.settings)
+        self.update_recording_status()
+    
+    # Método para mostrar el fichero y el número de registros de la grabación en curso
+    def update_recording_status(self):
+        if self.recorder is None:
+            text = "Sin grabar"
+        elif self.recorder.path is None:
+            text = "Grabando (esperando la primera muestra)"
+        else:
+            text = f"Grabando en {os.path.basename(self.recorder.path)} ({self.recorder.records} registros)"
+        self.recording_status.config(text=text)
+    
+    # Método para abrir una grabación y preparar la reproducción
+    def open_recording(self):
+        path = filedialog.askopenfilename(
+            title="Abrir grabación", initialdir=default_recordings_dir(),
+            filetypes=[("Grabaciones", "*.atsr"), ("Todos los archivos", "*")]
+        )
+        if not path:
+            return
+        try:
+            reader = RecordingReader(path)
+        except (OSError, ValueError) as e:
+            tk.messagebox.showerror("Error", f"No se pudo abrir la grabación: {str(e)}")
+            return
+        if self.replay is not None:
+            self.replay.close()
+        self.replay = reader
+        self.replay_file_label.config(text=f"{os.path.basename(path)} ({len(reader)} registros)")
+        # Gráficas de la grabación completa (se dibujan una vez, no con el muestreo)
+        for chart in self.replay_charts:
+            chart.destroy()
+        self.replay_charts = []
+        for column, label in (("cpu", "CPU"), ("memory_percent", "Memoria")):
+            values = reader.column(column)
+            buffer = RingBuffer(max(2, len(values)))
+            for value in values:
+                buffer.append(value)
+            chart = Sparkline(self.replay_chart_frame, buffer, label, 100.0)
+            chart.pack(fill=tk.X, expand=True, pady=2)
+            chart.bind("<Configure>", lambda e, c=chart: c.redraw())
+            self.replay_charts.append(chart)
+        self.replay_scale.config(to=max(0, len(reader) - 1))
+        self.replay_scale.set(0)
+        self.show_replay_record(0)
+    
+    # Método llamado al mover la barra de reproducción
+    def on_replay_scrub(self, value):
+        if self.replay is not None:
+            self.show_replay_record(int(float(value)))
+    
+    # Método para mostrar un registro de la grabación abierta
+    def show_replay_record(self, index):
+        if not len(self.replay):
+            return
+        record = self.replay.record(index)
+        cores = [record[f"cpu{core}"] for core in range(self.replay.cores)]
+        values = {
+            "Fecha y hora:": datetime.fromtimestamp(record["timestamp"]).strftime("%Y-%m-%d %H:%M:%S"),
+            "Uso de CPU:": f"{record['cpu']:.1f}%",
+            "Uso por núcleo:": "  ".join(f"{usage:.0f}%" for usage in cores),
+            "Memoria:": f"{record['memory_percent']:.1f}% ({self.format_size(record['memory_used'])} usados)",
+            "Swap:": f"{record['swap_percent']:.1f}% ({self.format_size(record['swap_used'])} usados)",
+            "Disco (lectura / escritura):": f"{self.format_rate(record['disk_read_bytes'])} / {self.format_rate(record['disk_write_bytes'])}",
+            "Red (recibido / enviado):": f"{self.format_rate(record['net_bytes_recv'])} / {self.format_rate(record['net_bytes_sent'])}"
+        }
+        for text, value in values.items():
+            self.replay_labels[text].config(text=value)
+        self.replay_tree.delete(*self.replay_tree.get_children())
+        for pid, name, cpu, memory in self.replay.top_processes(index):
+            self.replay_tree.insert('', tk.END, values=(pid, name, f"{cpu:.1f}", f"{memory:.1f}"))
+    
+    # Método para crear la pestaña con el coste del propio monitor
+    def create_profile_tab(self, parent):
+        frame = self.create_scrollable_frame(parent)
+        self.profile_labels = self.add_section(frame, "Coste del monitor", [
+            ("Uso de CPU propio:", "-"),
+            ("Memoria residente:", "-"),
+            ("Hilos:", "-"),
+            ("Retraso del bucle de eventos:", "-")
+        ])
+        
+        timings = ttk.LabelFrame(frame, text="Tiempos por punto de medida (ms)")
+        timings.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        columns = ("name", "count", "mean", "p50", "p95", "p99", "max")
+        self.profile_tree = ttk.Treeview(timings, columns=columns, show='headings', height=14)
+        for column, text, width in zip(columns, ("Punto", "Llamadas", "Media", "p50", "p95", "p99", "Máximo"),
+                                       (260, 80, 70, 70, 70, 70, 80)):
+            self.profile_tree.heading(column, text=text)
+            self.profile_tree.column(column, width=width, anchor=tk.W if column == "name" else tk.CENTER, stretch=column == "name")
+        self.profile_tree.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        
+        control_frame = ttk.Frame(frame)
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Button(control_frame, text="Exportar JSON...", command=self.export_profile).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Reiniciar", command=self.reset_profile).pack(side=tk.LEFT, padx=5)
+        self.profile_capture_btn = ttk.Button(control_frame, command=self.toggle_profile_capture)
+        self.profile_capture_btn.pack(side=tk.LEFT, padx=5)
+        self.profile_capture_status = ttk.Label(frame, text="", anchor="w", wraplength=500, justify=tk.LEFT)
+        self.profile_capture_status.pack(anchor="w", padx=10, pady=2)
+        self.update_profile_capture()
+        if self.profiler.last_snapshot is not None:
+            self.update_profile(self.profiler.last_snapshot)
+    
+    # Método para mostrar la última muestra del coste del monitor
+    def update_profile(self, snapshot):
+        self.profile_labels["Uso de CPU propio:"].config(text=f"{snapshot.cpu:.1f}%")
+        self.profile_labels["Memoria residente:"].config(text=f"{snapshot.rss / 1024**2:.1f} MB")
+        self.profile_labels["Hilos:"].config(text=str(snapshot.threads))
+        lag = next((summary for summary in snapshot.timings if summary.name == LOOP_LAG), None)
+        if lag is not None:
+            self.profile_labels["Retraso del bucle de eventos:"].config(
+                text=f"p50 {lag.p50:.1f} ms, p95 {lag.p95:.1f} ms, máximo {lag.max:.1f} ms")
+        items = self.profile_tree.get_children()
+        rows = [(summary.name, summary.count, f"{summary.mean:.2f}", f"{summary.p50:g}", f"{summary.p95:g}",
+                 f"{summary.p99:g}", f"{summary.max:.1f}") for summary in snapshot.timings]
+        # Se reutilizan las filas existentes y sólo se crean o borran las que sobran
+        for item, values in zip(items, rows):
+            self.profile_tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.profile_tree.insert("", tk.END, values=values)
+        if len(items) > len(rows):
+            self.profile_tree.delete(*items[len(rows):])
+    
+    # Método para guardar el informe de tiempos en un fichero JSON
+    def export_profile(self):
+        path = filedialog.asksaveasfilename(
+            title="Exportar informe de rendimiento", defaultextension=".json",
+            initialfile=f"rendimiento-{datetime.now():%Y%m%d-%H%M%S}.json",
+            filetypes=[("JSON", "*.json"), ("Todos los archivos", "*")]
+        )
+        if not path:
+            return
+        try:
+            self.profiler.export(path)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar el informe: {str(e)}")
+    
+    # Método para vaciar los histogramas
+    def reset_profile(self):
+        self.profiler.reset()
+        self.sampler.trigger("profile")
+    
+    # Método para iniciar o detener la captura con cProfile y tracemalloc
+    def toggle_profile_capture(self):
+        capture = self.profiler.capture
+        if not capture.active:
+            capture.start()
+            self.profile_capture_status.config(text="Capturando... (el perfil sólo incluye el hilo de la interfaz)")
+        else:
+            try:
+                paths = capture.stop(default_profiles_dir())
+            except OSError as e:
+                self.profile_capture_status.config(text=f"No se pudo guardar la captura: {str(e)}")
+            else:
+                self.profile_capture_status.config(text="Captura guardada en:\n" + "\n".join(paths))
+        self.update_profile_capture()
+    
+    def update_profile_capture(self):
+        text = "Detener captura" if self.profiler.capture.active else "Capturar perfil (cProfile + tracemalloc)"
+        self.profile_capture_btn.config(text=text)
+    
+    # Método para crear pestaña de la flota de equipos
+    def create_fleet_tab(self, parent):
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        control_frame = ttk.Frame(frame)
+        control_frame.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(control_frame, text="Agente (host:puerto):").pack(side=tk.LEFT, padx=5)
+        self.fleet_host_var = tk.StringVar()
+        entry = ttk.Entry(control_frame, textvariable=self.fleet_host_var, width=30)
+        entry.pack(side=tk.LEFT, padx=5)
+        entry.bind("<Return>", lambda e: self.add_fleet_host())
+        ttk.Button(control_frame, text="Añadir", command=self.add_fleet_host).pack(side=tk.LEFT, padx=5)
+        ttk.Button(control_frame, text="Quitar seleccionados", command=self.remove_fleet_hosts).pack(side=tk.LEFT, padx=5)
+        self.fleet_status = ttk.Label(frame, text="", anchor="w")
+        self.fleet_status.pack(anchor="w", padx=10, pady=2)
+        
+        # Equipos ordenados por carga (media de 1 minuto por núcleo, o uso de CPU sin carga media)
+        columns = (("address", "Agente", 150), ("name", "Equipo", 120), ("status", "Estado", 100), ("load", "Carga", 70),
+                   ("cpu", "CPU", 70), ("memory", "Memoria", 70), ("disk", "Disco más lleno", 100),
+                   ("net", "Red (rx/tx)", 140), ("top", "Proceso con más CPU", 170), ("latency", "Latencia", 80))
+        tree_frame = ttk.Frame(frame)
+        tree_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.fleet_tree = ttk.Treeview(tree_frame, columns=[key for key, text, width in columns], show='headings')
+        for key, text, width in columns:
+            self.fleet_tree.heading(key, text=text, command=lambda c=key: self.sort_fleet(c))
+            self.fleet_tree.column(key, width=width, anchor=tk.W if key in ("address", "name", "top") else tk.CENTER)
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.fleet_tree.yview)
+        self.fleet_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.fleet_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.fleet_sort = ("load", True)
+        ttk.Label(frame, wraplength=600, justify=tk.LEFT, text=(
+            "Cada equipo debe ejecutar el agente (python3 agent.py --listen 0.0.0.0:9878). "
+            "La clave de acceso y el intervalo de consulta se configuran en la sección \"fleet\" "
+            "del fichero de preferencias."
+        )).pack(anchor="w", padx=10, pady=5)
+        self.update_fleet(self.fleet.snapshot())
+    
+    # Método para añadir un agente a la flota y guardarlo en las preferencias
+    def add_fleet_host(self):
+        address = self.fleet_host_var.get().strip()
+        if not address:
+            return
+        try:
+            parse_agent_address(address)
+        except ValueError:
+            messagebox.showerror("Error", f"Dirección no válida: {address}")
+            return
+        self.fleet_host_var.set("")
+        self.fleet.add_host(address)
+        self.fleet.start()
+        self.save_fleet_hosts()
+        self.sampler.trigger("fleet")
+    
+    # Método para quitar de la flota los agentes seleccionados
+    def remove_fleet_hosts(self):
+        for address in self.fleet_tree.selection():
+            self.fleet.remove_host(address)
+        self.save_fleet_hosts()
+        self.sampler.trigger("fleet")
+    
+    def save_fleet_hosts(self):
+        self.settings.setdefault("fleet", {})["hosts"] = list(self.fleet.hosts)
+        save_settings(self.settings)
+    
+    # Método para ordenar la tabla de la flota por una columna (dos clics invierten el orden)
+    def sort_fleet(self, column):
+        key, reverse = self.fleet_sort
+        self.fleet_sort = (column, not reverse if key == column else column not in ("address", "name", "status"))
+        snapshot = self.last_snapshots.get("fleet")
+        if snapshot is not None:
+            self.update_fleet(snapshot)
+    
+    # Método para mostrar el estado de la flota: las filas se identifican por la dirección
+    # del agente, así que sólo se reescriben las que cambian y se mueven las que cambian de puesto
+    def update_fleet(self, snapshot):
+        connected = sum(1 for host in snapshot.hosts if host.status == "ok")
+        self.fleet_status.config(text=(
+            f"{len(snapshot.hosts)} equipos, {connected} conectados, recibiendo {snapshot.received_rate / 1024:.1f} KB/s"
+        ))
+        column, reverse = self.fleet_sort
+        if column == "net":
+            key = lambda host: (host.net_recv or 0) + (host.net_sent or 0)
+        elif column in ("address", "name", "status"):
+            key = lambda host: str(getattr(host, column) or "")
+        elif column == "top":
+            key = lambda host: host.top_process or ""
+        else:
+            # Los equipos sin datos van siempre al final
+            missing = float("-inf") if reverse else float("inf")
+            key = lambda host: missing if getattr(host, column) is None else getattr(host, column)
+        hosts = sorted(snapshot.hosts, key=key, reverse=reverse)
+        percent = lambda value: "-" if value is None else f"{value:.1f}%"
+        rows = []
+        for host in hosts:
+            if host.net_recv is None:
+                net = "-"
+            else:
+                net = f"{self.format_rate(host.net_recv)} / {self.format_rate(host.net_sent)}"
+            status = FLEET_STATUS.get(host.status, host.status)
+            if host.error:
+                status = f"{status}: {host.error}"
+            rows.append((host.address, (
+                host.address, host.name or "-", status, percent(host.load), percent(host.cpu), percent(host.memory),
+                percent(host.disk), net, host.top_process or "-",
+                "-" if host.latency is None else f"{host.latency * 1000:.0f} ms"
+            )))
+        self.update_rate_table(self.fleet_tree, rows)
+        order = tuple(address for address, values in rows)
+        if self.fleet_tree.get_children() != order:
+            for index, address in enumerate(order):
+                self.fleet_tree.move(address, "", index)
+    
+    # Método para crear pestaña de ajustes de los intervalos de muestreo
+    def create_settings_tab(self, parent):
+        frame = self.create_scrollable_frame(parent)
+        section = ttk.LabelFrame(frame, text="Intervalos de actualización (segundos)")
+        section.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        section.grid_columnconfigure(2, weight=1)
+        self.interval_vars = {}
+        self.job_status_labels = {}
+        for row, (name, text) in enumerate(JOB_LABELS.items()):
+            job = self.sampler.jobs[name]
+            ttk.Label(section, text=text, anchor="w").grid(row=row, column=0, sticky="w", padx=5, pady=2)
+            var = tk.StringVar(value=f"{job.interval:g}")
+            spinbox = ttk.Spinbox(section, from_=0.5, to=60, increment=0.5, textvariable=var, width=6,
+                                  command=lambda n=name: self.apply_interval(n))
+            spinbox.grid(row=row, column=1, padx=5, pady=2)
+            spinbox.bind("<Return>", lambda e, n=name: self.apply_interval(n))
+            spinbox.bind("<FocusOut>", lambda e, n=name: self.apply_interval(n))
+            self.interval_vars[name] = var
+            self.job_status_labels[name] = ttk.Label(section, text="", anchor="w")
+            self.job_status_labels[name].grid(row=row, column=2, sticky="w", padx=5, pady=2)
+        
+        exporter_section = ttk.LabelFrame(frame, text="Métricas para Prometheus")
+        exporter_section.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        self.exporter_var = tk.BooleanVar(value=self.exporter is not None)
+        ttk.Checkbutton(exporter_section, text="Servir métricas en formato OpenMetrics", variable=self.exporter_var,
+                        command=self.toggle_exporter).pack(anchor="w", padx=5, pady=2)
+        self.exporter_status = ttk.Label(exporter_section, text="", anchor="w")
+        self.exporter_status.pack(anchor="w", padx=5, pady=2)
+        self.update_exporter_status()
+        ttk.Label(frame, wraplength=500, justify=tk.LEFT, text=(
+            "Si una muestra tarda más de la mitad de su intervalo, el intervalo se alarga "
+            "automáticamente. Con la ventana minimizada todos los intervalos se multiplican "
+            f"por {MINIMIZED_SLOWDOWN}."
+        )).pack(anchor="w", padx=10, pady=5)
+        self.update_job_status()
+    
+    # Método para aplicar y guardar el intervalo escrito por el usuario
+    def apply_interval(self, name):
+        try:
+            interval = max(0.5, min(60.0, float(self.interval_vars[name].get().replace(",", "."))))
+        except ValueError:
+            interval = self.sampler.jobs[name].interval
+        self.interval_vars[name].set(f"{interval:g}")
+        if interval == self.sampler.jobs[name].interval:
+            return
+        self.sampler.set_interval(name, interval)
+        self.settings.setdefault("intervals", {})[name] = interval
+        save_settings(self.settings)
+    
+    # Método para arrancar el servidor de métricas con la dirección de las preferencias
+    def start_exporter(self):
+        config = self.settings.get("exporter", {})
+        exporter = MetricsExporter(config.get("host", DEFAULT_HOST), config.get("port", DEFAULT_PORT))
+        try:
+            exporter.start()
+        except OSError as e:
+            self.exporter_error = str(e)
+            return
+        self.exporter_error = None
+        self.exporter = exporter
+        self.exporter.update(self.last_snapshots)
+    
+    # Método para activar o desactivar el servidor de métricas
+    def toggle_exporter(self):
+        if self.exporter_var.get():
+            if self.exporter is None:
+                self.start_exporter()
+        elif self.exporter is not None:
+            self.exporter.stop()
+            self.exporter = None
+        self.exporter_var.set(self.exporter is not None)
+        self.update_paused_jobs()
+        self.settings.setdefault("exporter", {})["enabled"] = self.exporter is not None
+        save_settings(self.settings)
+        self.update_exporter_status()
+    
+    def update_exporter_status(self):
+        if self.exporter is not None:
+            text = f"Disponible en http://{self.exporter.host}:{self.exporter.port}/metrics"
+        elif self.exporter_error:
+            text = f"No se pudo iniciar: {self.exporter_error}"
+        else:
+            text = "Desactivado"
+        self.exporter_status.config(text=text)
+    
+    # Método para mostrar el intervalo efectivo y la duración de la última muestra de cada trabajo
+    def update_job_status(self):
+        for name, label in self.job_status_labels.items():
+            job = self.sampler.jobs[name]
+            if job.paused:
+                status = "en pausa (pestaña oculta)"
+            else:
+                status = f"efectivo {job.effective_interval * self.sampler.slowdown:.1f} s"
+            label.config(text=f"{status}, última muestra {job.last_duration * 1000:.0f} ms")
+    
     # Método para crear pestaña de información del programa
     def create_info_tab(self, parent):
         frame = self.create_scrollable_frame(parent)
@@ -467,9 +1722,11 @@ class SystemInfoApp:
         webbrowser.open(url, new=2)  # new=2 abre en una nueva pestaña si es posible
     
     # Método para añadir secciones de información
+    # Devuelve las etiquetas de valor por texto, para poder actualizarlas después
     def add_section(self, parent, title, items):
         frame = ttk.LabelFrame(parent, text=title)
         frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5, ipadx=5, ipady=5)
+        labels = {}
         
         for row, (text, value) in enumerate(items):
             frame.grid_rowconfigure(row, weight=1)
@@ -477,16 +1734,19 @@ class SystemInfoApp:
             
             ttk.Label(frame, text=text, anchor="w").grid(
                 row=row, column=0, sticky="nsew", padx=5, pady=2)
-            ttk.Label(frame, text=value, anchor="w").grid(
-                row=row, column=1, sticky="nsew", padx=5, pady=2)
+            labels[text] = ttk.Label(frame, text=value, anchor="w")
+            labels[text].grid(row=row, column=1, sticky="nsew", padx=5, pady=2)
         
         # Añadir fila de expansión al final
         frame.grid_rowconfigure(len(items), weight=1)
+        return labels
     
     # Método para añadir barras de progreso
+    # Devuelve las barras por texto, para poder actualizarlas después
     def add_progress_bars(self, parent, items):
         frame = ttk.Frame(parent)
         frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)  # Cambiado a BOTH
+        bars = {}
         
         for text, value in items:
             container = ttk.Frame(frame)
@@ -501,42 +1761,20 @@ class SystemInfoApp:
             )
             progress.pack(side=tk.RIGHT, fill=tk.X, expand=True)  # Ajustado para expansión
             progress['value'] = value
+            bars[text] = progress
+        return bars
     
     # Método para formatear tamaños de bytes
     def format_size(self, bytes):
         return f"{bytes / (1024**3):.2f} GB"
     
-    # Métodos para obtener información del sistema
-    def get_cpu_temperature(self):
-        try:
-            temps = psutil.sensors_temperatures()
-            if 'coretemp' in temps:
-                return f"{temps['coretemp'][0].current}°C"
-            return "N/A"
-        except: return "No se ha podido obtener la temperatura"
-    
-    # Métodos para obtener información del sistema
-    def get_pc_manufacturer(self):
-        try:
-            if platform.system() == "Windows":
-                return platform.win32_edition()
-            return open("/sys/devices/virtual/dmi/id/sys_vendor").read().strip()
-        except: return "No se ha podido obtener la información del sistema"
-    
-    # Método para obtener el modelo de la PC
-    def get_pc_model(self):
-        try:
-            if platform.system() == "Windows":
-                return platform.win32_ver()[1]
-            return open("/sys/devices/virtual/dmi/id/product_name").read().strip()
-        except: return "No se ha podido obtener el modelo"
+    # Método para formatear tasas de transferencia
+    def format_rate(self, bytes_per_second):
+        return f"{bytes_per_second / 1024**2:.2f} MB/s"
     
-    # Método para obtener el estado de la batería
-    def get_battery_status(self):
-        try:
-            battery = psutil.sensors_battery()
-            return f"{battery.percent}% ({'Cargando' if battery.power_plugged else 'Batería'})"
-        except: return "No hay una batería conectada!!"
+    # Método para formatear frecuencias del procesador
+    def format_freq(self, mhz):
+        return f"{mhz:.2f} MHz" if mhz is not None else "No disponible"
     
     # Método para obtener información del sistema
     def get_system_info(self):
@@ -0,0 +1,791 @@
+# Modelo y vistas de la tabla de procesos.
+# El almacén guarda todas las filas en Python; las vistas deciden cuántos
+# elementos de Tk se crean para mostrarlas.
+import tkinter as tk
+from tkinter import ttk
+from array import array
+from bisect import bisect_left
+
+
+# Columnas básicas y columnas de detalle opcionales (E/S, cambios de contexto, hilos y descriptores)
+BASE_COLUMNS = ('pid', 'name', 'status', 'cpu', 'memory', 'user')
+DETAIL_COLUMNS = ('read_rate', 'write_rate', 'ctx_switches', 'threads', 'fds')
+
+
+# Método para formatear una tasa de bytes por segundo de forma compacta
+def format_byte_rate(value):
+    if value is None:
+        return ""
+    for unit in ("B/s", "KB/s", "MB/s"):
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B/s" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GB/s"
+
+
+# Método para formatear las columnas de detalle (vacías si no se han leído)
+def format_details(row):
+    return (
+        format_byte_rate(row.read_rate),
+        format_byte_rate(row.write_rate),
+        f"{row.ctx_switches:.0f}" if row.ctx_switches is not None else "",
+        row.threads if row.threads is not None else "",
+        row.fds if row.fds is not None else ""
+    )
+
+
+# Método para convertir una fila de proceso en los valores que muestra el Treeview
+def format_process_row(row):
+    return (
+        row.pid,
+        row.name,
+        row.status,
+        f"{row.cpu:.1f}",
+        f"{row.memory:.1f}",
+        row.user
+    ) + format_details(row)
+
+
+# Método para encontrar la subsecuencia creciente más larga de una lista de números
+# (posiciones de los elementos que la forman). Son las filas que pueden quedarse
+# donde están al reordenar: basta con mover las demás.
+def longest_increasing(values):
+    tails = []      # último valor de la mejor subsecuencia de cada longitud
+    tail_index = []
+    previous = [-1] * len(values)
+    for i, value in enumerate(values):
+        length = bisect_left(tails, value)
+        if length == len(tails):
+            tails.append(value)
+            tail_index.append(i)
+        else:
+            tails[length] = value
+            tail_index[length] = i
+        previous[i] = tail_index[length - 1] if length else -1
+    result = set()
+    i = tail_index[-1] if tail_index else -1
+    while i >= 0:
+        result.add(i)
+        i = previous[i]
+    return result
+
+
+# Método para ordenar valores opcionales dejando los que faltan al principio
+def _optional(value):
+    return -1 if value is None else value
+
+
+# Claves de ordenación de cada columna de la tabla
+SORT_KEYS = {
+    'pid': lambda row: row.pid,
+    'name': lambda row: (row.name or "").lower(),
+    'status': lambda row: row.status or "",
+    'cpu': lambda row: row.cpu,
+    'memory': lambda row: row.memory,
+    'user': lambda row: row.user or "",
+    'read_rate': lambda row: _optional(row.read_rate),
+    'write_rate': lambda row: _optional(row.write_rate),
+    'ctx_switches': lambda row: _optional(row.ctx_switches),
+    'threads': lambda row: _optional(row.threads),
+    'fds': lambda row: _optional(row.fds)
+}
+
+
+# Almacén compacto con todos los procesos de la última instantánea.
+# Las filas son namedtuple (sin __dict__ por fila) y los PID se guardan en un
+# array paralelo para localizar cualquier proceso sin recorrer la lista.
+# Mantiene un mapa PID -> posición de cada instantánea, índices por usuario,
+# por nombre y por PID (creados al filtrar por primera vez con la instantánea)
+# y las permutaciones ordenadas de cada columna, de modo que ordenar o filtrar
+# no vuelve a consultar psutil. La permutación de la columna activa se vuelve a
+# calcular con cada instantánea: sorted() en C es más rápido que parchear la
+# anterior en Python (bench_process_table.py).
+class ProcessStore:
+    def __init__(self):
+        self.all_rows = []
+        self.positions = {}   # pid -> posición en all_rows
+        self.rows = []        # filas visibles: filtradas y ordenadas
+        self.pids = array('q')
+        self.index = {}       # pid -> posición en rows
+        self._by_user = None  # usuario -> posiciones en all_rows
+        self._by_name = None  # nombre en minúsculas -> posiciones en all_rows
+        self._sorted_pids = None
+        self.sort_column = None
+        self.sort_reverse = False
+        self.filter_text = ""
+        self.filter_user = None
+        self._orders = {}     # columna -> permutación ascendente de all_rows
+        self.version = 0
+
+    # Método para cargar las filas de una nueva instantánea
+    def load(self, rows):
+        self.all_rows = list(rows)
+        self.positions = {row.pid: position for position, row in enumerate(self.all_rows)}
+        self._by_user = self._by_name = self._sorted_pids = None
+        self._orders = {}
+        self.apply()
+
+    # Método para cambiar la columna de ordenación (None para el orden original)
+    def set_sort(self, column, reverse=False):
+        self.sort_column = column
+        self.sort_reverse = reverse
+        self.apply()
+
+    # Método para filtrar por texto (nombre o PID) y por usuario
+    def set_filter(self, text="", user=None):
+        self.filter_text = text.strip().lower()
+        self.filter_user = user
+        self.apply()
+
+    # Método para obtener los usuarios conocidos
+    def users(self):
+        return sorted({row.user for row in self.all_rows if row.user})
+
+    # Método para obtener las posiciones de los procesos cuyo PID empieza por un texto de cifras
+    def _pid_prefix(self, text):
+        if self._sorted_pids is None:
+            self._sorted_pids = sorted(self.positions)
+        pids = self._sorted_pids
+        if not pids or (text.startswith("0") and text != "0"):
+            return []
+        # Los PID que empiezan por "12" están en [12, 13), [120, 130), [1200, 1300)...
+        low = int(text)
+        high = low + 1
+        positions = self.positions
+        matches = []
+        while low <= pids[-1]:
+            start = bisect_left(pids, low)
+            matches.extend(positions[pid] for pid in pids[start:bisect_left(pids, high, start)])
+            if not low:
+                break
+            low *= 10
+            high *= 10
+        return matches
+
+    def _order(self, column):
+        order = self._orders.get(column)
+        if order is None:
+            key = SORT_KEYS[column]
+            rows = self.all_rows
+            order = sorted(range(len(rows)), key=lambda i: key(rows[i]))
+            self._orders[column] = order
+        return order
+
+    # Método para obtener las posiciones en all_rows que cumplen el filtro (None sin filtro)
+    def allowed_positions(self):
+        allowed = None
+        if self.filter_user is not None:
+            if self._by_user is None:
+                self._by_user = {}
+                for position, row in enumerate(self.all_rows):
+                    self._by_user.setdefault(row.user, []).append(position)
+            allowed = set(self._by_user.get(self.filter_user, ()))
+        if self.filter_text:
+            text = self.filter_text
+            if self._by_name is None:
+                self._by_name = {}
+                for position, row in enumerate(self.all_rows):
+                    self._by_name.setdefault((row.name or "").lower(), []).append(position)
+            matches = set()
+            for name, positions in self._by_name.items():
+                if text in name:
+                    matches.update(positions)
+            if text.isdigit():
+                matches.update(self._pid_prefix(text))
+            allowed = matches if allowed is None else allowed & matches
+        return allowed
+
+    # Método para recalcular las filas visibles a partir de los índices
+    def apply(self):
+        rows = self.all_rows
+        if self.sort_column in SORT_KEYS:
+            order = self._order(self.sort_column)
+            if self.sort_reverse:
+                order = reversed(order)
+        else:
+            order = range(len(rows))
+        allowed = self.allowed_positions()
+        if allowed is None:
+            self.rows = [rows[i] for i in order]
+        else:
+            self.rows = [rows[i] for i in order if i in allowed]
+        self.pids = array('q', [row.pid for row in self.rows])
+        self.index = {pid: i for i, pid in enumerate(self.pids)}
+        self.version += 1
+
+    # Método para obtener la fila de un PID (None si no está en la instantánea),
+    # aunque el filtro la oculte
+    def row(self, pid):
+        position = self.positions.get(pid)
+        return self.all_rows[position] if position is not None else None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, pid):
+        return pid in self.index
+
+
+# Vista con un elemento del Treeview por proceso, actualizada por diferencias:
+# sólo se insertan los PID nuevos, se borran los que han terminado y se
+# modifican las filas cuyos valores han cambiado.
+class KeyedProcessView:
+    def __init__(self, tree, scrollbar, store):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.store = store
+        # PID -> id del elemento en el Treeview y últimos valores mostrados
+        self.items = {}
+        self.values = {}
+        self.order = []
+
+    def attach(self):
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    def detach(self):
+        self.clear()
+
+    def clear(self):
+        if self.items:
+            self.tree.delete(*self.items.values())
+        self.items.clear()
+        self.values.clear()
+        self.order = []
+
+    def refresh(self):
+        current = {}
+        for row in self.store.rows:
+            current[row.pid] = format_process_row(row)
+
+        # Borrar procesos que ya no existen (en una sola llamada a Tk)
+        gone = [pid for pid in self.items if pid not in current]
+        if gone:
+            self.tree.delete(*[self.items.pop(pid) for pid in gone])
+            for pid in gone:
+                del self.values[pid]
+
+        # Orden actual del Treeview: los que siguen y los nuevos al final
+        shown = [pid for pid in self.order if pid in current]
+        for pid, values in current.items():
+            item = self.items.get(pid)
+            if item is None:
+                # Proceso nuevo
+                self.items[pid] = self.tree.insert('', tk.END, values=values)
+                self.values[pid] = values
+                shown.append(pid)
+            elif self.values[pid] != values:
+                # Proceso existente con valores distintos
+                self.tree.item(item, values=values)
+                self.values[pid] = values
+
+        # Reordenar sólo si el orden del almacén es distinto del mostrado
+        order = list(current)
+        if order != shown:
+            self._reorder(shown, order)
+        self.order = order
+
+    # Método para llevar el Treeview del orden mostrado al del almacén moviendo sólo
+    # las filas que no forman parte de la subsecuencia más larga que ya está en orden
+    def _reorder(self, shown, order):
+        target = {pid: position for position, pid in enumerate(order)}
+        stable = longest_increasing([target[pid] for pid in shown])
+        if len(shown) - len(stable) > len(shown) // 2:
+            # Casi todo cambia de sitio (nueva columna de orden): mover todo es más barato
+            for position, pid in enumerate(order):
+                self.tree.move(self.items[pid], '', position)
+            return
+        stable = {shown[i] for i in stable}
+        children = list(shown)
+        for position, pid in enumerate(order):
+            if pid in stable:
+                continue
+            # Se coloca justo detrás del que le precede en el orden del almacén
+            children.remove(pid)
+            index = children.index(order[position - 1]) + 1 if position else 0
+            children.insert(index, pid)
+            self.tree.move(self.items[pid], '', index)
+
+    # Método para elegir las columnas visibles
+    def show_columns(self, columns):
+        self.tree.configure(displaycolumns=tuple(columns))
+
+    def selected_pid(self):
+        selected = self.tree.selection()
+        if not selected:
+            return None
+        return int(self.tree.item(selected[0], 'values')[0])
+
+
+# Vista virtual: sólo existen en Tk las filas de la ventana visible más un
+# pequeño margen. Los elementos se reutilizan al desplazarse y la barra de
+# desplazamiento se traduce a un desplazamiento sobre el almacén.
+class VirtualProcessView:
+    def __init__(self, tree, scrollbar, store, buffer=10):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.store = store
+        self.buffer = buffer
+        self.offset = 0
+        self.slots = []   # ids de los elementos reutilizables, en orden
+        self.shown = []   # valores mostrados en cada elemento
+        self._selected_pid = None
+        self._bound = False
+        self._attached = False
+        self._row_height = 20
+
+    def attach(self):
+        try:
+            self._row_height = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            self._row_height = 20
+        self.tree.configure(yscrollcommand="")
+        self.scrollbar.configure(command=self.yview)
+        self._attached = True
+        # Los eventos se enlazan una sola vez (unbind con funcid borraría también
+        # los enlaces de otros) y se ignoran mientras la vista no está activa
+        if not self._bound:
+            self._bound = True
+            for sequence, handler in (
+                ("<MouseWheel>", self._on_mousewheel),
+                ("<Button-4>", lambda e: self._scroll_units(-3)),
+                ("<Button-5>", lambda e: self._scroll_units(3)),
+                ("<Configure>", lambda e: self.refresh() if self._attached else None),
+                ("<<TreeviewSelect>>", self._on_select)
+            ):
+                self.tree.bind(sequence, handler, add="+")
+
+    def detach(self):
+        self._attached = False
+        self.clear()
+
+    def clear(self):
+        if self.slots:
+            self.tree.delete(*self.slots)
+        self.slots = []
+        self.shown = []
+
+    # Método para calcular cuántas filas caben en el alto actual del Treeview
+    def visible_rows(self):
+        height = self.tree.winfo_height() - self._row_height  # descontar la cabecera
+        return max(1, height // self._row_height)
+
+    # Comando de la barra de desplazamiento ("moveto" o "scroll")
+    def yview(self, *args):
+        total = len(self.store)
+        if not args or not total:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_rows()
+            self.offset += amount
+        self.refresh()
+
+    def _scroll_units(self, amount):
+        if not self._attached:
+            return None
+        self.yview("scroll", amount, "units")
+        return "break"
+
+    def _on_mousewheel(self, event):
+        return self._scroll_units(-1 if event.delta > 0 else 1)
+
+    def _on_select(self, event):
+        if not self._attached:
+            return
+        # Una selección vacía la provoca la propia vista al desplazarse fuera
+        # del proceso seleccionado, así que se conserva el PID recordado
+        selected = self.tree.selection()
+        if selected and selected[0] in self.slots:
+            index = self.slots.index(selected[0])
+            if index < len(self.shown):
+                self._selected_pid = self.shown[index][0]
+
+    # Método para dibujar la ventana visible del almacén
+    def refresh(self):
+        total = len(self.store)
+        visible = self.visible_rows()
+        self.offset = max(0, min(self.offset, total - visible))
+        count = min(visible + self.buffer, total - self.offset)
+
+        # Ajustar el número de elementos reutilizables
+        while len(self.slots) < count:
+            self.slots.append(self.tree.insert('', tk.END))
+            self.shown.append(None)
+        if len(self.slots) > count:
+            self.tree.delete(*self.slots[count:])
+            del self.slots[count:]
+            del self.shown[count:]
+
+        # Actualizar sólo los elementos cuyo contenido cambia
+        rows = self.store.rows
+        selected_item = None
+        for i in range(count):
+            row = rows[self.offset + i]
+            values = format_process_row(row)
+            if self.shown[i] != values:
+                self.tree.item(self.slots[i], values=values)
+                self.shown[i] = values
+            if row.pid == self._selected_pid:
+                selected_item = self.slots[i]
+
+        # Mantener la selección sobre el mismo PID
+        if self._selected_pid is not None and self._selected_pid not in self.store:
+            self._selected_pid = None
+        current = self.tree.selection()
+        if selected_item is not None:
+            if current != (selected_item,):
+                self.tree.selection_set(selected_item)
+        elif current:
+            self.tree.selection_set(())
+
+        if total:
+            self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    # Método para elegir las columnas visibles
+    def show_columns(self, columns):
+        self.tree.configure(displaycolumns=tuple(columns))
+
+    def selected_pid(self):
+        return self._selected_pid
+
+
+# Árbol de procesos por PID del padre con totales por subárbol.
+# Cada nodo guarda el uso de CPU y la memoria residente de todo su subárbol.
+# Al cargar una instantánea sólo se tocan los nodos que cambian: la diferencia
+# de un proceso se suma a él y a sus antecesores, y al aparecer, terminar o
+# cambiar de padre un proceso se resta su subárbol de la rama antigua y se
+# suma a la nueva. No se recorre nunca el árbol completo.
+class ProcessTreeModel:
+    def __init__(self):
+        self.rows = {}        # pid -> fila
+        self.parent = {}      # pid -> pid del padre enlazado (None si es raíz)
+        self.children = {}    # pid -> hijos enlazados
+        self.roots = set()
+        self.waiting = {}     # pid del padre ausente -> procesos que lo esperan
+        self.total_cpu = {}   # pid -> CPU% del subárbol
+        self.total_rss = {}   # pid -> memoria residente del subárbol (bytes)
+
+    # Método para sumar una diferencia a un nodo y a todos sus antecesores
+    def _add_to_branch(self, pid, cpu, rss):
+        while pid is not None:
+            self.total_cpu[pid] += cpu
+            self.total_rss[pid] += rss
+            pid = self.parent[pid]
+
+    # Método para comprobar si "pid" está en la rama de "ancestor" hacia la raíz
+    def _in_branch(self, pid, ancestor):
+        while pid is not None:
+            if pid == ancestor:
+                return True
+            pid = self.parent[pid]
+        return False
+
+    # Método para enlazar un nodo con su padre (o dejarlo como raíz si no existe)
+    def _attach(self, pid):
+        ppid = self.rows[pid].ppid
+        if ppid in self.rows and ppid != pid and not self._in_branch(ppid, pid):
+            self.parent[pid] = ppid
+            self.children[ppid].add(pid)
+            self._add_to_branch(ppid, self.total_cpu[pid], self.total_rss[pid])
+        else:
+            self.parent[pid] = None
+            self.roots.add(pid)
+            if ppid and ppid != pid and ppid not in self.rows:
+                self.waiting.setdefault(ppid, set()).add(pid)
+
+    # Método para separar un nodo (con su subárbol) de su padre
+    def _detach(self, pid):
+        ppid = self.parent[pid]
+        if ppid is not None:
+            self.children[ppid].discard(pid)
+            self._add_to_branch(ppid, -self.total_cpu[pid], -self.total_rss[pid])
+            self.parent[pid] = None
+        else:
+            self.roots.discard(pid)
+            waiting = self.waiting.get(self.rows[pid].ppid)
+            if waiting:
+                waiting.discard(pid)
+
+    def _remove(self, pid):
+        self._detach(pid)
+        # Los hijos quedan como raíces hasta que la siguiente fila diga su nuevo padre
+        for child in self.children.pop(pid):
+            self.parent[child] = None
+            self.roots.add(child)
+            self.waiting.setdefault(pid, set()).add(child)
+        del self.rows[pid], self.parent[pid], self.total_cpu[pid], self.total_rss[pid]
+
+    # Método para cargar las filas de una nueva instantánea
+    def load(self, rows):
+        current = {row.pid: row for row in rows}
+        for pid in [pid for pid in self.rows if pid not in current]:
+            self._remove(pid)
+
+        relink = []
+        for pid, row in current.items():
+            old = self.rows.get(pid)
+            if old is None:
+                # Proceso nuevo: se enlaza cuando estén todos los nodos
+                self.rows[pid] = row
+                self.parent[pid] = None
+                self.children[pid] = set()
+                self.total_cpu[pid] = row.cpu
+                self.total_rss[pid] = row.rss
+                relink.append(pid)
+            elif old.ppid != row.ppid:
+                # Cambio de padre: se separa el subárbol y se vuelve a enlazar
+                self._detach(pid)
+                self.rows[pid] = row
+                self.total_cpu[pid] += row.cpu - old.cpu
+                self.total_rss[pid] += row.rss - old.rss
+                relink.append(pid)
+            else:
+                self.rows[pid] = row
+                if row.cpu != old.cpu or row.rss != old.rss:
+                    self._add_to_branch(pid, row.cpu - old.cpu, row.rss - old.rss)
+
+        for pid in relink:
+            self._attach(pid)
+        # Procesos que esperaban a un padre que acaba de aparecer
+        for pid in relink:
+            for child in self.waiting.pop(pid, ()):
+                if child in self.rows and self.parent[child] is None and self.rows[child].ppid == pid:
+                    self.roots.discard(child)
+                    self._attach(child)
+
+    def __len__(self):
+        return len(self.rows)
+
+
+# Vista en árbol: los hijos de un proceso sólo se crean en Tk al desplegarlo y
+# se borran al plegarlo. Un proceso plegado con hijos lleva un elemento vacío
+# para que el Treeview muestre el indicador de desplegar. Con un filtro activo
+# en el almacén se muestran los procesos que lo cumplen y sus antecesores (los
+# totales de cada rama siguen incluyendo a todos sus procesos).
+class ProcessTreeView:
+    def __init__(self, tree, scrollbar, store, model=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.store = store
+        self.model = model or ProcessTreeModel()
+        self.expanded = set()
+        self.shown = {}           # pid -> valores mostrados
+        self.shown_children = {}  # pid del padre ('' para las raíces) -> pids mostrados en orden
+        self.shown_parent = {}    # pid -> padre bajo el que está mostrado
+        self.placeholders = set()
+        self.visible = None       # procesos que se muestran con el filtro (None sin filtro)
+        self._loaded_rows = None
+        self._filter_version = None
+        self._filter = ("", None)
+        self._bound = False
+        self._attached = False
+
+    def attach(self):
+        self.tree.configure(show="tree headings", yscrollcommand=self.scrollbar.set)
+        self.tree.heading("#0", text="Nombre")
+        self.tree.column("#0", width=220, stretch=True)
+        self.scrollbar.configure(command=self.tree.yview)
+        self._attached = True
+        if not self._bound:
+            self._bound = True
+            self.tree.bind("<<TreeviewOpen>>", self._on_open, add="+")
+            self.tree.bind("<<TreeviewClose>>", self._on_close, add="+")
+
+    def detach(self):
+        self._attached = False
+        self.clear()
+        self.tree.configure(show="headings")
+
+    def clear(self):
+        roots = self.tree.get_children('')
+        if roots:
+            self.tree.delete(*roots)
+        self.shown.clear()
+        self.shown_children.clear()
+        self.shown_parent.clear()
+        self.placeholders.clear()
+
+    def _values(self, pid):
+        row = self.model.rows[pid]
+        cpu = self.model.total_cpu[pid]
+        if self.model.children[pid]:
+            cpu_text = f"{max(0.0, cpu):.1f} ({row.cpu:.1f})"
+        else:
+            cpu_text = f"{row.cpu:.1f}"
+        return (pid, row.name, row.status, cpu_text, f"{self.model.total_rss[pid] / 1024**2:.1f} MB", row.user) + format_details(row)
+
+    # Método para ordenar hermanos según la columna de ordenación del almacén
+    def _ordered(self, pids):
+        column = self.store.sort_column
+        rows = self.model.rows
+        if column == 'cpu':
+            key = self.model.total_cpu.__getitem__
+        elif column == 'memory':
+            key = self.model.total_rss.__getitem__
+        elif column in SORT_KEYS:
+            key = lambda pid: SORT_KEYS[column](rows[pid])
+        else:
+            return sorted(pids)
+        return sorted(pids, key=key, reverse=self.store.sort_reverse)
+
+    # Método para obtener los hijos que se muestran de un proceso ('' para las raíces)
+    def _children(self, pid):
+        children = self.model.roots if pid == '' else self.model.children[pid]
+        return children if self.visible is None else children & self.visible
+
+    # Método para calcular los procesos visibles con el filtro del almacén
+    def _apply_filter(self):
+        allowed = self.store.allowed_positions()
+        if allowed is None:
+            self.visible = None
+            self._filter = ("", None)
+            return
+        rows = self.store.all_rows
+        parent = self.model.parent
+        visible = set()
+        ancestors = set()
+        for position in allowed:
+            pid = rows[position].pid
+            visible.add(pid)
+            # Se conserva la rama hasta la raíz para no romper la jerarquía
+            ancestor = parent[pid]
+            while ancestor is not None and ancestor not in ancestors:
+                ancestors.add(ancestor)
+                ancestor = parent[ancestor]
+        self.visible = visible | ancestors
+        # Al cambiar el filtro se despliegan las ramas que llevan a los procesos encontrados
+        current = (self.store.filter_text, self.store.filter_user)
+        if current != self._filter:
+            self._filter = current
+            self.expanded |= ancestors
+
+    # Método para olvidar los elementos de un subárbol borrado en Tk
+    def _forget(self, pid):
+        self.placeholders.discard(pid)
+        for child in self.shown_children.pop(pid, ()):
+            self.shown.pop(child, None)
+            self.shown_parent.pop(child, None)
+            self._forget(child)
+
+    # Método para sincronizar los hijos mostrados de un elemento ('' para las raíces)
+    def _sync(self, parent, pids):
+        ordered = self._ordered(pids)
+        wanted = set(ordered)
+        shown = self.shown_children.get(parent, [])
+        gone = [pid for pid in shown if pid not in wanted]
+        if gone:
+            self.tree.delete(*[str(pid) for pid in gone])
+            for pid in gone:
+                self.shown.pop(pid, None)
+                self.shown_parent.pop(pid, None)
+                self._forget(pid)
+        parent_iid = str(parent)
+        # Orden en que quedan los elementos en Tk tras las inserciones
+        tk_order = [pid for pid in shown if pid in wanted]
+        for position, pid in enumerate(ordered):
+            iid = str(pid)
+            values = self._values(pid)
+            if pid not in self.shown:
+                self.tree.insert(parent_iid, position, iid=iid, text=self.model.rows[pid].name,
+                                 values=values, open=pid in self.expanded)
+                self.shown[pid] = values
+                self.shown_parent[pid] = parent
+                tk_order.insert(position, pid)
+            elif self.shown_parent[pid] != parent:
+                # Proceso que ha cambiado de padre: se mueve con su subárbol
+                self.shown_children[self.shown_parent[pid]].remove(pid)
+                self.tree.move(iid, parent_iid, position)
+                self.shown_parent[pid] = parent
+                tk_order.insert(position, pid)
+                if self.shown[pid] != values:
+                    self.tree.item(iid, text=self.model.rows[pid].name, values=values)
+                    self.shown[pid] = values
+            elif self.shown[pid] != values:
+                self.tree.item(iid, text=self.model.rows[pid].name, values=values)
+                self.shown[pid] = values
+            children = self._children(pid)
+            if pid in self.expanded and children:
+                if pid in self.placeholders:
+                    # Desplegado desde el código (filtro): quitar el elemento vacío y abrirlo en Tk
+                    self.tree.delete(f"{pid}+")
+                    self.placeholders.discard(pid)
+                    self.tree.item(iid, open=True)
+                self._sync(pid, children)
+            else:
+                self.expanded.discard(pid)
+                self._collapse(pid, bool(children))
+        # Reordenar sólo si el orden ha cambiado
+        if tk_order != ordered:
+            for position, pid in enumerate(ordered):
+                self.tree.move(str(pid), parent_iid, position)
+        self.shown_children[parent] = ordered
+
+    # Método para dejar un elemento plegado (con el elemento vacío si tiene hijos)
+    def _collapse(self, pid, has_children):
+        children = self.shown_children.pop(pid, None)
+        if children:
+            self.tree.delete(*[str(child) for child in children])
+            for child in children:
+                self.shown.pop(child, None)
+                self.shown_parent.pop(child, None)
+                self._forget(child)
+        placeholder = f"{pid}+"
+        if has_children and pid not in self.placeholders:
+            self.tree.insert(str(pid), tk.END, iid=placeholder)
+            self.placeholders.add(pid)
+        elif not has_children and pid in self.placeholders:
+            self.tree.delete(placeholder)
+            self.placeholders.discard(pid)
+
+    def _on_open(self, event):
+        if not self._attached:
+            return
+        iid = self.tree.focus()
+        if not iid or iid.endswith("+"):
+            return
+        pid = int(iid)
+        if pid not in self.model.rows:
+            return
+        self.expanded.add(pid)
+        if pid in self.placeholders:
+            self.tree.delete(f"{pid}+")
+            self.placeholders.discard(pid)
+        self._sync(pid, self._children(pid))
+
+    def _on_close(self, event):
+        if not self._attached:
+            return
+        iid = self.tree.focus()
+        if not iid or iid.endswith("+"):
+            return
+        pid = int(iid)
+        if pid in self.model.rows:
+            self.expanded.discard(pid)
+            self._collapse(pid, bool(self._children(pid)))
+
+    def refresh(self):
+        # El modelo sólo se actualiza cuando el almacén carga una instantánea nueva
+        if self.store.all_rows is not self._loaded_rows:
+            self._loaded_rows = self.store.all_rows
+            self.model.load(self._loaded_rows)
+        # El filtro se recalcula cuando el almacén cambia (instantánea, filtro u orden)
+        if self.store.version != self._filter_version:
+            self._filter_version = self.store.version
+            self._apply_filter()
+        self._sync('', self._children(''))
+
+    # Método para elegir las columnas visibles (el nombre va en la columna del árbol)
+    def show_columns(self, columns):
+        self.tree.configure(displaycolumns=tuple(column for column in columns if column != 'name'))
+
+    def selected_pid(self):
+        selected = self.tree.selection()
+        if not selected or selected[0].endswith("+"):
+            return None
+        return int(selected[0])
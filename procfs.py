@@ -0,0 +1,213 @@
+# Lectura rápida de la lista de procesos en Linux directamente desde /proc.
+# En cada muestra sólo se lee /proc/[pid]/stat (estado, padre, tiempos de CPU,
+# inicio y memoria residente); /proc/[pid]/status se lee una vez por proceso
+# para obtener el uid. Los ficheros se leen con os.readv sobre un buffer
+# reutilizado por hilo y el trabajo se reparte en un grupo pequeño de hilos.
+# Devuelve las mismas filas (ProcessRow) que collector.ProcessCache, que se
+# sigue usando fuera de Linux o si /proc no está disponible. Las columnas de
+# detalle leen además /proc/[pid]/io, /proc/[pid]/status y /proc/[pid]/fd.
+import os
+import pwd
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+
+from collector import ProcessCache, ProcessDetails, ProcessRow, ProcessSnapshot
+
+BACKENDS = ("auto", "psutil", "procfs")
+
+# Nombres de estado iguales a los de psutil
+STATUS_NAMES = {
+    "R": "running", "S": "sleeping", "D": "disk-sleep", "Z": "zombie", "T": "stopped",
+    "t": "tracing-stop", "X": "dead", "x": "dead", "K": "wake-kill", "W": "waking",
+    "P": "parked", "I": "idle"
+}
+# Por debajo de este número de procesos no compensa repartir el trabajo entre hilos
+MIN_PARALLEL = 512
+
+_local = threading.local()
+
+
+# Método para comprobar si se puede usar /proc
+def available():
+    return sys.platform.startswith("linux") and os.path.exists("/proc/self/stat")
+
+
+# Método para leer un fichero pequeño en el buffer del hilo
+def read_file(path):
+    buffer = getattr(_local, "buffer", None)
+    if buffer is None:
+        buffer = _local.buffer = bytearray(4096)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        length = os.readv(fd, [buffer])
+    finally:
+        os.close(fd)
+    return bytes(buffer[:length])
+
+
+# Método para leer el uid real de un proceso desde /proc/[pid]/status
+def read_uid(pid):
+    data = read_file(f"/proc/{pid}/status")
+    start = data.index(b"\nUid:") + 5
+    return int(data[start:data.index(b"\n", start)].split()[0])
+
+
+# Método para leer /proc/[pid]/stat: (nombre, estado, ppid, ticks de CPU, inicio, páginas residentes)
+def read_stat(pid):
+    data = read_file(f"/proc/{pid}/stat")
+    # El nombre va entre paréntesis y puede contener espacios o paréntesis
+    close = data.rindex(b")")
+    name = data[data.index(b"(") + 1:close].decode("utf-8", "replace")
+    fields = data[close + 2:].split()
+    return (name, fields[0].decode(), int(fields[1]), int(fields[11]) + int(fields[12]),
+            int(fields[19]), int(fields[21]))
+
+
+# Método para leer los bytes leídos y escritos de /proc/[pid]/io (None sin permiso)
+def read_io(pid):
+    try:
+        data = read_file(f"/proc/{pid}/io")
+        read_start = data.index(b"\nread_bytes:") + 12
+        write_start = data.index(b"\nwrite_bytes:") + 13
+        return (int(data[read_start:data.index(b"\n", read_start)]),
+                int(data[write_start:data.index(b"\n", write_start)]))
+    except (OSError, ValueError):
+        return None
+
+
+# Método para leer (cambios de contexto, hilos, descriptores abiertos) de un proceso
+def read_extra(pid):
+    try:
+        data = read_file(f"/proc/{pid}/status")
+        values = {}
+        for field in (b"\nThreads:", b"\nvoluntary_ctxt_switches:", b"\nnonvoluntary_ctxt_switches:"):
+            start = data.index(field) + len(field)
+            values[field] = int(data[start:data.index(b"\n", start)])
+    except (OSError, ValueError):
+        return None
+    try:
+        fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        # Los descriptores de procesos de otros usuarios no son legibles
+        fds = None
+    return (values[b"\nvoluntary_ctxt_switches:"] + values[b"\nnonvoluntary_ctxt_switches:"],
+            values[b"\nThreads:"], fds)
+
+
+# Tabla uid -> nombre de usuario con caché
+class UserTable:
+    def __init__(self):
+        self.names = {}
+
+    def name(self, uid):
+        name = self.names.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self.names[uid] = name
+        return name
+
+
+class ProcFsEntry:
+    __slots__ = ("key", "user", "ticks")
+
+    def __init__(self, key, user, ticks):
+        self.key = key        # (pid, inicio en ticks): identidad del proceso
+        self.user = user
+        self.ticks = ticks
+
+
+# Alternativa a collector.ProcessCache que lee /proc sin crear objetos psutil
+class ProcFsProcessCache:
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.entries = {}
+        self.users = UserTable()
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size = os.sysconf("SC_PAGE_SIZE")
+        self.total_memory = psutil.virtual_memory().total
+        self.boot_time = psutil.boot_time()
+        self.last_time = None
+        self.details = ProcessDetails()
+        self._executor = None
+
+    # Método para leer un grupo de procesos (se ejecuta en los hilos del grupo)
+    def _read_chunk(self, pids):
+        entries = self.entries
+        results = []
+        for pid in pids:
+            try:
+                name, state, ppid, ticks, start, pages = read_stat(pid)
+                entry = entries.get(pid)
+                # El uid sólo se lee para procesos nuevos o PID reutilizados
+                uid = read_uid(pid) if entry is None or entry.key != (pid, start) else None
+            except (OSError, ValueError, IndexError):
+                # El proceso ha terminado mientras se leía
+                continue
+            results.append((pid, name, state, ppid, ticks, start, pages, uid))
+        return results
+
+    # Método para aplicar una función a grupos de PID, repartidos entre hilos si son muchos
+    def _map_chunks(self, func, pids):
+        if len(pids) < MIN_PARALLEL or self.workers <= 1:
+            return func(pids)
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="procfs")
+        size = -(-len(pids) // self.workers)
+        results = []
+        for chunk in self._executor.map(func, [pids[i:i + size] for i in range(0, len(pids), size)]):
+            results.extend(chunk)
+        return results
+
+    def _read_all(self, pids):
+        return self._map_chunks(self._read_chunk, pids)
+
+    # Método para leer un dato de cada PID manteniendo el orden (para las columnas de detalle)
+    def _map_pids(self, func, pids):
+        return self._map_chunks(lambda chunk: [func(pid) for pid in chunk], pids)
+
+    # Método para tomar una muestra de la lista de procesos
+    def sample(self):
+        pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+        now = time.time()
+        monotonic = time.monotonic()
+        elapsed = monotonic - self.last_time if self.last_time is not None else 0.0
+        self.last_time = monotonic
+
+        entries = {}
+        rows = []
+        ticks_per_second = self.clock_ticks
+        memory_scale = self.page_size / self.total_memory * 100
+        for pid, name, state, ppid, ticks, start, pages, uid in self._read_all(pids):
+            entry = self.entries.get(pid)
+            if uid is None and entry is not None:
+                # Proceso conocido: uso de CPU desde la muestra anterior
+                cpu = round((ticks - entry.ticks) / ticks_per_second / elapsed * 100, 1) if elapsed > 0 else 0.0
+                entry.ticks = ticks
+            else:
+                # Proceso nuevo: media desde su arranque
+                entry = ProcFsEntry((pid, start), self.users.name(uid), ticks)
+                age = now - (self.boot_time + start / ticks_per_second)
+                cpu = round(ticks / ticks_per_second / age * 100, 1) if age > 0 else 0.0
+            entries[pid] = entry
+            rows.append(ProcessRow(pid, name, STATUS_NAMES.get(state, state), cpu, pages * memory_scale,
+                                   entry.user, ppid, pages * self.page_size))
+        # Los procesos que han terminado desaparecen al sustituir la tabla
+        self.entries = entries
+        if self.details.enabled:
+            keys = {pid: entry.key for pid, entry in entries.items()}
+            rows = self.details.apply(rows, keys, read_io, read_extra, self._map_pids)
+        return ProcessSnapshot(now, tuple(rows))
+
+
+# Método para crear el recolector de procesos ("auto" usa /proc cuando está disponible)
+def create_process_cache(backend="auto"):
+    if backend in ("auto", "procfs") and available():
+        return ProcFsProcessCache()
+    return ProcessCache()
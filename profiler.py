@@ -0,0 +1,215 @@
+# Medición del coste del propio monitor.
+# Cada punto caliente (actualización de widgets, construcción de pestañas,
+# trabajos de muestreo y consultas externas como dmidecode, lspci o cpuinfo)
+# se cronometra en un histograma con cubetas fijas, así que medir sólo cuesta
+# dos lecturas del reloj y una suma. También se guarda el retraso del bucle de
+# eventos de Tk y el uso de CPU y memoria del proceso. Todo se puede exportar
+# como JSON y, opcionalmente, capturar un perfil de cProfile y tracemalloc
+# para adjuntarlo a un informe de error. Este módulo no depende de la interfaz
+# gráfica.
+import cProfile
+import io
+import json
+import os
+import platform
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+
+import psutil
+
+# Límites superiores de las cubetas de los histogramas (ms); la última recoge el resto
+BUCKETS_MS = (0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+# Nombre del histograma del retraso del bucle de eventos
+LOOP_LAG = "tk: retraso del bucle"
+
+# Resumen de un histograma (todo en ms; los percentiles son el límite de su cubeta)
+TimingSummary = namedtuple("TimingSummary", ["name", "count", "mean", "p50", "p95", "p99", "max"])
+# Instantánea del coste del monitor: CPU (%) y memoria residente del proceso, hilos y tiempos
+ProfileSnapshot = namedtuple("ProfileSnapshot", ["timestamp", "cpu", "rss", "threads", "timings", "capturing"])
+
+
+# Método para obtener la carpeta por defecto de las capturas de perfil
+def default_profiles_dir():
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "analiza_tu_sistema", "profiles")
+
+
+# Histograma de duraciones con cubetas fijas
+class TimingHistogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    # Método para añadir una duración en ms
+    def add(self, ms):
+        index = 0
+        while index < len(BUCKETS_MS) and ms > BUCKETS_MS[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    # Método para estimar un percentil (0-100) con el límite superior de su cubeta
+    def percentile(self, percent):
+        if not self.count:
+            return 0.0
+        target = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return min(BUCKETS_MS[index], self.max) if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def summary(self, name):
+        return TimingSummary(name, self.count, self.total / self.count if self.count else 0.0,
+                             self.percentile(50), self.percentile(95), self.percentile(99), self.max)
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total,
+            "max_ms": self.max,
+            "buckets": [{"le": bound, "count": count} for bound, count in zip(BUCKETS_MS + ("+Inf",), self.counts)]
+        }
+
+
+# Captura de cProfile (hilo de la interfaz) y tracemalloc (todo el proceso)
+class ProfileCapture:
+    def __init__(self, frames=25):
+        self.frames = frames
+        self.profile = None
+        self.started = None
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def start(self):
+        if self.profile is not None:
+            return
+        self.started = time.time()
+        tracemalloc.start(self.frames)
+        # cProfile sólo mide el hilo que lo activa: el de Tk, donde están los widgets
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    # Método para detener la captura y guardarla en una carpeta (devuelve los ficheros creados)
+    def stop(self, directory):
+        if self.profile is None:
+            return []
+        self.profile.disable()
+        profile, self.profile = self.profile, None
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        os.makedirs(directory, exist_ok=True)
+        stamp = datetime.fromtimestamp(self.started).strftime("%Y%m%d-%H%M%S")
+        stats_path = os.path.join(directory, f"perfil-{stamp}.pstats")
+        text_path = os.path.join(directory, f"perfil-{stamp}.txt")
+        profile.dump_stats(stats_path)
+        text = io.StringIO()
+        text.write(f"Captura de {time.time() - self.started:.1f} s\n\n")
+        pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(40)
+        text.write(f"\nMemoria reservada por Python: actual {current / 1024**2:.1f} MB, pico {peak / 1024**2:.1f} MB\n")
+        text.write("Líneas con más memoria reservada:\n")
+        for stat in snapshot.statistics("lineno")[:25]:
+            text.write(f"  {stat}\n")
+        with open(text_path, "w", encoding="utf-8") as text_file:
+            text_file.write(text.getvalue())
+        return [stats_path, text_path]
+
+
+# Registro de tiempos del monitor, seguro entre hilos
+class Profiler:
+    def __init__(self):
+        self.histograms = {}
+        self.started = time.time()
+        self.process = psutil.Process()
+        self.capture = ProfileCapture()
+        self.last_snapshot = None
+        self._lock = threading.Lock()
+        # Primera llamada: fija la referencia de cpu_percent(interval=None)
+        self.process.cpu_percent(interval=None)
+
+    # Método para añadir una duración (s) al histograma de un punto
+    def record(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = TimingHistogram()
+            histogram.add(seconds * 1000)
+
+    # Método para llamar a una función cronometrándola
+    def call(self, name, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    # Método para envolver una función de modo que cada llamada se cronometre
+    def wrap(self, name, func):
+        def timed(*args):
+            return self.call(name, func, *args)
+        return timed
+
+    # Método para obtener los resúmenes de todos los histogramas, ordenados por tiempo total
+    def summaries(self):
+        with self._lock:
+            items = [(histogram.total, histogram.summary(name)) for name, histogram in self.histograms.items()]
+        return tuple(summary for total, summary in sorted(items, key=lambda item: item[0], reverse=True))
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.started = time.time()
+
+    # Método para tomar una muestra del coste del monitor (se ejecuta como trabajo del muestreo)
+    def sample(self):
+        with self.process.oneshot():
+            cpu = self.process.cpu_percent(interval=None)
+            rss = self.process.memory_info().rss
+            threads = self.process.num_threads()
+        self.last_snapshot = ProfileSnapshot(time.time(), cpu, rss, threads, self.summaries(), self.capture.active)
+        return self.last_snapshot
+
+    # Método para obtener el informe completo en tipos JSON
+    def report(self):
+        # Se usa la última muestra para no mover la referencia del uso de CPU del trabajo periódico
+        snapshot = self.last_snapshot or self.sample()
+        timings = self.summaries()
+        with self._lock:
+            histograms = {name: histogram.to_dict() for name, histogram in self.histograms.items()}
+        return {
+            "generated": time.time(),
+            "since": self.started,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pid": self.process.pid,
+            "cpu_percent": snapshot.cpu,
+            "rss_bytes": snapshot.rss,
+            "threads": snapshot.threads,
+            "timings": [summary._asdict() for summary in timings],
+            "histograms": histograms
+        }
+
+    # Método para guardar el informe en un fichero JSON
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(self.report(), report_file, ensure_ascii=False, indent=2)
@@ -0,0 +1,85 @@
+# Cálculo de tasas de E/S (bytes/s, IOPS, paquetes/s) a partir de contadores acumulados.
+# Se guarda la lectura anterior de cada dispositivo con una marca de tiempo
+# monotónica y en cada muestra se calcula la diferencia. psutil ya corrige los
+# contadores que dan la vuelta (nowrap), así que un contador que retrocede se
+# ha reiniciado y esa muestra se descarta. Los dispositivos que aparecen o
+# desaparecen se gestionan sin errores. Este módulo no depende de la interfaz gráfica.
+import time
+from collections import namedtuple
+
+import psutil
+
+DiskRate = namedtuple("DiskRate", ["name", "read_bytes", "write_bytes", "read_iops", "write_iops"])
+NicRate = namedtuple("NicRate", ["name", "bytes_sent", "bytes_recv", "packets_sent", "packets_recv"])
+# Tasas por disco y por interfaz, más los totales del sistema (todo por segundo)
+IoRatesSnapshot = namedtuple("IoRatesSnapshot", ["timestamp", "disks", "nics", "disk_total", "net_total"])
+
+DISK_FIELDS = ("read_bytes", "write_bytes", "read_count", "write_count")
+NIC_FIELDS = ("bytes_sent", "bytes_recv", "packets_sent", "packets_recv")
+
+
+# Método para calcular la diferencia entre dos lecturas de un contador (None si se ha reiniciado)
+def counter_delta(previous, current):
+    if current >= previous:
+        return current - previous
+    # Contador reiniciado (interfaz recreada, controlador recargado): las vueltas
+    # de los contadores ya las corrige psutil, así que no se puede saber cuánto ha contado
+    return None
+
+
+# Diferencias por clave entre dos lecturas consecutivas de contadores
+class CounterDeltas:
+    def __init__(self, fields):
+        self.fields = fields
+        self.previous = {}
+        self.previous_time = None
+
+    # Método para registrar una lectura y devolver las tasas por clave
+    def update(self, counters, now=None):
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.previous_time if self.previous_time is not None else 0.0
+        rates = {}
+        current = {}
+        for key, value in counters.items():
+            values = tuple(getattr(value, field) for field in self.fields)
+            current[key] = values
+            previous = self.previous.get(key)
+            # Los dispositivos nuevos no tienen tasa hasta la siguiente muestra
+            if previous is None or elapsed <= 0:
+                continue
+            deltas = [counter_delta(old, new) for old, new in zip(previous, values)]
+            if None in deltas:
+                continue
+            rates[key] = tuple(delta / elapsed for delta in deltas)
+        # Los dispositivos que han desaparecido se olvidan al sustituir la lectura
+        self.previous = current
+        self.previous_time = now
+        return rates
+
+
+# Motor de tasas de disco y red para el hilo de muestreo
+class IoRateEngine:
+    def __init__(self):
+        self.disks = CounterDeltas(DISK_FIELDS)
+        self.nics = CounterDeltas(NIC_FIELDS)
+        self.totals = CounterDeltas(DISK_FIELDS)
+
+    def sample(self):
+        now = time.monotonic()
+        per_disk = psutil.disk_io_counters(perdisk=True) or {}
+        per_nic = psutil.net_io_counters(pernic=True) or {}
+        total_disk = psutil.disk_io_counters()
+
+        disk_rates = self.disks.update(per_disk, now)
+        nic_rates = self.nics.update(per_nic, now)
+        total_rates = self.totals.update({"total": total_disk} if total_disk else {}, now)
+
+        disks = tuple(DiskRate(name, *disk_rates[name]) for name in sorted(disk_rates))
+        nics = tuple(NicRate(name, *nic_rates[name]) for name in sorted(nic_rates))
+        disk_total = total_rates.get("total")
+        disk_total = DiskRate("total", *disk_total) if disk_total else None
+        if nics:
+            net_total = NicRate("total", *(sum(column) for column in zip(*(nic[1:] for nic in nics))))
+        else:
+            net_total = None
+        return IoRatesSnapshot(time.time(), disks, nics, disk_total, net_total)
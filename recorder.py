@@ -0,0 +1,253 @@
+# Grabación de métricas en disco y lectura para reproducirlas.
+#
+# Formato de un fichero .atsr (sólo se añade al final):
+#   - 8 bytes mágicos b"ATSREC01"
+#   - longitud de la cabecera (uint32, little endian) y cabecera JSON con las
+#     columnas y el formato struct de cada registro
+#   - registros de ancho fijo: timestamp (float64) y el resto de columnas
+#     como float32 (uso de CPU total y por núcleo, memoria, swap, tasas de
+#     disco y red y los N procesos con más CPU como pid/cpu/memoria)
+# Los nombres de los procesos van aparte, en un fichero .names con una línea
+# JSON [pid, nombre] por cada proceso nuevo que aparece en el fichero.
+#
+# Los registros se escriben por lotes y los ficheros rotan al llegar a un
+# tamaño máximo. Para leer se usa mmap, así que se puede saltar a cualquier
+# registro sin cargar la grabación entera.
+import json
+import mmap
+import os
+import platform
+import socket
+import struct
+import time
+
+MAGIC = b"ATSREC01"
+EXTENSION = ".atsr"
+
+
+# Método para obtener el directorio por defecto de las grabaciones
+def default_recordings_dir():
+    if platform.system() == "Windows":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "analiza_tu_sistema", "recordings")
+
+
+# Método para obtener las columnas de un registro
+def record_columns(cores, top_n):
+    columns = ["timestamp", "cpu"]
+    columns += [f"cpu{core}" for core in range(cores)]
+    columns += [
+        "memory_percent", "memory_used", "memory_available", "swap_percent", "swap_used",
+        "disk_read_bytes", "disk_write_bytes", "disk_read_iops", "disk_write_iops",
+        "net_bytes_sent", "net_bytes_recv", "net_packets_sent", "net_packets_recv"
+    ]
+    for slot in range(top_n):
+        columns += [f"top{slot}_pid", f"top{slot}_cpu", f"top{slot}_memory"]
+    return columns
+
+
+# Grabador: combina las últimas instantáneas y añade un registro por cada muestra de CPU
+class Recorder:
+    def __init__(self, directory=None, top_n=10, batch_size=10, max_file_bytes=8 * 1024 * 1024, max_files=100):
+        self.directory = directory or default_recordings_dir()
+        self.top_n = top_n
+        self.batch_size = batch_size
+        self.max_file_bytes = max_file_bytes
+        self.max_files = max_files
+        self.latest = {}
+        self.path = None
+        self.records = 0
+        self._file = None
+        self._names_file = None
+        self._struct = None
+        self._cores = None
+        self._pending = []
+        self._known_names = set()
+
+    # Método para registrar las instantáneas del muestreo ("cpu", "memory", "io", "processes")
+    # Cada muestra de CPU añade un registro con las últimas del resto de trabajos
+    def update(self, snapshots):
+        self.latest.update(snapshots)
+        if "cpu" in snapshots:
+            self.append()
+
+    def _open(self, cores):
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.path = os.path.join(self.directory, f"rec-{stamp}-{os.getpid()}-{int(time.time() * 1000) % 1000:03d}{EXTENSION}")
+        columns = record_columns(cores, self.top_n)
+        record_format = "<d" + "f" * (len(columns) - 1)
+        header = json.dumps({
+            "version": 1,
+            "columns": columns,
+            "format": record_format,
+            "cores": cores,
+            "top_n": self.top_n,
+            "host": socket.gethostname(),
+            "started": time.time()
+        }).encode("utf-8")
+        self._file = open(self.path, "ab")
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self._names_file = open(self.path + ".names", "a", encoding="utf-8")
+        self._struct = struct.Struct(record_format)
+        self._cores = cores
+        self._known_names = set()
+        self.records = 0
+        self._remove_old_files()
+
+    # Método para borrar las grabaciones más antiguas si se supera el máximo de ficheros
+    def _remove_old_files(self):
+        try:
+            files = sorted(name for name in os.listdir(self.directory) if name.endswith(EXTENSION))
+        except OSError:
+            return
+        for name in files[:-self.max_files]:
+            for path in (os.path.join(self.directory, name), os.path.join(self.directory, name + ".names")):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # Método para añadir un registro con las últimas instantáneas
+    def append(self):
+        cpu = self.latest.get("cpu")
+        if cpu is None:
+            return
+        cores = len(cpu.per_core)
+        if self._file is None or cores != self._cores:
+            # Si cambia el número de núcleos el formato cambia: se empieza otro fichero
+            self.close()
+            self._open(cores)
+
+        values = [cpu.timestamp, cpu.usage, *cpu.per_core]
+        memory = self.latest.get("memory")
+        if memory:
+            values += [memory.percent, memory.used, memory.available, memory.swap_percent, memory.swap_used]
+        else:
+            values += [0.0] * 5
+        io = self.latest.get("io")
+        disk = io.disk_total if io else None
+        net = io.net_total if io else None
+        values += [disk.read_bytes, disk.write_bytes, disk.read_iops, disk.write_iops] if disk else [0.0] * 4
+        values += [net.bytes_sent, net.bytes_recv, net.packets_sent, net.packets_recv] if net else [0.0] * 4
+
+        processes = self.latest.get("processes")
+        top = sorted(processes.rows, key=lambda row: row.cpu, reverse=True)[:self.top_n] if processes else []
+        for row in top:
+            values += [row.pid, row.cpu, row.memory]
+            if (row.pid, row.name) not in self._known_names:
+                self._known_names.add((row.pid, row.name))
+                self._names_file.write(json.dumps([row.pid, row.name], ensure_ascii=False) + "\n")
+        values += [0.0] * (3 * (self.top_n - len(top)))
+
+        self._pending.append(self._struct.pack(*values))
+        self.records += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    # Método para escribir el lote pendiente y rotar el fichero si es necesario
+    def flush(self):
+        if self._file is None:
+            return
+        if self._pending:
+            self._file.write(b"".join(self._pending))
+            self._pending = []
+        self._file.flush()
+        self._names_file.flush()
+        if self._file.tell() >= self.max_file_bytes:
+            self.close()
+
+    def close(self):
+        if self._file is None:
+            return
+        if self._pending:
+            self._file.write(b"".join(self._pending))
+            self._pending = []
+        self._file.close()
+        self._names_file.close()
+        self._file = None
+        self._names_file = None
+
+
+# Lector de una grabación mediante mmap
+class RecordingReader:
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self._file.close()
+            raise ValueError("No es un fichero de grabación válido")
+        header_length = struct.unpack("<I", self._file.read(4))[0]
+        self.header = json.loads(self._file.read(header_length).decode("utf-8"))
+        self.columns = self.header["columns"]
+        self.cores = self.header.get("cores", 0)
+        self.top_n = self.header.get("top_n", 0)
+        self._struct = struct.Struct(self.header["format"])
+        self._offset = len(MAGIC) + 4 + header_length
+        size = os.fstat(self._file.fileno()).st_size
+        # Se ignora un posible registro incompleto al final (grabación en curso)
+        self.count = max(0, (size - self._offset) // self._struct.size)
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+        self.names = self._load_names()
+
+    def _load_names(self):
+        names = {}
+        try:
+            with open(self.path + ".names", encoding="utf-8") as names_file:
+                for line in names_file:
+                    try:
+                        pid, name = json.loads(line)
+                    except ValueError:
+                        continue
+                    names[pid] = name
+        except OSError:
+            pass
+        return names
+
+    def __len__(self):
+        return self.count
+
+    # Método para leer los valores de un registro
+    def values(self, index):
+        return self._struct.unpack_from(self._map, self._offset + index * self._struct.size)
+
+    # Método para leer un registro como diccionario columna -> valor
+    def record(self, index):
+        return dict(zip(self.columns, self.values(index)))
+
+    # Método para leer los procesos con más CPU de un registro: [(pid, nombre, cpu, memoria)]
+    def top_processes(self, index):
+        record = self.record(index)
+        top = []
+        for slot in range(self.top_n):
+            pid = int(record[f"top{slot}_pid"])
+            if pid:
+                top.append((pid, self.names.get(pid, "?"), record[f"top{slot}_cpu"], record[f"top{slot}_memory"]))
+        return top
+
+    # Método para leer una columna completa
+    def column(self, name):
+        position = self.columns.index(name)
+        return [values[position] for values in self._struct.iter_unpack(self._map[self._offset:self._offset + self.count * self._struct.size])] if self.count else []
+
+    def timestamp(self, index):
+        return struct.unpack_from("<d", self._map, self._offset + index * self._struct.size)[0]
+
+    # Método para buscar el registro más cercano (anterior o igual) a un instante
+    def index_at(self, timestamp):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(mid) <= timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return max(0, lo - 1)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
@@ -0,0 +1,174 @@
+# Subsistema de muestreo en segundo plano.
+# Un único planificador decide cuándo toca cada trabajo periódico y lo ejecuta
+# en un grupo de hilos; los resultados se publican como instantáneas
+# inmutables en una cola. La interfaz gráfica sólo lee de la cola y actualiza
+# widgets, así que nunca se bloquea aunque el muestreo sea lento. Las
+# funciones de recogida están en collector.py.
+#
+# - Un trabajo nunca se ejecuta dos veces a la vez: si se pide una muestra
+#   mientras está en marcha, se hace una sola más al terminar.
+# - Si un trabajo tarda más que su presupuesto (una fracción de su intervalo),
+#   su intervalo efectivo se alarga hasta MAX_BACKOFF veces y vuelve poco a
+#   poco al configurado cuando deja de pasarse.
+# - Con set_slowdown() se alargan todos los intervalos (ventana minimizada).
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Fracción del intervalo que puede durar una muestra antes de espaciar el trabajo
+BUDGET = 0.5
+# Máximo alargamiento del intervalo por sobrecarga
+MAX_BACKOFF = 8
+
+
+# Trabajo periódico gestionado por el planificador
+class SamplerJob:
+    def __init__(self, name, func, interval, paused=False):
+        self.name = name
+        self.func = func
+        self.interval = interval            # intervalo configurado (s)
+        self.effective_interval = interval  # intervalo tras la adaptación por sobrecarga
+        self.paused = paused
+        self.running = False
+        self.pending = False                # muestra pedida mientras se ejecutaba
+        self.next_run = 0.0
+        self.last_duration = 0.0
+
+    # Método para adaptar el intervalo a la duración de la última muestra
+    def adapt(self, duration):
+        self.last_duration = duration
+        if duration > self.effective_interval * BUDGET:
+            self.effective_interval = min(self.interval * MAX_BACKOFF,
+                                          max(self.effective_interval * 2, duration / BUDGET))
+        elif self.effective_interval > self.interval:
+            self.effective_interval = max(self.interval, self.effective_interval / 2)
+
+
+# Planificador de todos los trabajos de muestreo, con una cola de salida común
+class Sampler:
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.jobs = {}
+        self.slowdown = 1.0
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._executor = None
+        self._thread = threading.Thread(target=self._run, name="sampler", daemon=True)
+
+    # Método para registrar un trabajo periódico (intervalo en segundos)
+    def add_job(self, name, func, interval, paused=False):
+        with self._condition:
+            job = SamplerJob(name, func, interval, paused)
+            self.jobs[name] = job
+            self._condition.notify()
+        return job
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(1, len(self.jobs)), thread_name_prefix="sampler")
+            self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    # Bucle del planificador: lanza los trabajos que han vencido y espera al siguiente
+    def _run(self):
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                timeout = None
+                for job in self.jobs.values():
+                    if job.paused or job.running:
+                        continue
+                    if job.next_run <= now:
+                        job.running = True
+                        self._executor.submit(self._execute, job)
+                    else:
+                        wait = job.next_run - now
+                        timeout = wait if timeout is None else min(timeout, wait)
+                self._condition.wait(timeout)
+
+    def _execute(self, job):
+        start = time.monotonic()
+        try:
+            snapshot = job.func()
+        except Exception:
+            snapshot = None
+        duration = time.monotonic() - start
+        with self._condition:
+            if snapshot is not None and not self._stopped:
+                self.queue.put((job.name, snapshot))
+            job.running = False
+            job.adapt(duration)
+            if job.pending:
+                job.pending = False
+                job.next_run = time.monotonic()
+            else:
+                job.next_run = start + job.effective_interval * self.slowdown
+            self._condition.notify()
+
+    # Método para pedir una muestra inmediata (sin duplicar si ya está en marcha)
+    def trigger(self, name):
+        with self._condition:
+            job = self.jobs.get(name)
+            if job is None:
+                return
+            if job.running:
+                job.pending = True
+            else:
+                job.next_run = time.monotonic()
+                self._condition.notify()
+
+    # Pausar un trabajo (deja de muestrear hasta que se reanude)
+    def pause(self, name):
+        with self._condition:
+            job = self.jobs.get(name)
+            if job:
+                job.paused = True
+
+    # Reanudar un trabajo tomando una muestra inmediata
+    def resume(self, name):
+        with self._condition:
+            job = self.jobs.get(name)
+            if job and job.paused:
+                job.paused = False
+                job.next_run = time.monotonic()
+                self._condition.notify()
+
+    # Método para cambiar el intervalo configurado de un trabajo
+    def set_interval(self, name, interval):
+        with self._condition:
+            job = self.jobs.get(name)
+            if job is None:
+                return
+            job.interval = interval
+            job.effective_interval = interval
+            job.next_run = min(job.next_run, time.monotonic() + interval * self.slowdown)
+            self._condition.notify()
+
+    # Método para alargar (factor > 1) o restablecer (1) todos los intervalos
+    def set_slowdown(self, factor):
+        with self._condition:
+            if factor < self.slowdown:
+                # Al acelerar, no esperar al vencimiento calculado con el factor anterior
+                now = time.monotonic()
+                for job in self.jobs.values():
+                    job.next_run = min(job.next_run, now + job.effective_interval * factor)
+            self.slowdown = factor
+            self._condition.notify()
+
+    # Método para vaciar la cola quedándose sólo con la última instantánea de cada trabajo
+    def drain(self):
+        latest = {}
+        while True:
+            try:
+                name, snapshot = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            latest[name] = snapshot
+        return latest
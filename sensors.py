@@ -0,0 +1,186 @@
+# Lectura de los sensores de hardware (temperaturas y ventiladores).
+# En Linux se leen directamente de /sys/class/hwmon: los chips y sus ficheros
+# se descubren una sola vez, los ficheros de valor se dejan abiertos y en cada
+# muestra se releen con os.pread desde el principio (sysfs vuelve a generar el
+# valor en cada lectura en la posición 0). Los límites (max, crit) y las
+# etiquetas se leen sólo al descubrir. Sólo se vuelve a descubrir si cambia la
+# lista de chips (conexión o desconexión de un dispositivo). En el resto de
+# sistemas se usa psutil. Este módulo no depende de la interfaz gráfica.
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+import psutil
+
+HWMON_ROOT = "/sys/class/hwmon"
+# Chips que miden el procesador, por orden de preferencia
+CPU_CHIPS = ("coretemp", "k10temp", "zenpower", "cpu_thermal", "cpu-thermal", "soc_thermal")
+# Etiquetas de la temperatura del encapsulado completo (Intel y AMD)
+PACKAGE_LABELS = ("Package", "Tctl", "Tdie", "Physical")
+# Tipos de sensor: prefijo del fichero en hwmon y divisor del valor
+KINDS = {"temp": 1000.0, "fan": 1.0}
+INPUT_PATTERN = re.compile(r"^(temp|fan)(\d+)_input$")
+
+# kind: "temp" (°C) o "fan" (rpm); high y critical son None si el chip no los indica.
+# value es None si la última lectura ha fallado (sensor desactivado o sin datos)
+SensorReading = namedtuple("SensorReading", ["key", "chip", "kind", "label", "value", "high", "critical"])
+# Lecturas de todos los sensores y temperatura del procesador (None si no hay sensor)
+SensorsSnapshot = namedtuple("SensorsSnapshot", ["timestamp", "readings", "cpu_temperature"])
+
+
+# Método para comprobar si se puede usar hwmon
+def available(root=HWMON_ROOT):
+    return sys.platform.startswith("linux") and os.path.isdir(root)
+
+
+# Método para elegir la temperatura del procesador entre las lecturas
+def cpu_temperature(readings):
+    for chip in CPU_CHIPS:
+        temps = [reading for reading in readings
+                 if reading.chip == chip and reading.kind == "temp" and reading.value is not None]
+        if not temps:
+            continue
+        # Con varios zócalos hay un "Package" por zócalo: se muestra el más caliente
+        packages = [reading.value for reading in temps if reading.label.startswith(PACKAGE_LABELS)]
+        return max(packages or [reading.value for reading in temps])
+    return None
+
+
+# Método para leer un fichero pequeño de sysfs (None si no existe o falla)
+def read_text(path):
+    try:
+        with open(path, encoding="utf-8", errors="replace") as sysfs_file:
+            return sysfs_file.read().strip()
+    except OSError:
+        return None
+
+
+def _read_number(path, divisor):
+    text = read_text(path)
+    try:
+        return int(text) / divisor if text else None
+    except ValueError:
+        return None
+
+
+# Sensor de hwmon con su fichero de valor abierto
+class HwmonSensor:
+    __slots__ = ("key", "chip", "kind", "label", "high", "critical", "fd", "divisor")
+
+    def __init__(self, key, chip, kind, label, high, critical, fd):
+        self.key = key
+        self.chip = chip
+        self.kind = kind
+        self.label = label
+        self.high = high
+        self.critical = critical
+        self.fd = fd
+        self.divisor = KINDS[kind]
+
+    def read(self):
+        try:
+            return int(os.pread(self.fd, 32, 0)) / self.divisor
+        except (OSError, ValueError):
+            return None
+
+
+# Sensores de /sys/class/hwmon con los ficheros abiertos entre muestras
+class HwmonSensors:
+    def __init__(self, root=HWMON_ROOT):
+        self.root = root
+        self.chips = None        # nombres de los directorios hwmonN descubiertos
+        self.sensors = []
+        self.discoveries = 0
+
+    # Método para cerrar los ficheros abiertos
+    def close(self):
+        for sensor in self.sensors:
+            try:
+                os.close(sensor.fd)
+            except OSError:
+                pass
+        self.sensors = []
+        self.chips = None
+
+    # Método para descubrir todos los chips y abrir sus ficheros de valor
+    def discover(self, chips):
+        self.close()
+        sensors = []
+        for chip_dir in sorted(chips, key=lambda name: (len(name), name)):
+            path = os.path.join(self.root, chip_dir)
+            name = read_text(os.path.join(path, "name")) or chip_dir
+            # En núcleos antiguos los ficheros están en el subdirectorio "device"
+            for directory in (path, os.path.join(path, "device")):
+                try:
+                    files = os.listdir(directory)
+                except OSError:
+                    continue
+                inputs = []
+                for file_name in files:
+                    match = INPUT_PATTERN.match(file_name)
+                    if match:
+                        inputs.append((match.group(1), int(match.group(2)), file_name))
+                if not inputs:
+                    continue
+                for kind, index, file_name in sorted(inputs):
+                    prefix = os.path.join(directory, f"{kind}{index}_")
+                    try:
+                        fd = os.open(os.path.join(directory, file_name), os.O_RDONLY)
+                    except OSError:
+                        continue
+                    divisor = KINDS[kind]
+                    sensors.append(HwmonSensor(
+                        f"{chip_dir}/{kind}{index}", name, kind,
+                        read_text(prefix + "label") or f"{kind}{index}",
+                        _read_number(prefix + "max", divisor),
+                        _read_number(prefix + "crit", divisor) if kind == "temp" else None,
+                        fd
+                    ))
+                break
+        self.sensors = sensors
+        self.chips = chips
+        self.discoveries += 1
+
+    def sample(self):
+        try:
+            chips = frozenset(os.listdir(self.root))
+        except OSError:
+            chips = frozenset()
+        # Un chip nuevo o desaparecido: volver a descubrir
+        if chips != self.chips:
+            self.discover(chips)
+        readings = tuple(SensorReading(sensor.key, sensor.chip, sensor.kind, sensor.label, sensor.read(),
+                                       sensor.high, sensor.critical) for sensor in self.sensors)
+        return SensorsSnapshot(time.time(), readings, cpu_temperature(readings))
+
+
+# Sensores a través de psutil (fuera de Linux o sin /sys/class/hwmon)
+class PsutilSensors:
+    def close(self):
+        pass
+
+    def sample(self):
+        readings = []
+        groups = (("temp", "sensors_temperatures"), ("fan", "sensors_fans"))
+        for kind, function in groups:
+            try:
+                chips = getattr(psutil, function)()
+            except (AttributeError, OSError, RuntimeError):
+                continue
+            for chip, entries in chips.items():
+                for index, entry in enumerate(entries):
+                    readings.append(SensorReading(
+                        f"{chip}/{kind}{index}", chip, kind, entry.label or f"{kind}{index + 1}", entry.current,
+                        getattr(entry, "high", None), getattr(entry, "critical", None)
+                    ))
+        readings = tuple(readings)
+        return SensorsSnapshot(time.time(), readings, cpu_temperature(readings))
+
+
+# Método para crear el lector de sensores adecuado al sistema
+def create_sensors():
+    if available():
+        return HwmonSensors()
+    return PsutilSensors()
@@ -0,0 +1,36 @@
+# Preferencias del usuario guardadas en un fichero JSON.
+import json
+import os
+import platform
+
+
+# Método para obtener la ruta del fichero de preferencias
+def default_settings_path():
+    if platform.system() == "Windows":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "analiza_tu_sistema", "settings.json")
+
+
+# Método para leer las preferencias (diccionario vacío si no existen o están dañadas)
+def load_settings(path=None):
+    try:
+        with open(path or default_settings_path(), encoding="utf-8") as settings_file:
+            data = json.load(settings_file)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+# Método para guardar las preferencias (escritura atómica)
+def save_settings(settings, path=None):
+    path = path or default_settings_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as settings_file:
+            json.dump(settings, settings_file, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
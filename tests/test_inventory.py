@@ -0,0 +1,65 @@
+# Pruebas de la caché del inventario de hardware.
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inventory import HardwareInventory
+
+
+# Método para esperar a que el inventario publique todos sus resultados
+def wait_results(inventory, count, timeout=5.0):
+    results = {}
+    deadline = time.monotonic() + timeout
+    while len(results) < count and time.monotonic() < deadline:
+        results.update(inventory.drain())
+        time.sleep(0.01)
+    return results
+
+
+class InventoryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.directory, "inventory.json")
+        self.calls = []
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def probe(self, name, value):
+        def run():
+            self.calls.append(name)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return run
+
+    def inventory(self, probes):
+        inventory = HardwareInventory(self.cache_path, {name: self.probe(name, value) for name, value in probes.items()})
+        inventory.start()
+        results = wait_results(inventory, len(probes))
+        # La caché se guarda después de publicar el último resultado
+        if inventory._executor is not None:
+            inventory._executor.shutdown(wait=True)
+        return inventory, results
+
+    def test_failed_probes_are_retried_on_next_start(self):
+        inventory, results = self.inventory({"model": "X1", "ram_modules": "No disponible", "gpu": OSError("lspci")})
+        self.assertEqual(results["model"], "X1")
+        self.assertEqual(inventory.failed, {"ram_modules", "gpu"})
+        self.calls.clear()
+        # Con el mismo arranque sólo se repiten las consultas que fallaron
+        inventory, results = self.inventory({"model": "X2", "ram_modules": "8 GB", "gpu": "GPU"})
+        self.assertEqual(sorted(self.calls), ["gpu", "ram_modules"])
+        self.assertEqual(results, {"model": "X1", "ram_modules": "8 GB", "gpu": "GPU"})
+        self.calls.clear()
+        self.inventory({"model": "X3", "ram_modules": "16 GB", "gpu": "GPU"})
+        self.assertEqual(self.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+# Pruebas del cálculo de tasas a partir de contadores acumulados.
+import os
+import sys
+import unittest
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rates import CounterDeltas, counter_delta
+
+Counters = namedtuple("Counters", ["bytes_sent", "bytes_recv"])
+
+
+class CounterDeltaTest(unittest.TestCase):
+    def test_increase(self):
+        self.assertEqual(counter_delta(100, 250), 150)
+
+    def test_reset_is_not_a_wrap(self):
+        # Un contador pequeño que retrocede es un reinicio, no una vuelta de 32 bits
+        self.assertIsNone(counter_delta(5000, 10))
+        self.assertIsNone(counter_delta(2**40, 10))
+
+
+class CounterDeltasTest(unittest.TestCase):
+    def test_reset_skips_sample_without_spike(self):
+        deltas = CounterDeltas(("bytes_sent", "bytes_recv"))
+        deltas.update({"eth0": Counters(1000, 2000)}, now=0.0)
+        self.assertEqual(deltas.update({"eth0": Counters(3000, 4000)}, now=1.0), {"eth0": (2000.0, 2000.0)})
+        # La interfaz se ha recreado: sin tasa en esta muestra
+        self.assertEqual(deltas.update({"eth0": Counters(100, 50)}, now=2.0), {})
+        # Y la siguiente se calcula desde la lectura tras el reinicio
+        self.assertEqual(deltas.update({"eth0": Counters(600, 550)}, now=3.0), {"eth0": (500.0, 500.0)})
+
+    def test_new_device_has_no_rate_until_second_sample(self):
+        deltas = CounterDeltas(("bytes_sent", "bytes_recv"))
+        self.assertEqual(deltas.update({"eth0": Counters(1, 1)}, now=0.0), {})
+        self.assertEqual(deltas.update({"eth0": Counters(1, 1), "eth1": Counters(5, 5)}, now=1.0), {"eth0": (0.0, 0.0)})
+
+
+if __name__ == "__main__":
+    unittest.main()